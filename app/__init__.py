@@ -3,6 +3,14 @@ from flask import Flask
 
 def create_app():
     app = Flask(__name__)
+
+    # One database unit of work per request
+    from app import db
+    db.init_app(app)
+
+    # Serialized catalog responses, replayed until the catalog changes
+    from app.routes import response_cache
+    response_cache.init_app(app)
     
     # Register blueprints
     from app.routes import user_routes
@@ -10,11 +18,16 @@ def create_app():
     from app.routes import cart_routes
     from app.routes import order_routes
     from app.routes import checkout_routes
+    from app.routes import category_routes
     
     app.register_blueprint(user_routes, url_prefix='/api')
     app.register_blueprint(product_routes, url_prefix='/api')
     app.register_blueprint(cart_routes, url_prefix='/api')
     app.register_blueprint(order_routes, url_prefix='/api')
     app.register_blueprint(checkout_routes, url_prefix='/api')
+    app.register_blueprint(category_routes, url_prefix='/api')
+
+    from app.cli import register_commands
+    register_commands(app)
     
     return app
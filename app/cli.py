@@ -0,0 +1,109 @@
+# app/cli.py
+import click
+from flask.cli import AppGroup
+
+db_cli = AppGroup('db', help="Database commands.")
+
+
+@db_cli.command('init')
+def init_db():
+    """Create the application tables (SQLite databases only)."""
+    from app.db import get_dialect, get_connection
+
+    dialect = get_dialect()
+    with get_connection() as connection:
+        try:
+            dialect.bootstrap_schema(connection)
+        except NotImplementedError as e:
+            raise click.ClickException(str(e))
+    click.echo(f"✅ Schema created on {dialect.name}.")
+
+
+search_cli = AppGroup('search', help="Product search commands.")
+
+
+@search_cli.command('rebuild')
+@click.option('--url', default='http://127.0.0.1:5000', show_default=True,
+              help="Base URL of the running server.")
+def rebuild_search(url):
+    """Ask the running server to rebuild its product search index."""
+    import json
+    from urllib.error import HTTPError, URLError
+    from urllib.request import Request, urlopen
+
+    # The index lives in the server process; each worker process has its own
+    request = Request(f"{url.rstrip('/')}/api/products/search/rebuild", method='POST')
+    try:
+        with urlopen(request, timeout=300) as response:
+            message = json.load(response)["message"]
+    except HTTPError as e:
+        raise click.ClickException(json.load(e).get("message", str(e)))
+    except URLError as e:
+        raise click.ClickException(f"⚠️ Could not reach the server at {url}: {e.reason}")
+    click.echo(message)
+
+
+@search_cli.command('time-build')
+def time_search_build():
+    """Build a search index in this process and report its build time and size.
+
+    An offline check of how long a cold start takes; the index of a
+    running server is left untouched.
+    """
+    import time
+    from app.services.product_service import ProductService, search_index
+
+    started = time.perf_counter()
+    result = ProductService.rebuild_search_index()
+    elapsed = time.perf_counter() - started
+    if "⚠️" in result:
+        raise click.ClickException(result)
+    click.echo(f"{result} ({elapsed:.2f}s)")
+    stats = search_index.stats()
+    click.echo(f"{stats['terms']} terms, {stats['postings']} postings.")
+
+
+products_cli = AppGroup('products', help="Product catalog commands.")
+
+
+@products_cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'jsonl']),
+              help="Feed format; guessed from the file extension by default.")
+@click.option('--chunk-size', type=click.IntRange(min=1), default=None,
+              help="Products committed per batch.")
+def import_products(path, fmt, chunk_size):
+    """Import products from a CSV or JSON Lines file."""
+    import time
+    from app.services.product_import import read_records
+    from app.services.product_service import ProductService, IMPORT_CHUNK_SIZE
+
+    if fmt is None:
+        fmt = 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson')) else 'csv'
+
+    started = time.perf_counter()
+    with open(path, encoding='utf-8-sig', newline='') as stream:
+        report = ProductService.import_products(read_records(stream, fmt), chunk_size or IMPORT_CHUNK_SIZE)
+    elapsed = time.perf_counter() - started
+
+    for error in report["errors"]:
+        click.echo(f"Row {error['row']}: {error['message']}", err=True)
+    click.echo(f"✅ {report['imported']} products imported, {report['failed']} failed in {elapsed:.1f}s.")
+
+
+@products_cli.command('parse-dimensions')
+def parse_dimensions():
+    """Store width, depth and height for products saved before they were parsed."""
+    from app.models import Furniture
+
+    count = Furniture.store_parsed_dimensions()
+    if count is None:
+        raise click.ClickException("⚠️ The products could not be updated.")
+    click.echo(f"✅ Dimensions parsed for {count} products.")
+
+
+def register_commands(app):
+    """Attach the command line groups to the app."""
+    app.cli.add_command(db_cli)
+    app.cli.add_command(search_cli)
+    app.cli.add_command(products_cli)
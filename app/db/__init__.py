@@ -1,3 +1,17 @@
 # app/db/__init__.py
-from app.db.connection import get_connection
-from app.db.execute_query import execute_query
+from app.db.connection import get_connection, get_pool, get_dialect, configure
+from app.db import rows, unit_of_work
+from app.db.rows import Row
+from app.db.unit_of_work import transaction
+from app.db.execute_query import (
+    execute_query, execute_many, stream_query, BATCH_CHUNK_SIZE, STREAM_CHUNK_SIZE
+)
+from app.db.pagination import (
+    fetch_page, page_of, encode_cursor, decode_cursor, parse_page_size, DEFAULT_PAGE_SIZE
+)
+
+
+def init_app(app):
+    """Hook the database layer into a Flask app."""
+    unit_of_work.init_app(app)
+    rows.init_app(app)
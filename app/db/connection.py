@@ -1,4 +1,7 @@
-import pyodbc
+import os
+import threading
+from app.db.dialects import dialect_from_url
+from app.db.pool import ConnectionPool
 
 # Database connection configuration
 conn_str = (
@@ -8,6 +11,73 @@ conn_str = (
     "Trusted_Connection=yes;"
 )
 
+# Optional database URL, e.g. "sqlite:///:memory:" or "sqlite:///furniture.db"
+# for local benchmarking; SQL Server with conn_str when unset
+DATABASE_URL = os.environ.get("DATABASE_URL")
+
+# Connection pool configuration (seconds for timeouts)
+POOL_MIN_SIZE = int(os.environ.get("DB_POOL_MIN_SIZE", 1))
+POOL_MAX_SIZE = int(os.environ.get("DB_POOL_MAX_SIZE", 10))
+POOL_IDLE_TIMEOUT = float(os.environ.get("DB_POOL_IDLE_TIMEOUT", 300))
+POOL_WAIT_TIMEOUT = float(os.environ.get("DB_POOL_WAIT_TIMEOUT", 30))
+POOL_PING_INTERVAL = float(os.environ.get("DB_POOL_PING_INTERVAL", 30))
+
+_dialect = None
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_dialect():
+    """Return the active SQL dialect, chosen from DATABASE_URL on first use."""
+    global _dialect
+    if _dialect is None:
+        with _pool_lock:
+            if _dialect is None:
+                _dialect = dialect_from_url(DATABASE_URL, conn_str)
+    return _dialect
+
+
+def configure(database_url=None, dialect=None):
+    """Switch to another database, e.g. ``configure("sqlite://")``.
+
+    The current pool is closed; the next query opens a new one.
+    """
+    global _dialect, _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+        _dialect = dialect or dialect_from_url(database_url, conn_str)
+    return _dialect
+
+
+def create_connection():
+    """Open a new, unpooled database connection."""
+    return get_dialect().connect()
+
+
+def get_pool():
+    """Return the shared connection pool, creating it on first use (Singleton)."""
+    global _pool
+    if _pool is None:
+        get_dialect()
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    create_connection,
+                    min_size=POOL_MIN_SIZE,
+                    max_size=POOL_MAX_SIZE,
+                    idle_timeout=POOL_IDLE_TIMEOUT,
+                    wait_timeout=POOL_WAIT_TIMEOUT,
+                    ping_interval=POOL_PING_INTERVAL
+                )
+    return _pool
+
+
 def get_connection():
-    """Function to get database connection"""
-    return pyodbc.connect(conn_str)
+    """Function to get database connection.
+
+    The connection is borrowed from the pool; closing it or leaving a
+    ``with`` block commits (or rolls back) and returns it to the pool.
+    """
+    return get_pool().acquire()
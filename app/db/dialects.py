@@ -0,0 +1,352 @@
+import sqlite3
+import uuid
+
+
+class Dialect:
+    """SQL and driver differences between the supported databases.
+
+    Models write portable SQL with ``?`` placeholders and ask the active
+    dialect for the vendor-specific pieces.
+    """
+
+    name = None
+    now = None  # SQL expression for the current timestamp
+    max_params = 999  # bound parameters allowed in one statement
+
+    def connect(self):
+        """Open a new raw DB-API connection."""
+        raise NotImplementedError
+
+    @property
+    def errors(self):
+        """Exception types raised by the driver for database errors."""
+        raise NotImplementedError
+
+    def add_hours(self, hours):
+        """SQL expression for the current timestamp plus ``hours``."""
+        raise NotImplementedError
+
+    def output_inserted(self, *columns):
+        """Clause placed between an INSERT's column list and its VALUES/SELECT."""
+        return ""
+
+    def returning(self, *columns):
+        """Clause placed at the end of an INSERT to return generated columns."""
+        return ""
+
+    def output_deleted(self, *columns):
+        """Clause placed between a DELETE's table and its WHERE to return the removed rows."""
+        return ""
+
+    def upsert_increment(self, table, keys, column, returning, defaults=None):
+        """One statement that adds to ``column`` of the row matching ``keys``, or inserts it.
+
+        Takes placeholders for ``keys`` then ``column``. A new row gets the
+        ``defaults`` expressions too; an existing one has the bound value
+        added to its ``column`` by the database, so concurrent calls never
+        lose an increment. ``keys`` must be covered by a unique constraint.
+        The row's ``returning`` columns, after the write, are the result set.
+        """
+        raise NotImplementedError
+
+    def insert_many(self, table, columns, row_count, returning, defaults=None):
+        """One INSERT of ``row_count`` rows of ``columns`` placeholders.
+
+        ``defaults`` maps further columns to the SQL expression they get in
+        every row. Each new row comes back with its ``returning`` columns and
+        an ``InsertOrder`` that sorts the result in VALUES order; the first
+        ``returning`` column must be an IDENTITY or AUTOINCREMENT key.
+        """
+        raise NotImplementedError
+
+    def update_join(self, table, alias, assignments, join_table, join_alias, on, where, returning=()):
+        """UPDATE ``table`` from rows of ``join_table`` matched by ``on``.
+
+        ``assignments`` must use unqualified target columns on the left,
+        e.g. ``"StockQuantity = p.StockQuantity - c.Quantity"``. The new
+        values of the ``returning`` columns come back as the result set.
+        """
+        raise NotImplementedError
+
+    def limit(self, count):
+        """Clause placed after ORDER BY to return at most ``count`` rows."""
+        raise NotImplementedError
+
+    def prepare_bulk_cursor(self, cursor):
+        """Tune a cursor before an ``executemany`` call."""
+
+    def bootstrap_schema(self, connection):
+        """Create the application tables on an empty database."""
+        raise NotImplementedError(f"⚠️ Schema bootstrap is not supported for {self.name}.")
+
+
+class SqlServerDialect(Dialect):
+    """Microsoft SQL Server through pyodbc."""
+
+    name = "mssql"
+    now = "GETDATE()"
+    max_params = 2000  # of the 2100 SQL Server accepts
+
+    def __init__(self, conn_str):
+        self.conn_str = conn_str
+
+    def connect(self):
+        import pyodbc
+        return pyodbc.connect(self.conn_str)
+
+    @property
+    def errors(self):
+        import pyodbc
+        return (pyodbc.Error,)
+
+    def add_hours(self, hours):
+        return f"DATEADD(hour, {int(hours)}, GETDATE())"
+
+    def output_inserted(self, *columns):
+        return "OUTPUT " + ", ".join(f"INSERTED.{column}" for column in columns)
+
+    def insert_many(self, table, columns, row_count, returning, defaults=None):
+        # OUTPUT of a plain INSERT cannot name the source rows, a MERGE's can
+        defaults = defaults or {}
+        placeholders = ", ".join("?" for _ in columns)
+        values = ", ".join(f"({number}, {placeholders})" for number in range(row_count))
+        targets = ", ".join(list(columns) + list(defaults))
+        sources = ", ".join([f"source.{column}" for column in columns] + list(defaults.values()))
+        output = ", ".join(f"INSERTED.{column}" for column in returning)
+        return (
+            f"MERGE INTO {table} AS target "
+            f"USING (VALUES {values}) AS source (InsertOrder, {', '.join(columns)}) ON 1 = 0 "
+            f"WHEN NOT MATCHED THEN INSERT ({targets}) VALUES ({sources}) "
+            f"OUTPUT source.InsertOrder, {output};"
+        )
+
+    def output_deleted(self, *columns):
+        return "OUTPUT " + ", ".join(f"DELETED.{column}" for column in columns)
+
+    def upsert_increment(self, table, keys, column, returning, defaults=None):
+        # HOLDLOCK keeps the matched key range locked from the check to the
+        # write, without it two MERGEs can both take the insert branch
+        defaults = defaults or {}
+        sources = list(keys) + [column]
+        on = " AND ".join(f"target.{key} = source.{key}" for key in keys)
+        targets = ", ".join(sources + list(defaults))
+        values = ", ".join([f"source.{name}" for name in sources] + list(defaults.values()))
+        return (
+            f"MERGE INTO {table} WITH (HOLDLOCK) AS target "
+            f"USING (VALUES ({', '.join('?' for _ in sources)})) AS source ({', '.join(sources)}) ON {on} "
+            f"WHEN MATCHED THEN UPDATE SET {column} = target.{column} + source.{column} "
+            f"WHEN NOT MATCHED THEN INSERT ({targets}) VALUES ({values}) "
+            f"{self.output_inserted(*returning)};"
+        )
+
+    def update_join(self, table, alias, assignments, join_table, join_alias, on, where, returning=()):
+        output = f"{self.output_inserted(*returning)} " if returning else ""
+        return (
+            f"UPDATE {alias} SET {assignments} {output}"
+            f"FROM {table} {alias} JOIN {join_table} {join_alias} ON {on} "
+            f"WHERE {where}"
+        )
+
+    def limit(self, count):
+        return f"OFFSET 0 ROWS FETCH NEXT {int(count)} ROWS ONLY"
+
+    def prepare_bulk_cursor(self, cursor):
+        # Bind whole parameter arrays instead of one round trip per row
+        cursor.fast_executemany = True
+
+
+class SqliteDialect(Dialect):
+    """SQLite, file-backed or in-memory, for local benchmarking and profiling."""
+
+    name = "sqlite"
+    now = "datetime('now', 'localtime')"
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self._keeper = None
+        if path == ":memory:":
+            # Pooled connections share one in-memory database, which lives
+            # as long as at least one connection to it stays open
+            self._uri = f"file:furniture-{uuid.uuid4().hex}?mode=memory&cache=shared"
+            self._keeper = self.connect()
+        else:
+            self._uri = None
+
+    def connect(self):
+        if self._uri:
+            connection = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        else:
+            connection = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA foreign_keys=ON")
+        return connection
+
+    @property
+    def errors(self):
+        return (sqlite3.Error,)
+
+    def add_hours(self, hours):
+        return f"datetime('now', 'localtime', '+{int(hours)} hours')"
+
+    def returning(self, *columns):
+        return "RETURNING " + ", ".join(columns)
+
+    def insert_many(self, table, columns, row_count, returning, defaults=None):
+        # Keys are handed out in VALUES order, so the key itself orders the rows
+        defaults = defaults or {}
+        row = "(" + ", ".join(["?"] * len(columns) + list(defaults.values())) + ")"
+        return (
+            f"INSERT INTO {table} ({', '.join(list(columns) + list(defaults))}) "
+            f"VALUES {', '.join([row] * row_count)} "
+            f"RETURNING {returning[0]} AS InsertOrder, {', '.join(returning)}"
+        )
+
+    def upsert_increment(self, table, keys, column, returning, defaults=None):
+        defaults = defaults or {}
+        columns = list(keys) + [column] + list(defaults)
+        values = ["?"] * (len(keys) + 1) + list(defaults.values())
+        return (
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(values)}) "
+            f"ON CONFLICT ({', '.join(keys)}) DO UPDATE SET {column} = {table}.{column} + excluded.{column} "
+            f"{self.returning(*returning)}"
+        )
+
+    def update_join(self, table, alias, assignments, join_table, join_alias, on, where, returning=()):
+        output = f" {self.returning(*returning)}" if returning else ""
+        return (
+            f"UPDATE {table} AS {alias} SET {assignments} "
+            f"FROM {join_table} {join_alias} "
+            f"WHERE {on} AND {where}{output}"
+        )
+
+    def limit(self, count):
+        return f"LIMIT {int(count)}"
+
+    def bootstrap_schema(self, connection):
+        connection.executescript(SQLITE_SCHEMA)
+        connection.commit()
+
+
+def dialect_from_url(url, conn_str):
+    """Pick the dialect for a DATABASE_URL value; SQL Server when there is none.
+
+    ``sqlite://`` or ``sqlite:///:memory:`` is an in-memory database and
+    ``sqlite:///path/to/store.db`` a file-backed one.
+    """
+    if not url:
+        return SqlServerDialect(conn_str)
+    if url.startswith("sqlite:"):
+        path = url[len("sqlite:"):].lstrip("/") if url.startswith("sqlite:///") else ""
+        if url.startswith("sqlite:////"):
+            path = "/" + path  # absolute path
+        return SqliteDialect(path or ":memory:")
+    if url.startswith("mssql:"):
+        return SqlServerDialect(url[len("mssql:"):].lstrip("/") or conn_str)
+    raise ValueError(f"⚠️ Unsupported database URL: {url}")
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS Users (
+    UserID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name TEXT NOT NULL,
+    Email TEXT NOT NULL UNIQUE,
+    Password TEXT NOT NULL,
+    Salt TEXT NOT NULL,
+    Role TEXT NOT NULL DEFAULT 'customer',
+    CreatedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS Categories (
+    CategoryID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name TEXT NOT NULL,
+    Description TEXT,
+    ParentID INTEGER REFERENCES Categories (CategoryID),
+    CreatedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS IX_Categories_ParentID ON Categories (ParentID);
+
+CREATE TABLE IF NOT EXISTS CategoryClosure (
+    AncestorID INTEGER NOT NULL REFERENCES Categories (CategoryID),
+    DescendantID INTEGER NOT NULL REFERENCES Categories (CategoryID) ON DELETE CASCADE,
+    Depth INTEGER NOT NULL,
+    PRIMARY KEY (AncestorID, DescendantID)
+);
+CREATE INDEX IF NOT EXISTS IX_CategoryClosure_DescendantID ON CategoryClosure (DescendantID, AncestorID, Depth);
+
+CREATE TABLE IF NOT EXISTS Products (
+    ProductID INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name TEXT NOT NULL,
+    Description TEXT,
+    Price NUMERIC NOT NULL,
+    Dimensions TEXT,
+    StockQuantity INTEGER NOT NULL DEFAULT 0,
+    CategoryID INTEGER REFERENCES Categories (CategoryID),
+    ImageURL TEXT,
+    FurnitureType TEXT NOT NULL,
+    Width REAL,
+    Depth REAL,
+    Height REAL,
+    CreatedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS IX_Products_Name ON Products (Name, ProductID);
+CREATE INDEX IF NOT EXISTS IX_Products_CategoryID ON Products (CategoryID);
+CREATE INDEX IF NOT EXISTS IX_Products_FurnitureType ON Products (FurnitureType);
+CREATE INDEX IF NOT EXISTS IX_Products_Width ON Products (Width, Depth, Height);
+
+CREATE TABLE IF NOT EXISTS ProductAttributes (
+    ProductID INTEGER NOT NULL REFERENCES Products (ProductID) ON DELETE CASCADE,
+    Name TEXT NOT NULL,
+    NumberValue REAL,
+    TextValue TEXT,
+    PRIMARY KEY (ProductID, Name)
+);
+CREATE INDEX IF NOT EXISTS IX_ProductAttributes_Number ON ProductAttributes (Name, NumberValue, ProductID);
+CREATE INDEX IF NOT EXISTS IX_ProductAttributes_Text ON ProductAttributes (Name, TextValue, ProductID);
+
+CREATE TABLE IF NOT EXISTS Cart (
+    CartID INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserID INTEGER NOT NULL REFERENCES Users (UserID) ON DELETE CASCADE,
+    ProductID INTEGER NOT NULL REFERENCES Products (ProductID) ON DELETE CASCADE,
+    Quantity INTEGER NOT NULL CHECK (Quantity > 0),
+    AddedAt TEXT DEFAULT (datetime('now', 'localtime')),
+    UNIQUE (UserID, ProductID)
+);
+
+CREATE TABLE IF NOT EXISTS Orders (
+    OrderID INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserID INTEGER NOT NULL REFERENCES Users (UserID),
+    TotalAmount NUMERIC NOT NULL,
+    Status TEXT NOT NULL DEFAULT 'pending',
+    PaymentMethod TEXT,
+    OrderDate TEXT,
+    CreatedAt TEXT DEFAULT (datetime('now', 'localtime')),
+    UpdatedAt TEXT
+);
+CREATE INDEX IF NOT EXISTS IX_Orders_UserID ON Orders (UserID, CreatedAt);
+CREATE INDEX IF NOT EXISTS IX_Orders_Status ON Orders (Status, CreatedAt);
+
+CREATE TABLE IF NOT EXISTS OrderItems (
+    OrderItemID INTEGER PRIMARY KEY AUTOINCREMENT,
+    OrderID INTEGER NOT NULL REFERENCES Orders (OrderID) ON DELETE CASCADE,
+    ProductID INTEGER NOT NULL REFERENCES Products (ProductID),
+    Quantity INTEGER NOT NULL,
+    Price NUMERIC NOT NULL
+);
+CREATE INDEX IF NOT EXISTS IX_OrderItems_OrderID ON OrderItems (OrderID);
+
+CREATE TABLE IF NOT EXISTS AuthTokens (
+    TokenID INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserID INTEGER NOT NULL REFERENCES Users (UserID) ON DELETE CASCADE,
+    Token TEXT NOT NULL UNIQUE,
+    ExpiresAt TEXT NOT NULL,
+    CreatedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE IF NOT EXISTS Notifications (
+    NotificationID INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserID INTEGER NOT NULL REFERENCES Users (UserID) ON DELETE CASCADE,
+    OrderID INTEGER REFERENCES Orders (OrderID) ON DELETE CASCADE,
+    Message TEXT NOT NULL,
+    CreatedAt TEXT DEFAULT (datetime('now', 'localtime'))
+);
+"""
@@ -1,22 +1,139 @@
-import pyodbc
-from app.db.connection import get_connection
+from contextlib import contextmanager
+from itertools import islice
+from app.db.connection import get_connection, get_dialect
+from app.db.pool import PoolTimeout
+from app.db.rows import Row, schema_for
+from app.db.unit_of_work import current_unit
 
-def execute_query(query, params=None, fetch=False):
+# Parameter rows sent per executemany call
+BATCH_CHUNK_SIZE = 1000
+
+# Rows fetched per fetchmany call when streaming
+STREAM_CHUNK_SIZE = 500
+
+def execute_query(query, params=None, fetch=False, compact=False):
+    """Run a statement; with ``fetch`` return its rows as dictionaries.
+
+    ``compact=True`` returns tuple-backed Row objects instead, which share
+    one column index per result set and are much cheaper on large reads.
+    """
+    # Share the request's (or transaction's) connection when there is one
+    unit = current_unit()
     try:
+        if unit is not None:
+            result = _run_query(unit.connection, query, params, fetch, compact)
+            if not _is_read_only(query):
+                unit.dirty = True
+            return result
+
+        # Borrowed from the pool; leaving the block commits and returns it
         with get_connection() as connection:
-            with connection.cursor() as cursor:
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
-
-                if fetch:
-                    # Convert rows to dictionaries
-                    columns = [column[0] for column in cursor.description]
-                    return [dict(zip(columns, row)) for row in cursor.fetchall()]
-
-                connection.commit()
-    except pyodbc.Error as e:
+            return _run_query(connection, query, params, fetch, compact)
+    except (*get_dialect().errors, PoolTimeout) as e:
+        if unit is not None:
+            unit.mark_failed()
         print(f"Error while executing query: {e}")
         return None
 
+
+@contextmanager
+def stream_query(query, params=None, chunk_size=STREAM_CHUNK_SIZE):
+    """Stream a result set as dictionaries, fetched in chunks with ``fetchmany``.
+
+    Usage::
+
+        with stream_query("SELECT * FROM Products") as rows:
+            for row in rows:
+                ...
+
+    A dedicated pooled connection stays open until the ``with`` block exits,
+    so rows must be consumed inside it. Database errors are raised.
+    """
+    with get_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            if params:
+                cursor.execute(query, params)
+            else:
+                cursor.execute(query)
+            yield _iter_rows(cursor, chunk_size)
+        finally:
+            cursor.close()
+
+
+def execute_many(query, params_seq, chunk_size=BATCH_CHUNK_SIZE):
+    """Run one statement for every parameter tuple in ``params_seq``.
+
+    Rows are sent in chunks with ``executemany`` (with pyodbc's
+    ``fast_executemany`` on SQL Server). Returns the number of rows sent, or None on error.
+    """
+    if chunk_size < 1:
+        raise ValueError("⚠️ Chunk size must be greater than 0.")
+
+    unit = current_unit()
+    try:
+        if unit is not None:
+            count = _run_many(unit.connection, query, params_seq, chunk_size)
+            if count:
+                unit.dirty = True
+            return count
+
+        with get_connection() as connection:
+            return _run_many(connection, query, params_seq, chunk_size)
+    except (*get_dialect().errors, PoolTimeout) as e:
+        if unit is not None:
+            unit.mark_failed()
+        print(f"Error while executing batch: {e}")
+        return None
+
+
+def _run_query(connection, query, params, fetch, compact):
+    # Cursors are closed explicitly: their context manager would commit
+    cursor = connection.cursor()
+    try:
+        if params:
+            cursor.execute(query, params)
+        else:
+            cursor.execute(query)
+
+        if fetch:
+            if compact:
+                schema = schema_for(cursor.description)
+                return [Row(schema, row) for row in cursor.fetchall()]
+
+            # Convert rows to dictionaries
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+
+
+def _iter_rows(cursor, chunk_size):
+    columns = [column[0] for column in cursor.description]
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def _run_many(connection, query, params_seq, chunk_size):
+    params_iter = iter(params_seq)
+    count = 0
+    cursor = connection.cursor()
+    try:
+        get_dialect().prepare_bulk_cursor(cursor)
+        while True:
+            chunk = list(islice(params_iter, chunk_size))
+            if not chunk:
+                break
+            cursor.executemany(query, chunk)
+            count += len(chunk)
+    finally:
+        cursor.close()
+    return count
+
+
+def _is_read_only(query):
+    return query.lstrip().upper().startswith("SELECT")
@@ -0,0 +1,105 @@
+import base64
+import json
+from datetime import datetime
+from app.db.connection import get_dialect
+from app.db.execute_query import execute_query
+
+# Rows per page when the client does not ask for a size, and the largest size allowed
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(values):
+    """Turn the sort key of the last row on a page into an opaque cursor."""
+    payload = [{"dt": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    data = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor, size):
+    """Return the sort key values stored in ``cursor``, which must hold ``size`` of them."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(payload, list) or len(payload) != size:
+            raise ValueError
+        return [
+            datetime.fromisoformat(value["dt"]) if isinstance(value, dict) else value
+            for value in payload
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise ValueError("⚠️ Invalid cursor.")
+
+
+def parse_page_size(value):
+    """Validate a requested page size, defaulting to DEFAULT_PAGE_SIZE."""
+    if value in (None, ""):
+        return DEFAULT_PAGE_SIZE
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        raise ValueError("⚠️ Page size must be a number.")
+    if size < 1 or size > MAX_PAGE_SIZE:
+        raise ValueError(f"⚠️ Page size must be between 1 and {MAX_PAGE_SIZE}.")
+    return size
+
+
+def keyset_condition(order_by, values, descending=False):
+    """WHERE condition selecting the rows after ``values`` in ``order_by`` order.
+
+    Expanded as ``a > ? OR (a = ? AND b > ?)`` rather than a row value
+    comparison, which SQL Server does not support.
+    """
+    operator = "<" if descending else ">"
+    terms = []
+    params = []
+    for position, column in enumerate(order_by):
+        parts = [f"{previous} = ?" for previous in order_by[:position]]
+        parts.append(f"{column} {operator} ?")
+        terms.append("(" + " AND ".join(parts) + ")")
+        params.extend(values[:position + 1])
+    return "(" + " OR ".join(terms) + ")", params
+
+
+def fetch_page(select, order_by, key_columns, where=(), params=(), group_by=None,
+               cursor=None, limit=DEFAULT_PAGE_SIZE, descending=False):
+    """Run one page of a keyset-paginated query.
+
+    ``select`` is the SELECT ... FROM ... part, ``where`` a list of extra
+    conditions and ``order_by`` the (unique) sort columns; ``key_columns``
+    names the same columns in the result rows. Rows after ``cursor`` are
+    read straight from the index, so a deep page costs the same as the
+    first. Returns ``(rows, next_cursor)``, with ``next_cursor`` None on
+    the last page, or ``(None, None)`` on a database error. Raises
+    ValueError for a malformed cursor.
+    """
+    conditions = list(where)
+    params = list(params)
+    if cursor:
+        values = decode_cursor(cursor, len(order_by))
+        condition, condition_params = keyset_condition(order_by, values, descending)
+        conditions.append(condition)
+        params.extend(condition_params)
+
+    direction = " DESC" if descending else ""
+    query = select
+    if conditions:
+        query += "\nWHERE " + " AND ".join(conditions)
+    if group_by:
+        query += "\nGROUP BY " + group_by
+    query += "\nORDER BY " + ", ".join(column + direction for column in order_by)
+    # One extra row tells whether there is a next page
+    query += "\n" + get_dialect().limit(limit + 1)
+
+    rows = execute_query(query, tuple(params), fetch=True, compact=True)
+    if rows is None:
+        return None, None
+    return page_of(rows, limit, key_columns)
+
+
+def page_of(rows, limit, key_columns):
+    """Trim ``rows`` (up to limit + 1 of them) to a page and its next cursor."""
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([rows[-1][column] for column in key_columns])
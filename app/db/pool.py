@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """Raised when no connection becomes available within the wait timeout."""
+
+
+class PooledConnection:
+    """Connection handed out by the pool.
+
+    Behaves like the underlying connection. Closing it, or leaving a ``with``
+    block, hands the connection back to the pool instead of closing it.
+    """
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._released:
+            return
+        try:
+            if exc_type is None:
+                self._connection.commit()
+            else:
+                self._connection.rollback()
+        except Exception:
+            # Connection is in an unknown state, don't hand it out again
+            self.discard()
+            raise
+        self._release()
+
+    def close(self):
+        """Roll back any open work and return the connection to the pool."""
+        if self._released:
+            return
+        try:
+            self._connection.rollback()
+        except Exception:
+            self.discard()
+            return
+        self._release()
+
+    def discard(self):
+        """Close the underlying connection and drop it from the pool."""
+        if not self._released:
+            self._released = True
+            self._pool.release(self._connection, discard=True)
+
+    def _release(self):
+        self._released = True
+        self._pool.release(self._connection)
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of database connections."""
+
+    def __init__(self, connect, min_size=1, max_size=10, idle_timeout=300.0,
+                 wait_timeout=30.0, ping_interval=30.0, ping_query="SELECT 1"):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("⚠️ Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1.")
+
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.wait_timeout = wait_timeout
+        self.ping_interval = ping_interval
+        self.ping_query = ping_query
+
+        self._idle = deque()  # (connection, returned_at) pairs, most recent last
+        self._size = 0  # open connections, idle and checked out
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        self._stats = {
+            "created": 0,
+            "discarded": 0,
+            "acquired": 0,
+            "waits": 0,
+            "timeouts": 0,
+            "total_wait_time": 0.0,
+            "max_wait_time": 0.0,
+        }
+
+    def acquire(self, timeout=None):
+        """Borrow a connection, waiting up to ``timeout`` seconds for one to free up."""
+        timeout = self.wait_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        while True:
+            connection, returned_at = self._checkout(deadline)
+
+            if connection is None:
+                # A slot was reserved for a brand new connection
+                try:
+                    connection = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats["created"] += 1
+            elif time.monotonic() - returned_at >= self.ping_interval and not self._is_healthy(connection):
+                self.release(connection, discard=True)
+                continue
+
+            waited = time.monotonic() - started
+            with self._cond:
+                self._stats["acquired"] += 1
+                self._stats["total_wait_time"] += waited
+                self._stats["max_wait_time"] = max(self._stats["max_wait_time"], waited)
+            return PooledConnection(self, connection)
+
+    def release(self, connection, discard=False):
+        """Return a connection to the pool, or close it when ``discard`` is set."""
+        with self._cond:
+            if discard or self._closed:
+                self._size -= 1
+                self._stats["discarded"] += 1
+            else:
+                self._idle.append((connection, time.monotonic()))
+                connection = None
+            self._cond.notify()
+
+        if connection is not None:
+            self._close_quietly(connection)
+
+    def prune(self):
+        """Close idle connections that exceeded the idle timeout, keeping min_size open."""
+        expired = []
+        with self._cond:
+            now = time.monotonic()
+            while self._idle and self._size > self.min_size and now - self._idle[0][1] >= self.idle_timeout:
+                expired.append(self._idle.popleft()[0])
+                self._size -= 1
+                self._stats["discarded"] += 1
+        for connection in expired:
+            self._close_quietly(connection)
+        return len(expired)
+
+    def close(self):
+        """Close every idle connection; checked out connections are closed when released."""
+        with self._cond:
+            self._closed = True
+            idle = [connection for connection, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for connection in idle:
+            self._close_quietly(connection)
+
+    def stats(self):
+        """Return a snapshot of the pool counters."""
+        with self._cond:
+            stats = dict(self._stats)
+            stats["size"] = self._size
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = self._size - len(self._idle)
+        if stats["acquired"]:
+            stats["avg_wait_time"] = stats["total_wait_time"] / stats["acquired"]
+        else:
+            stats["avg_wait_time"] = 0.0
+        return stats
+
+    def _checkout(self, deadline):
+        """Pop an idle connection or reserve a slot for a new one (returns None)."""
+        expired = []
+        try:
+            with self._cond:
+                waited = False
+                while True:
+                    if self._closed:
+                        raise PoolTimeout("⚠️ Connection pool is closed.")
+
+                    now = time.monotonic()
+                    while self._idle:
+                        connection, returned_at = self._idle.pop()
+                        if now - returned_at >= self.idle_timeout and self._size > self.min_size:
+                            expired.append(connection)
+                            self._size -= 1
+                            self._stats["discarded"] += 1
+                            continue
+                        return connection, returned_at
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, now
+
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        self._stats["timeouts"] += 1
+                        raise PoolTimeout("⚠️ Timed out waiting for a database connection.")
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    self._cond.wait(remaining)
+        finally:
+            for connection in expired:
+                self._close_quietly(connection)
+
+    def _is_healthy(self, connection):
+        """Run the ping query to make sure the connection is still usable."""
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(self.ping_query)
+                cursor.fetchall()
+            finally:
+                cursor.close()
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
@@ -0,0 +1,91 @@
+from collections.abc import Mapping
+
+# Result set shapes seen so far, keyed by their column names
+_schemas = {}
+_MAX_SCHEMAS = 256
+
+
+class RowSchema:
+    """Column names of a result set and their positions, shared by all its rows."""
+
+    __slots__ = ("columns", "index")
+
+    def __init__(self, columns):
+        self.columns = tuple(columns)
+        self.index = {name: position for position, name in enumerate(self.columns)}
+
+
+def schema_for(description):
+    """Return the cached RowSchema for a cursor description."""
+    columns = tuple(column[0] for column in description)
+    schema = _schemas.get(columns)
+    if schema is None:
+        if len(_schemas) >= _MAX_SCHEMAS:
+            _schemas.clear()
+        schema = _schemas[columns] = RowSchema(columns)
+    return schema
+
+
+class Row(Mapping):
+    """Read-only, tuple-backed result row with dict-style access.
+
+    ``row['Name']``, ``row.get('Name')``, ``row.keys()`` and ``dict(row)``
+    work as they do on the dictionaries returned by default; integer keys
+    index by position. Rows only become real dictionaries when serialized.
+    """
+
+    __slots__ = ("_schema", "_values")
+
+    def __init__(self, schema, values):
+        self._schema = schema
+        self._values = values
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._schema.index[key]]
+        except KeyError:
+            if isinstance(key, int):
+                return self._values[key]
+            raise
+
+    def __contains__(self, key):
+        return key in self._schema.index
+
+    def __iter__(self):
+        return iter(self._schema.columns)
+
+    def __len__(self):
+        return len(self._schema.columns)
+
+    def to_dict(self):
+        return dict(zip(self._schema.columns, self._values))
+
+    def __repr__(self):
+        return f"Row({self.to_dict()!r})"
+
+
+def init_app(app):
+    """Let jsonify serialize Row objects."""
+    try:
+        from flask.json.provider import DefaultJSONProvider
+    except ImportError:
+        # Flask < 2.2 uses a JSONEncoder class
+        from flask.json import JSONEncoder
+
+        class RowJSONEncoder(JSONEncoder):
+            def default(self, o):
+                if isinstance(o, Row):
+                    return o.to_dict()
+                return super().default(o)
+
+        app.json_encoder = RowJSONEncoder
+        return
+
+    class RowJSONProvider(DefaultJSONProvider):
+        @staticmethod
+        def default(o):
+            if isinstance(o, Row):
+                return o.to_dict()
+            return DefaultJSONProvider.default(o)
+
+    app.json = RowJSONProvider(app)
@@ -0,0 +1,126 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g, has_request_context, jsonify
+from app.db.connection import get_connection
+
+_current_unit = ContextVar("current_unit", default=None)
+
+
+class UnitOfWork:
+    """A single borrowed connection shared by several queries.
+
+    The connection is only borrowed when the first query runs, and every
+    statement executed through it is committed or rolled back together.
+    """
+
+    def __init__(self):
+        self._connection = None
+        self.failed = False  # a statement raised a database error
+        self.dirty = False  # at least one write statement was executed
+        self._after_commit = []
+
+    @property
+    def connection(self):
+        if self._connection is None:
+            self._connection = get_connection()
+        return self._connection
+
+    def mark_failed(self):
+        self.failed = True
+
+    def after_commit(self, callback):
+        """Run ``callback`` once the work is committed; it is dropped on rollback."""
+        self._after_commit.append(callback)
+
+    def finish(self, commit=True):
+        """Commit the work (unless a statement failed) or roll it back, then release the connection."""
+        connection, self._connection = self._connection, None
+        callbacks, self._after_commit = self._after_commit, []
+        committed = commit and not self.failed
+        if connection is not None:
+            if committed:
+                with connection:
+                    pass  # leaving the block commits and returns the connection
+            else:
+                connection.close()  # rolls back and returns the connection
+        if committed:
+            for callback in callbacks:
+                try:
+                    callback()
+                except Exception as e:
+                    # The data is already committed; a failing listener must not undo the response
+                    print(f"Error in after-commit callback: {e}")
+
+
+def current_unit():
+    """Return the active unit of work: an explicit transaction first, then the request's."""
+    unit = _current_unit.get()
+    if unit is None and has_request_context():
+        unit = g.get('db_unit')
+    return unit
+
+
+@contextmanager
+def transaction(join=True):
+    """Run the enclosed queries on one connection and commit them together.
+
+    Inside a request, or inside another transaction, the existing unit of
+    work is joined and committed with it, unless ``join`` is False: the
+    enclosed queries then commit or roll back on their own, e.g. one chunk
+    of a bulk import at a time.
+    """
+    outer = current_unit() if join else None
+    if outer is not None:
+        try:
+            yield outer
+        except Exception:
+            outer.mark_failed()
+            raise
+        return
+
+    unit = UnitOfWork()
+    token = _current_unit.set(unit)
+    try:
+        yield unit
+    except Exception:
+        unit.finish(commit=False)
+        raise
+    else:
+        unit.finish()
+    finally:
+        _current_unit.reset(token)
+
+
+def init_app(app):
+    """Give every request its own unit of work, committed once at the end."""
+
+    @app.before_request
+    def _begin_request_unit():
+        g.db_unit = UnitOfWork()
+
+    @app.after_request
+    def _commit_request_unit(response):
+        unit = g.pop('db_unit', None)
+        if unit is None:
+            return response
+
+        if unit.failed and unit.dirty:
+            unit.finish(commit=False)
+            response = jsonify({"message": "⚠️ A database error occurred. Changes were rolled back."})
+            response.status_code = 500
+            return response
+
+        try:
+            unit.finish()
+        except Exception as e:
+            print(f"Error while committing request: {e}")
+            response = jsonify({"message": "⚠️ A database error occurred. Changes were rolled back."})
+            response.status_code = 500
+        return response
+
+    @app.teardown_request
+    def _rollback_request_unit(error=None):
+        # Only reached with a unit still open when the request raised
+        unit = g.pop('db_unit', None)
+        if unit is not None:
+            unit.finish(commit=False)
@@ -1,60 +1,70 @@
-from app.db import execute_query
+from app.db import execute_query, get_dialect
+
+# Returned by the cart writes
+CART_LINE_COLUMNS = ("CartID", "UserID", "ProductID", "Quantity", "AddedAt")
 
 class Cart:
     def __init__(self, user_id):
         self.user_id = user_id
 
     def add_to_cart(self, product_id, quantity):
-        """Add item to cart."""
+        """Add item to cart, or add to its quantity if it is already there.
+
+        One upsert, so concurrent adds of the same product all count.
+        Returns the cart line after the write.
+        """
         # Validate quantity
         if quantity <= 0:
             raise ValueError("⚠️ Quantity must be greater than 0.")
 
-        # Check if item exists in cart
-        existing_item = self.get_cart_item(product_id)
-
-        if existing_item:
-            # Update quantity if item exists
-            new_quantity = existing_item['Quantity'] + quantity
-            self.update_cart(product_id, new_quantity)
-        else:
-            # Add new item to cart
-            query = """
-            INSERT INTO Cart (UserID, ProductID, Quantity, AddedAt)
-            VALUES (?, ?, ?, GETDATE())
-            """
-            execute_query(query, (self.user_id, product_id, quantity))
-            print(f"Product added to cart successfully.")
+        dialect = get_dialect()
+        query = dialect.upsert_increment(
+            "Cart", ("UserID", "ProductID"), "Quantity", CART_LINE_COLUMNS, {"AddedAt": dialect.now}
+        )
+        result = execute_query(query, (self.user_id, product_id, quantity), fetch=True)
+        if not result:
+            return None
+        print(f"Product added to cart successfully.")
+        return result[0]
 
     def update_cart(self, product_id, new_quantity):
-        """Update cart item quantity."""
+        """Update cart item quantity and return the updated line."""
         # Validate quantity
         if new_quantity <= 0:
             raise ValueError("⚠️ Quantity must be greater than 0.")
 
-        # Check if item exists in cart
-        existing_item = self.get_cart_item(product_id)
-        if not existing_item:
-            raise ValueError("⚠️ Product not found in cart.")
-
-        query = """
+        dialect = get_dialect()
+        query = f"""
         UPDATE Cart
         SET Quantity = ?
+        {dialect.output_inserted(*CART_LINE_COLUMNS)}
         WHERE UserID = ? AND ProductID = ?
+        {dialect.returning(*CART_LINE_COLUMNS)}
         """
-        execute_query(query, (new_quantity, self.user_id, product_id))
+        result = execute_query(query, (new_quantity, self.user_id, product_id), fetch=True)
+        if result is None:
+            return None
+        if not result:
+            raise ValueError("⚠️ Product not found in cart.")
         print(f"Cart quantity updated successfully.")
+        return result[0]
 
     def remove_from_cart(self, product_id):
-        """Remove item from cart."""
-        # Check if item exists in cart
-        existing_item = self.get_cart_item(product_id)
-        if not existing_item:
+        """Remove item from cart and return the removed line."""
+        dialect = get_dialect()
+        query = f"""
+        DELETE FROM Cart
+        {dialect.output_deleted(*CART_LINE_COLUMNS)}
+        WHERE UserID = ? AND ProductID = ?
+        {dialect.returning(*CART_LINE_COLUMNS)}
+        """
+        result = execute_query(query, (self.user_id, product_id), fetch=True)
+        if result is None:
+            return None
+        if not result:
             raise ValueError("⚠️ Product not found in cart.")
-
-        query = "DELETE FROM Cart WHERE UserID = ? AND ProductID = ?"
-        execute_query(query, (self.user_id, product_id))
         print(f"Product removed from cart successfully.")
+        return result[0]
 
     def clear_cart(self):
         """Remove all items from user's cart."""
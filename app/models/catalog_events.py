@@ -0,0 +1,63 @@
+from abc import ABC, abstractmethod
+from app.db.unit_of_work import current_unit
+
+
+# Observer Pattern for catalog changes
+class CatalogObserver(ABC):
+    """Abstract base class for catalog observers."""
+
+    @abstractmethod
+    def update(self, event, product_id=None, changes=None):
+        """Called after a committed change to the Products table.
+
+        ``event`` is one of CatalogSubject's event names. ``changes`` maps
+        Products columns to their new values; for ``STOCK_ADJUSTED`` it
+        holds the quantity taken off under ``"Quantity"``.
+        ``CATEGORY_CHANGED`` announces a write to the Categories table
+        instead, without a product id.
+        """
+        pass
+
+
+class CatalogSubject:
+    """Subject class for catalog changes."""
+
+    ADDED = "added"
+    UPDATED = "updated"
+    STOCK_ADJUSTED = "stock_adjusted"
+    DELETED = "deleted"
+    CATEGORY_CHANGED = "category_changed"
+
+    _observers = []
+
+    @classmethod
+    def attach(cls, observer):
+        """Attach an observer."""
+        if observer not in cls._observers:
+            cls._observers.append(observer)
+
+    @classmethod
+    def detach(cls, observer):
+        """Detach an observer."""
+        try:
+            cls._observers.remove(observer)
+        except ValueError:
+            pass
+
+    @classmethod
+    def notify(cls, event, product_id=None, changes=None):
+        """Notify all observers, once the current unit of work commits.
+
+        Without a unit of work the observers are notified right away.
+        Rolled back changes are never announced.
+        """
+        unit = current_unit()
+        if unit is not None:
+            unit.after_commit(lambda: cls._dispatch(event, product_id, changes))
+        else:
+            cls._dispatch(event, product_id, changes)
+
+    @classmethod
+    def _dispatch(cls, event, product_id, changes):
+        for observer in list(cls._observers):
+            observer.update(event, product_id, changes)
@@ -1,18 +1,85 @@
-from app.db import execute_query
+from app.db import execute_query, execute_many, transaction, BATCH_CHUNK_SIZE, get_dialect
+from app.models.catalog_events import CatalogSubject
+
+# CategoryClosure holds a row for every (ancestor, descendant) pair of the
+# category tree, ``Depth`` levels apart, including each category as its own
+# ancestor at depth 0. A subtree is then one range of the primary key.
+# Links a new category ? to itself and to every ancestor of its parent ?
+# (none for a top-level category).
+_LINK_CATEGORY = """
+INSERT INTO CategoryClosure (AncestorID, DescendantID, Depth)
+SELECT AncestorID, ?, Depth + 1 FROM CategoryClosure WHERE DescendantID = ?
+UNION ALL SELECT ?, ?, 0
+"""
+
+# Self rows of categories added without going through _LINK_CATEGORY
+_LINK_UNLINKED_CATEGORIES = """
+INSERT INTO CategoryClosure (AncestorID, DescendantID, Depth)
+SELECT c.CategoryID, c.CategoryID, 0 FROM Categories c
+WHERE NOT EXISTS (SELECT 1 FROM CategoryClosure cc WHERE cc.AncestorID = c.CategoryID AND cc.DescendantID = c.CategoryID)
+"""
+
+# Links every category of the subtree under ? (second parameter) to the
+# parent ? (first parameter) and all of the parent's ancestors
+_LINK_SUBTREE = """
+INSERT INTO CategoryClosure (AncestorID, DescendantID, Depth)
+SELECT a.AncestorID, d.DescendantID, a.Depth + d.Depth + 1
+FROM CategoryClosure a
+CROSS JOIN CategoryClosure d
+WHERE a.DescendantID = ? AND d.AncestorID = ?
+"""
+
+# Detaches the subtree under ? from every ancestor outside of it
+_UNLINK_SUBTREE = """
+DELETE FROM CategoryClosure
+WHERE DescendantID IN (SELECT DescendantID FROM CategoryClosure WHERE AncestorID = ?)
+  AND AncestorID NOT IN (SELECT DescendantID FROM CategoryClosure WHERE AncestorID = ?)
+"""
 
 
 class Category:
-    def __init__(self, name, description):
+    def __init__(self, name, description, parent_id=None):
         self.name = name
         self.description = description
+        self.parent_id = parent_id
+        self.id = None
 
     def add_category(self):
-        query = """
-        INSERT INTO Categories (Name, Description, CreatedAt)
-        VALUES (?, ?, GETDATE())
+        """Add the category, under its parent if it has one, and return its new ID."""
+        dialect = get_dialect()
+        query = f"""
+        INSERT INTO Categories (Name, Description, ParentID, CreatedAt)
+        {dialect.output_inserted("CategoryID")}
+        VALUES (?, ?, ?, {dialect.now})
+        {dialect.returning("CategoryID")}
         """
-        execute_query(query, (self.name, self.description))
+        with transaction():
+            result = execute_query(query, (self.name, self.description, self.parent_id), fetch=True)
+            if result:
+                self.id = result[0]['CategoryID']
+                execute_query(_LINK_CATEGORY, (self.id, self.parent_id, self.id, self.id))
+            CatalogSubject.notify(CatalogSubject.CATEGORY_CHANGED)
         print(f"Category '{self.name}' added successfully.")
+        return self.id
+
+    @staticmethod
+    def add_categories(categories, chunk_size=BATCH_CHUNK_SIZE):
+        """Add many top-level categories with a single batched insert."""
+        categories = list(categories)
+        if any(category.parent_id is not None for category in categories):
+            raise ValueError("⚠️ Subcategories must be added one at a time.")
+        query = f"""
+        INSERT INTO Categories (Name, Description, CreatedAt)
+        VALUES (?, ?, {get_dialect().now})
+        """
+        params = ((category.name, category.description) for category in categories)
+        with transaction():
+            count = execute_many(query, params, chunk_size=chunk_size)
+            if count:
+                execute_query(_LINK_UNLINKED_CATEGORIES)
+                CatalogSubject.notify(CatalogSubject.CATEGORY_CHANGED)
+        print(f"{count or 0} categories added successfully.")
+        return count
 
     def update_category(self, category_id):
         query = """
@@ -21,11 +88,38 @@ class Category:
         WHERE CategoryID = ?
         """
         execute_query(query, (self.name, self.description, category_id))
+        CatalogSubject.notify(CatalogSubject.CATEGORY_CHANGED)
         print(f"Category '{self.name}' updated successfully.")
 
+    @staticmethod
+    def move_category(category_id, parent_id):
+        """Move a category, with its whole subtree, under ``parent_id`` (None for the top level).
+
+        Raises ValueError when the new parent is the category itself or one
+        of its subcategories. Returns False on a database error.
+        """
+        if parent_id is not None:
+            if parent_id == category_id:
+                raise ValueError("⚠️ A category cannot be its own parent.")
+            query = "SELECT 1 AS Found FROM CategoryClosure WHERE AncestorID = ? AND DescendantID = ?"
+            if execute_query(query, (category_id, parent_id), fetch=True):
+                raise ValueError("⚠️ A category cannot be moved under one of its subcategories.")
+
+        with transaction() as unit:
+            execute_query(_UNLINK_SUBTREE, (category_id, category_id))
+            if parent_id is not None:
+                execute_query(_LINK_SUBTREE, (parent_id, category_id))
+            execute_query("UPDATE Categories SET ParentID = ? WHERE CategoryID = ?", (parent_id, category_id))
+            if unit.failed:
+                return False
+            CatalogSubject.notify(CatalogSubject.CATEGORY_CHANGED)
+        print("Category moved successfully.")
+        return True
+
     def delete_category(self, category_id):
         query = "DELETE FROM Categories WHERE CategoryID = ?"
         execute_query(query, (category_id,))
+        CatalogSubject.notify(CatalogSubject.CATEGORY_CHANGED)
         print(f"Category deleted successfully.")
 
     @staticmethod
@@ -42,3 +136,14 @@ class Category:
         """Get all categories."""
         query = "SELECT * FROM Categories ORDER BY Name"
         return execute_query(query, fetch=True)
+
+    @staticmethod
+    def get_product_counts():
+        """Number of products in each category, as (CategoryID, ProductCount) rows."""
+        query = """
+        SELECT CategoryID, COUNT(*) AS ProductCount
+        FROM Products
+        WHERE CategoryID IS NOT NULL
+        GROUP BY CategoryID
+        """
+        return execute_query(query, fetch=True, compact=True)
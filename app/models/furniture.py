@@ -1,11 +1,44 @@
+import gc
+import inspect
+import re
 from abc import ABC, abstractmethod
-from app.db import execute_query
+from app.db import execute_query, execute_many, transaction, BATCH_CHUNK_SIZE, get_dialect
+from app.models.catalog_events import CatalogSubject
+
+
+# Products columns written for every furniture object, in _columns() order
+PRODUCT_COLUMNS = ("Name", "Description", "Price", "Dimensions", "StockQuantity", "CategoryID", "ImageURL", "FurnitureType",
+                   "Width", "Depth", "Height")
+
+# Numbers parsed from Dimensions, in centimetres
+DIMENSION_COLUMNS = ("Width", "Depth", "Height")
+
+# "60x60x100", "60 x 45.5 x 100 cm", "600×450×1000mm"
+_DIMENSIONS = re.compile(
+    r"^\s*(\d+(?:[.,]\d+)?)\s*[x×*]\s*(\d+(?:[.,]\d+)?)\s*[x×*]\s*(\d+(?:[.,]\d+)?)\s*(cm|mm|m|in)?\s*$",
+    re.IGNORECASE
+)
+
+# Centimetres per unit
+_UNITS = {"cm": 1.0, "mm": 0.1, "m": 100.0, "in": 2.54}
+
+_INSERT_ATTRIBUTES = """
+INSERT INTO ProductAttributes (ProductID, Name, NumberValue, TextValue)
+VALUES (?, ?, ?, ?)
+"""
 
 
 class Furniture(ABC):
     """Base abstract class for all furniture items."""
 
+    # Slotted to keep large catalogs small in memory
+    __slots__ = ("id", "name", "description", "price", "dimensions", "stock_quantity", "category_id", "image_url")
+
+    # Type-specific attributes stored in ProductAttributes, with their types
+    attribute_types = {}
+
     def __init__(self, name, description, price, dimensions, stock_quantity, category_id, image_url):
+        self.id = None
         self.name = name
         self.description = description
         self.price = price
@@ -15,94 +48,155 @@ class Furniture(ABC):
         self.image_url = image_url
 
     def add_furniture(self):
-        """Add furniture to the database."""
-        query = """
-        INSERT INTO Products (Name, Description, Price, Dimensions, StockQuantity, CategoryID, ImageURL, FurnitureType, CreatedAt)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, GETDATE())
+        """Add furniture to the database and return its new ID."""
+        dialect = get_dialect()
+        query = f"""
+        INSERT INTO Products (Name, Description, Price, Dimensions, StockQuantity, CategoryID, ImageURL, FurnitureType,
+                              Width, Depth, Height, CreatedAt)
+        {dialect.output_inserted("ProductID", "CreatedAt")}
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {dialect.now})
+        {dialect.returning("ProductID", "CreatedAt")}
         """
-        execute_query(query, (
-            self.name,
-            self.description,
-            self.price,
-            self.dimensions,
-            self.stock_quantity,
-            self.category_id,
-            self.image_url,
-            self.get_furniture_type()
-        ))
+        with transaction():
+            result = execute_query(query, (
+                self.name,
+                self.description,
+                self.price,
+                self.dimensions,
+                self.stock_quantity,
+                self.category_id,
+                self.image_url,
+                self.get_furniture_type(),
+                *parse_dimensions(self.dimensions)
+            ), fetch=True)
+
+            if result:
+                self.id = result[0]['ProductID']
+                self._save_attributes(self.id)
+                row = dict(self._columns(), ProductID=self.id, CreatedAt=result[0]['CreatedAt'])
+                CatalogSubject.notify(CatalogSubject.ADDED, self.id, row)
+                return self.id
+
+            # Nothing was committed, so there is nothing to announce
+            return None
 
     def update_furniture(self, furniture_id):
         """Update furniture in the database."""
         query = """
         UPDATE Products
         SET Name = ?, Description = ?, Price = ?, Dimensions = ?, 
-            StockQuantity = ?, CategoryID = ?, ImageURL = ?, FurnitureType = ?
+            StockQuantity = ?, CategoryID = ?, ImageURL = ?, FurnitureType = ?,
+            Width = ?, Depth = ?, Height = ?
         WHERE ProductID = ?
         """
-        execute_query(query, (
-            self.name,
-            self.description,
-            self.price,
-            self.dimensions,
-            self.stock_quantity,
-            self.category_id,
-            self.image_url,
-            self.get_furniture_type(),
-            furniture_id
-        ))
+        with transaction():
+            execute_query(query, (
+                self.name,
+                self.description,
+                self.price,
+                self.dimensions,
+                self.stock_quantity,
+                self.category_id,
+                self.image_url,
+                self.get_furniture_type(),
+                *parse_dimensions(self.dimensions),
+                furniture_id
+            ))
+            self._save_attributes(furniture_id, replace=True)
+            CatalogSubject.notify(CatalogSubject.UPDATED, furniture_id, self._columns())
+
+    def attributes(self):
+        """Values of the type-specific attributes, by name."""
+        return {name: getattr(self, name, None) for name in self.attribute_types}
 
-    def to_dict(self):
-        result = {
-            "id": getattr(self, 'id', None),
-            "name": self.name,
-            "description": self.description,
-            "price": float(self.price),
-            "dimensions": self.dimensions,
-            "stock_quantity": self.stock_quantity,
-            "category_id": self.category_id,
-            "image_url": self.image_url,
-            "furniture_type": self.get_furniture_type()
+    @staticmethod
+    def add_many(furnitures):
+        """Add many furniture objects with a few multi-row INSERTs.
+
+        Every statement inserts as many products as the database accepts
+        parameters for, and the attributes of all of them go in one batch.
+        Sets each object's ``id`` and returns the number added, or None on a
+        database error, after which the unit of work must not be committed.
+        """
+        furnitures = list(furnitures)
+        dialect = get_dialect()
+        per_statement = max(1, dialect.max_params // len(PRODUCT_COLUMNS))
+        attribute_rows = []
+        with transaction():
+            for start in range(0, len(furnitures), per_statement):
+                batch = furnitures[start:start + per_statement]
+                query = dialect.insert_many(
+                    "Products", PRODUCT_COLUMNS, len(batch), ("ProductID",), {"CreatedAt": dialect.now}
+                )
+                params = [value for furniture in batch for value in furniture._columns().values()]
+                result = execute_query(query, params, fetch=True)
+                if not result:
+                    return None
+                for furniture, row in zip(batch, sorted(result, key=lambda row: row['InsertOrder'])):
+                    furniture.id = row['ProductID']
+                    attribute_rows.extend(furniture._attribute_rows(furniture.id))
+            if attribute_rows and execute_many(_INSERT_ATTRIBUTES, attribute_rows) is None:
+                return None
+            if furnitures:
+                # One reload of the cached catalog instead of an event per product
+                CatalogSubject.notify(CatalogSubject.ADDED)
+        return len(furnitures)
+
+    def _attribute_rows(self, furniture_id):
+        # ProductAttributes rows of the attributes that have a value
+        return [
+            (furniture_id, name) + _stored_value(value)
+            for name, value in self.attributes().items() if value is not None
+        ]
+
+    def _save_attributes(self, furniture_id, replace=False):
+        """Store the type-specific attributes, one typed row each."""
+        if replace:
+            execute_query("DELETE FROM ProductAttributes WHERE ProductID = ?", (furniture_id,))
+        rows = self._attribute_rows(furniture_id)
+        if rows:
+            execute_many(_INSERT_ATTRIBUTES, rows)
+
+    def _columns(self):
+        """Products column values of this furniture."""
+        return {
+            "Name": self.name,
+            "Description": self.description,
+            "Price": self.price,
+            "Dimensions": self.dimensions,
+            "StockQuantity": self.stock_quantity,
+            "CategoryID": self.category_id,
+            "ImageURL": self.image_url,
+            "FurnitureType": self.get_furniture_type(),
+            **dict(zip(DIMENSION_COLUMNS, parse_dimensions(self.dimensions)))
         }
 
-        # Add specific properties according to the type of furniture
-        if self.get_furniture_type() == "Chair":
-            result.update({
-                "max_weight_capacity": getattr(self, 'max_weight_capacity', None),
-                "has_armrests": getattr(self, 'has_armrests', None),
-                "is_adjustable": getattr(self, 'is_adjustable', None)
-            })
-        elif self.get_furniture_type() == "Table":
-            result.update({
-                "shape": getattr(self, 'shape', None),
-                "max_weight_capacity": getattr(self, 'max_weight_capacity', None),
-                "is_extendable": getattr(self, 'is_extendable', None)
-            })
-        elif self.get_furniture_type() == "Sofa":
-            result.update({
-                "seats": getattr(self, 'seats', None),
-                "is_convertible": getattr(self, 'is_convertible', None),
-                "has_storage": getattr(self, 'has_storage', None)
-            })
-        elif self.get_furniture_type() == "Bed":
-            result.update({
-                "bed_size": getattr(self, 'bed_size', None),
-                "has_storage": getattr(self, 'has_storage', None),
-                "material_type": getattr(self, 'material_type', None)
-            })
-        elif self.get_furniture_type() == "Cabinet":
-            result.update({
-                "num_drawers": getattr(self, 'num_drawers', None),
-                "num_shelves": getattr(self, 'num_shelves', None),
-                "has_lock": getattr(self, 'has_lock', None)
-            })
+    def to_dict(self):
+        """JSON-ready dictionary of this furniture, through its class's compiled serializer."""
+        serialize = _SERIALIZERS.get(type(self))
+        if serialize is None:
+            serialize = compile_serializer(type(self), self.get_furniture_type())
+        return serialize(self)
 
+    @staticmethod
+    def to_dicts(products):
+        """Serialize many furniture objects, looking each class's serializer up once."""
+        serializers = _SERIALIZERS
+        result = []
+        for product in products:
+            serialize = serializers.get(type(product))
+            if serialize is None:
+                serialize = compile_serializer(type(product), product.get_furniture_type())
+            result.append(serialize(product))
         return result
 
     @staticmethod
     def delete_furniture(furniture_id):
         """Delete furniture from the database."""
         query = "DELETE FROM Products WHERE ProductID = ?"
-        execute_query(query, (furniture_id,))
+        with transaction():
+            execute_query(query, (furniture_id,))
+            CatalogSubject.notify(CatalogSubject.DELETED, furniture_id)
 
     @abstractmethod
     def get_furniture_type(self):
@@ -116,29 +210,124 @@ class Furniture(ABC):
 
     @staticmethod
     def get_furniture_by_id(furniture_id):
-        """Get furniture by ID."""
-        query = "SELECT * FROM Products WHERE ProductID = ?"
+        """Get furniture by ID, with its type-specific attributes."""
+        # One row per attribute (a single one without attributes)
+        query = """
+        SELECT p.*, a.Name AS AttributeName, a.NumberValue AS AttributeNumber, a.TextValue AS AttributeText
+        FROM Products p
+        LEFT JOIN ProductAttributes a ON a.ProductID = p.ProductID
+        WHERE p.ProductID = ?
+        """
         result = execute_query(query, (furniture_id,), fetch=True)
 
         if result:
-            row = result[0]
-            furniture_type = row['FurnitureType']
-
-            # Use Factory Pattern to create appropriate furniture object
-            return FurnitureFactory.create_furniture(
-                furniture_type,
-                row['Name'],
-                row['Description'],
-                row['Price'],
-                row['Dimensions'],
-                row['StockQuantity'],
-                row['CategoryID'],
-                row['ImageURL'],
-                row  # Pass the entire row for additional attributes
-            )
+            attributes = {
+                row['AttributeName']: _loaded_value(row['AttributeName'], row['AttributeNumber'], row['AttributeText'])
+                for row in result if row.get('AttributeName') is not None
+            }
+            return Furniture.from_row(result[0], attributes)
 
         return None
 
+    @staticmethod
+    def get_furnitures_by_ids(furniture_ids):
+        """Get many furniture objects, with their attributes, keyed by ID.
+
+        One ``WHERE ProductID IN (...)`` query per batch of ids the
+        database accepts parameters for; unknown ids are left out.
+        """
+        furniture_ids = list(furniture_ids)
+        per_query = get_dialect().max_params
+        rows, attributes = {}, {}
+        for start in range(0, len(furniture_ids), per_query):
+            batch = furniture_ids[start:start + per_query]
+            query = f"""
+            SELECT p.*, a.Name AS AttributeName, a.NumberValue AS AttributeNumber, a.TextValue AS AttributeText
+            FROM Products p
+            LEFT JOIN ProductAttributes a ON a.ProductID = p.ProductID
+            WHERE p.ProductID IN ({", ".join("?" for _ in batch)})
+            """
+            for row in execute_query(query, tuple(batch), fetch=True) or []:
+                product_id = row['ProductID']
+                rows.setdefault(product_id, row)
+                if row.get('AttributeName') is not None:
+                    attributes.setdefault(product_id, {})[row['AttributeName']] = _loaded_value(
+                        row['AttributeName'], row['AttributeNumber'], row['AttributeText']
+                    )
+        products = FurnitureFactory.create_many(rows.values(), attributes)
+        return {product.id: product for product in products}
+
+    @staticmethod
+    def from_row(row, attributes=None):
+        """Build the furniture object for a Products row and its stored attributes."""
+        additional_data = dict(row)
+        additional_data.update(attributes or {})
+        # Use Factory Pattern to create appropriate furniture object
+        furniture = FurnitureFactory.create_furniture(
+            row['FurnitureType'],
+            row['Name'],
+            row['Description'],
+            row['Price'],
+            row['Dimensions'],
+            row['StockQuantity'],
+            row['CategoryID'],
+            row['ImageURL'],
+            additional_data
+        )
+        furniture.id = row['ProductID']
+        return furniture
+
+    @staticmethod
+    def store_parsed_dimensions(chunk_size=BATCH_CHUNK_SIZE):
+        """Fill Width, Depth and Height of products saved before they were parsed.
+
+        Returns the number of products updated, or None on a database error.
+        """
+        query = "SELECT ProductID, Dimensions FROM Products WHERE Width IS NULL AND Dimensions IS NOT NULL"
+        rows = execute_query(query, fetch=True, compact=True)
+        if rows is None:
+            return None
+        params = []
+        for row in rows:
+            dimensions = parse_dimensions(row['Dimensions'])
+            if dimensions[0] is not None:
+                params.append((*dimensions, row['ProductID']))
+        if not params:
+            return 0
+
+        update = "UPDATE Products SET Width = ?, Depth = ?, Height = ? WHERE ProductID = ?"
+        with transaction():
+            count = execute_many(update, params, chunk_size=chunk_size)
+            if count:
+                # One reload of the cached catalog instead of an event per product
+                CatalogSubject.notify(CatalogSubject.UPDATED)
+        return count
+
+    @staticmethod
+    def get_discount_flags(rules):
+        """Stored values of the attributes the discount ``rules`` look at, one row per product.
+
+        ``rules`` is ``FurnitureFactory.discount_rules()``. Returns
+        (ProductID, Flag) rows for the products whose type's rule attribute
+        is stored, or None on a database error.
+        """
+        cases = " ".join("WHEN ? THEN ?" for _ in rules)
+        query = f"""
+        SELECT a.ProductID, a.NumberValue AS Flag
+        FROM ProductAttributes a
+        JOIN Products p ON p.ProductID = a.ProductID
+        WHERE a.Name = CASE p.FurnitureType {cases} END
+        """
+        params = tuple(value for furniture_type, (attribute, _, _) in rules.items() for value in (furniture_type, attribute))
+        return execute_query(query, params, fetch=True, compact=True)
+
+    @staticmethod
+    def find_ids_by_attributes(filters):
+        """Return the ids of products matching every ``(name, operator, value)`` attribute filter."""
+        query, params = attribute_filter_query(filters)
+        result = execute_query(query, params, fetch=True)
+        return [row['ProductID'] for row in result or []]
+
     @staticmethod
     def update_stock(furniture_id, quantity):
         """Update furniture stock."""
@@ -147,14 +336,43 @@ class Furniture(ABC):
         SET StockQuantity = StockQuantity - ?
         WHERE ProductID = ?
         """
-        execute_query(query, (quantity, furniture_id))
+        with transaction():
+            execute_query(query, (quantity, furniture_id))
+            CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, furniture_id, {"Quantity": quantity})
         print(f"Stock updated for product {furniture_id}.")
 
+    @staticmethod
+    def update_stock_bulk(stock_changes, chunk_size=BATCH_CHUNK_SIZE):
+        """Update stock for many products with a single batched update.
+
+        ``stock_changes`` is an iterable of (furniture_id, quantity) pairs.
+        """
+        query = """
+        UPDATE Products
+        SET StockQuantity = StockQuantity - ?
+        WHERE ProductID = ?
+        """
+        stock_changes = list(stock_changes)
+        params = ((quantity, furniture_id) for furniture_id, quantity in stock_changes)
+        with transaction():
+            count = execute_many(query, params, chunk_size=chunk_size)
+            if count:
+                for furniture_id, quantity in stock_changes:
+                    CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, furniture_id, {"Quantity": quantity})
+        print(f"Stock updated for {count or 0} products.")
+        return count
+
 
 
 class Chair(Furniture):
     """Chair furniture type."""
 
+    __slots__ = ("max_weight_capacity", "has_armrests", "is_adjustable")
+    attribute_types = {"max_weight_capacity": int, "has_armrests": bool, "is_adjustable": bool}
+    # Attribute that earns an extra discount, and that discount as a share of the price
+    discount_attribute = "is_adjustable"
+    extra_discount_rate = 0.05
+
     def __init__(self, name, description, price, dimensions, stock_quantity, category_id, image_url,
                  max_weight_capacity=100, has_armrests=True, is_adjustable=False):
         super().__init__(name, description, price, dimensions, stock_quantity, category_id, image_url)
@@ -170,7 +388,7 @@ class Chair(Furniture):
         Adjustable chairs get an additional 5% discount."""
         base_discount = self.price * (discount_percentage / 100)
         if self.is_adjustable:
-            additional_discount = self.price * 0.05
+            additional_discount = self.price * self.extra_discount_rate
             return base_discount + additional_discount
         return base_discount
 
@@ -178,6 +396,12 @@ class Chair(Furniture):
 class Table(Furniture):
     """Table furniture type."""
 
+    __slots__ = ("shape", "max_weight_capacity", "is_extendable")
+    attribute_types = {"shape": str, "max_weight_capacity": int, "is_extendable": bool}
+    # Attribute that earns an extra discount, and that discount as a share of the price
+    discount_attribute = "is_extendable"
+    extra_discount_rate = 0.03
+
     def __init__(self, name, description, price, dimensions, stock_quantity, category_id, image_url,
                  shape="Rectangle", max_weight_capacity=200, is_extendable=False):
         super().__init__(name, description, price, dimensions, stock_quantity, category_id, image_url)
@@ -193,7 +417,7 @@ class Table(Furniture):
         Extendable tables get an additional 3% discount."""
         base_discount = self.price * (discount_percentage / 100)
         if self.is_extendable:
-            additional_discount = self.price * 0.03
+            additional_discount = self.price * self.extra_discount_rate
             return base_discount + additional_discount
         return base_discount
 
@@ -201,6 +425,12 @@ class Table(Furniture):
 class Sofa(Furniture):
     """Sofa furniture type."""
 
+    __slots__ = ("seats", "is_convertible", "has_storage")
+    attribute_types = {"seats": int, "is_convertible": bool, "has_storage": bool}
+    # Attribute that earns an extra discount, and that discount as a share of the price
+    discount_attribute = "is_convertible"
+    extra_discount_rate = 0.07
+
     def __init__(self, name, description, price, dimensions, stock_quantity, category_id, image_url,
                  seats=3, is_convertible=False, has_storage=False):
         super().__init__(name, description, price, dimensions, stock_quantity, category_id, image_url)
@@ -216,7 +446,7 @@ class Sofa(Furniture):
         Convertible sofas get an additional 7% discount."""
         base_discount = self.price * (discount_percentage / 100)
         if self.is_convertible:
-            additional_discount = self.price * 0.07
+            additional_discount = self.price * self.extra_discount_rate
             return base_discount + additional_discount
         return base_discount
 
@@ -224,6 +454,14 @@ class Sofa(Furniture):
 class Bed(Furniture):
     """Bed furniture type."""
 
+    __slots__ = ("size", "has_storage", "material_type")
+    attribute_types = {"bed_size": str, "has_storage": bool, "material_type": str}
+    # Attribute that earns an extra discount, and that discount as a share of the price
+    discount_attribute = "has_storage"
+    extra_discount_rate = 0.04
+    # Constructor arguments the API knows by another name
+    aliases = {"size": "bed_size"}
+
     def __init__(self, name, description, price, dimensions, stock_quantity, category_id, image_url,
                  size="Queen", has_storage=False, material_type="Wood"):
         super().__init__(name, description, price, dimensions, stock_quantity, category_id, image_url)
@@ -231,6 +469,11 @@ class Bed(Furniture):
         self.has_storage = has_storage
         self.material_type = material_type
 
+    @property
+    def bed_size(self):
+        """The size, under the name the API uses."""
+        return self.size
+
     def get_furniture_type(self):
         return "Bed"
 
@@ -239,7 +482,7 @@ class Bed(Furniture):
         Storage beds get an additional 4% discount."""
         base_discount = self.price * (discount_percentage / 100)
         if self.has_storage:
-            additional_discount = self.price * 0.04
+            additional_discount = self.price * self.extra_discount_rate
             return base_discount + additional_discount
         return base_discount
 
@@ -247,6 +490,12 @@ class Bed(Furniture):
 class Cabinet(Furniture):
     """Cabinet furniture type."""
 
+    __slots__ = ("num_drawers", "num_shelves", "has_lock")
+    attribute_types = {"num_drawers": int, "num_shelves": int, "has_lock": bool}
+    # Attribute that earns an extra discount, and that discount as a share of the price
+    discount_attribute = "has_lock"
+    extra_discount_rate = 0.02
+
     def __init__(self, name, description, price, dimensions, stock_quantity, category_id, image_url,
                  num_drawers=0, num_shelves=0, has_lock=False):
         super().__init__(name, description, price, dimensions, stock_quantity, category_id, image_url)
@@ -262,52 +511,234 @@ class Cabinet(Furniture):
         Cabinets with locks get an additional 2% discount."""
         base_discount = self.price * (discount_percentage / 100)
         if self.has_lock:
-            additional_discount = self.price * 0.02
+            additional_discount = self.price * self.extra_discount_rate
             return base_discount + additional_discount
         return base_discount
 
 
+# furniture class -> its compiled to_dict function
+_SERIALIZERS = {}
+
+
+def compile_serializer(furniture_class, furniture_type):
+    """Build and register the ``to_dict`` function of one furniture class.
+
+    The function is generated as a single dict display of the common
+    fields, the type name and the class's attribute_types, so serializing
+    costs no method calls, type checks or getattr lookups.
+    """
+    fields = [
+        ("id", "product.id"),
+        ("name", "product.name"),
+        ("description", "product.description"),
+        ("price", "float(product.price)"),
+        ("dimensions", "product.dimensions"),
+        ("stock_quantity", "product.stock_quantity"),
+        ("category_id", "product.category_id"),
+        ("image_url", "product.image_url"),
+        ("furniture_type", repr(furniture_type)),
+    ]
+    for name in furniture_class.attribute_types:
+        if not name.isidentifier():
+            raise ValueError(f"Invalid attribute name: {name}")
+        fields.append((name, f"product.{name}"))
+
+    body = ", ".join(f"{key!r}: {expression}" for key, expression in fields)
+    namespace = {}
+    exec(f"def serialize(product):\n    return {{{body}}}\n", namespace)
+    serialize = namespace["serialize"]
+    serialize.__qualname__ = f"serialize_{furniture_class.__name__}"
+    _SERIALIZERS[furniture_class] = serialize
+    return serialize
+
+
 # Factory Pattern implementation
 class FurnitureFactory:
     """Factory class for creating furniture objects."""
 
+    # furniture type -> (class, ((data keys, default) of each extra constructor argument), the defaults)
+    _registry = {}
+
+    @classmethod
+    def register(cls, furniture_type, furniture_class):
+        """Make ``furniture_type`` build ``furniture_class``.
+
+        The type-specific constructor arguments and their defaults are read
+        from its signature once, here, instead of on every object created.
+        """
+        parameters = list(inspect.signature(furniture_class.__init__).parameters.values())[8:]
+        aliases = getattr(furniture_class, "aliases", {})
+        extras = tuple(
+            ((parameter.name,) + ((aliases[parameter.name],) if parameter.name in aliases else ()), parameter.default)
+            for parameter in parameters
+        )
+        cls._registry[furniture_type] = (furniture_class, extras, tuple(default for _, default in extras))
+        compile_serializer(furniture_class, furniture_type)
+
+    @classmethod
+    def _lookup(cls, furniture_type):
+        try:
+            return cls._registry[furniture_type]
+        except KeyError:
+            raise ValueError(f"Unknown furniture type: {furniture_type}") from None
+
+    @staticmethod
+    def _extra_args(extras, data):
+        # Type-specific constructor arguments from ``data``, defaulted
+        args = []
+        for keys, default in extras:
+            value = default
+            for key in keys:
+                if key in data:
+                    value = data[key]
+                    break
+            args.append(value)
+        return args
+
+    @classmethod
+    def discount_rules(cls):
+        """``{furniture type: (attribute, extra rate, attribute default)}`` of the calculate_discount rules."""
+        rules = {}
+        for furniture_type, (furniture_class, extras, defaults) in cls._registry.items():
+            attribute = furniture_class.discount_attribute
+            default = next(
+                (value for (keys, _), value in zip(extras, defaults) if attribute in keys), False
+            )
+            rules[furniture_type] = (attribute, furniture_class.extra_discount_rate, bool(default))
+        return rules
+
     @staticmethod
     def create_furniture(furniture_type, name, description, price, dimensions, stock_quantity, category_id, image_url, additional_data=None):
         """Create and return a furniture object based on the type."""
-        if furniture_type == "Chair":
-            return Chair(
-                name, description, price, dimensions, stock_quantity, category_id, image_url,
-                additional_data.get('max_weight_capacity', 100) if additional_data else 100,
-                additional_data.get('has_armrests', True) if additional_data else True,
-                additional_data.get('is_adjustable', False) if additional_data else False
-            )
-        elif furniture_type == "Table":
-            return Table(
-                name, description, price, dimensions, stock_quantity, category_id, image_url,
-                additional_data.get('shape', "Rectangle") if additional_data else "Rectangle",
-                additional_data.get('max_weight_capacity', 200) if additional_data else 200,
-                additional_data.get('is_extendable', False) if additional_data else False
-            )
-        elif furniture_type == "Sofa":
-            return Sofa(
-                name, description, price, dimensions, stock_quantity, category_id, image_url,
-                additional_data.get('seats', 3) if additional_data else 3,
-                additional_data.get('is_convertible', False) if additional_data else False,
-                additional_data.get('has_storage', False) if additional_data else False
-            )
-        elif furniture_type == "Bed":
-            return Bed(
-                name, description, price, dimensions, stock_quantity, category_id, image_url,
-                additional_data.get('size', "Queen") if additional_data else "Queen",
-                additional_data.get('has_storage', False) if additional_data else False,
-                additional_data.get('material_type', "Wood") if additional_data else "Wood"
-            )
-        elif furniture_type == "Cabinet":
-            return Cabinet(
-                name, description, price, dimensions, stock_quantity, category_id, image_url,
-                additional_data.get('num_drawers', 0) if additional_data else 0,
-                additional_data.get('num_shelves', 0) if additional_data else 0,
-                additional_data.get('has_lock', False) if additional_data else False
-            )
+        furniture_class, extras, defaults = FurnitureFactory._lookup(furniture_type)
+        return furniture_class(
+            name, description, price, dimensions, stock_quantity, category_id, image_url,
+            *(FurnitureFactory._extra_args(extras, additional_data) if additional_data else defaults)
+        )
+
+    @staticmethod
+    def create_many(rows, attributes=None):
+        """Create the furniture objects of many Products rows at once.
+
+        ``attributes`` maps product ids to their stored type-specific
+        attributes; rows without an entry get the defaults. Objects keep
+        their row's ProductID as ``id``. Raises ValueError for an unknown
+        furniture type.
+        """
+        attributes = attributes or {}
+        registry = FurnitureFactory._registry
+        extra_args = FurnitureFactory._extra_args
+        products = []
+        # Every new object counts towards the next garbage collection, which
+        # would run over and over while nothing here can be freed
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for row in rows:
+                entry = registry.get(row['FurnitureType'])
+                if entry is None:
+                    FurnitureFactory._lookup(row['FurnitureType'])
+                furniture_class, extras, defaults = entry
+                product_id = row['ProductID']
+                data = attributes.get(product_id)
+                product = furniture_class(
+                    row['Name'], row['Description'], row['Price'], row['Dimensions'],
+                    row['StockQuantity'], row['CategoryID'], row['ImageURL'],
+                    *(extra_args(extras, data) if data else defaults)
+                )
+                product.id = product_id
+                products.append(product)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return products
+
+
+for _furniture_type, _furniture_class in (
+        ("Chair", Chair), ("Table", Table), ("Sofa", Sofa), ("Bed", Bed), ("Cabinet", Cabinet)):
+    FurnitureFactory.register(_furniture_type, _furniture_class)
+
+
+# Every type-specific attribute and its type
+ATTRIBUTE_TYPES = {
+    name: kind
+    for furniture_class in (Chair, Table, Sofa, Bed, Cabinet)
+    for name, kind in furniture_class.attribute_types.items()
+}
+
+# Comparisons allowed in attribute filters
+ATTRIBUTE_OPERATORS = ("=", ">=", "<=")
+
+
+def _stored_value(value):
+    # (NumberValue, TextValue) of an attribute value
+    if isinstance(value, str):
+        return None, value
+    return float(value), None
+
+
+def _loaded_value(name, number, text):
+    kind = ATTRIBUTE_TYPES.get(name)
+    if kind is str or number is None:
+        return text
+    if kind is bool:
+        return bool(number)
+    number = float(number)
+    return int(number) if number.is_integer() else number
+
+
+def parse_dimensions(dimensions):
+    """``(width, depth, height)`` in centimetres from a "WxDxH" string, or three Nones.
+
+    The numbers may be separated by "x", "×" or "*" and followed by a unit:
+    cm (the default), mm, m or in.
+    """
+    match = _DIMENSIONS.match(dimensions) if isinstance(dimensions, str) else None
+    if match is None:
+        return None, None, None
+    scale = _UNITS[(match.group(4) or "cm").lower()]
+    return tuple(round(float(value.replace(",", ".")) * scale, 2) for value in match.group(1, 2, 3))
+
+
+def coerce_attribute(name, value):
+    """Convert a query string value to the type of attribute ``name``; raises ValueError."""
+    kind = ATTRIBUTE_TYPES.get(name)
+    if kind is None:
+        raise ValueError(f"⚠️ Unknown attribute: {name}")
+    if kind is bool:
+        if str(value).lower() in ('1', 'true', 'yes'):
+            return True
+        if str(value).lower() in ('0', 'false', 'no'):
+            return False
+        raise ValueError(f"⚠️ {name} must be true or false.")
+    if kind is int:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"⚠️ {name} must be a number.")
+    return str(value)
+
+
+def attribute_filter_query(filters):
+    """SELECT of the ProductIDs matching every ``(name, operator, value)`` filter.
+
+    Each filter is answered from the (Name, NumberValue) or (Name,
+    TextValue) index of ProductAttributes and the results intersected.
+    Returns ``(query, params)``; raises ValueError for an invalid filter.
+    """
+    selects, params = [], []
+    for name, operator, value in filters:
+        if operator not in ATTRIBUTE_OPERATORS:
+            raise ValueError(f"⚠️ Unsupported comparison: {operator}")
+        value = coerce_attribute(name, value)
+        if isinstance(value, str):
+            if operator != "=":
+                raise ValueError(f"⚠️ {name} can only be compared for equality.")
+            column = "TextValue"
         else:
-            raise ValueError(f"Unknown furniture type: {furniture_type}")
+            column, value = "NumberValue", float(value)
+        selects.append(f"SELECT ProductID FROM ProductAttributes WHERE Name = ? AND {column} {operator} ?")
+        params.extend([name, value])
+    if not selects:
+        raise ValueError("⚠️ At least one attribute filter is required.")
+    return " INTERSECT ".join(selects), tuple(params)
@@ -1,4 +1,5 @@
-from app.db import execute_query
+from app.db import execute_query, stream_query, transaction, get_dialect, fetch_page, DEFAULT_PAGE_SIZE
+from app.models.catalog_events import CatalogSubject
 
 
 class Order:
@@ -17,10 +18,12 @@ class Order:
 
         Improved error handling and validation.
         """
-        query = """
+        dialect = get_dialect()
+        query = f"""
         INSERT INTO Orders (UserID, TotalAmount, Status, OrderDate)
-        OUTPUT INSERTED.OrderID
-        VALUES (?, ?, ?, GETDATE())
+        {dialect.output_inserted("OrderID")}
+        VALUES (?, ?, ?, {dialect.now})
+        {dialect.returning("OrderID")}
         """
         try:
             result = execute_query(query, (self.user_id, self.total_amount, self.status), fetch=True)
@@ -37,6 +40,10 @@ class Order:
                     order_id = result[0][0]
                     print(f"Order #{order_id} added successfully.")
                     return order_id
+                elif isinstance(result[0], dict) and 'OrderID' in result[0]:
+                    order_id = result[0]['OrderID']
+                    print(f"Order #{order_id} added successfully.")
+                    return order_id
                 elif isinstance(result[0], int):
                     order_id = result[0]
                     print(f"Order #{order_id} added successfully.")
@@ -53,11 +60,86 @@ class Order:
 
 
 
+    @staticmethod
+    def create_from_cart(user_id, status="pending", update_stock=True):
+        """
+        Turn the user's cart into an order inside a single transaction.
+
+        The order, its items, the stock update and the cart clear are all
+        set-based statements, so the number of round trips stays the same
+        whatever the size of the cart. Returns the new order row
+        (OrderID, TotalAmount), or None if the database rejected it.
+        """
+        dialect = get_dialect()
+        with transaction() as unit:
+            query = f"""
+            INSERT INTO Orders (UserID, TotalAmount, Status, OrderDate)
+            {dialect.output_inserted("OrderID", "TotalAmount")}
+            SELECT ?, SUM(p.Price * c.Quantity), ?, {dialect.now}
+            FROM Cart c
+            JOIN Products p ON c.ProductID = p.ProductID
+            WHERE c.UserID = ?
+            HAVING COUNT(*) > 0
+            {dialect.returning("OrderID", "TotalAmount")}
+            """
+            result = execute_query(query, (user_id, status, user_id), fetch=True)
+
+            if result is None:
+                print("Error adding order from cart.")
+                return None
+            # An empty cart inserted nothing; raising here would fail the
+            # request's unit of work, so it is reported after the block
+            if result:
+                order = result[0]
+                Order._move_cart_lines(order['OrderID'], user_id, update_stock)
+
+                if unit.failed:
+                    print("Error adding order from cart, changes rolled back.")
+                    return None
+
+        if not result:
+            raise ValueError("⚠️ No items in the cart.")
+
+        print(f"Order #{order['OrderID']} added successfully.")
+        return order
+
+    @staticmethod
+    def _move_cart_lines(order_id, user_id, update_stock):
+        """Copy the user's cart lines into the order, take them off stock and clear the cart."""
+        dialect = get_dialect()
+
+        # Copy every cart line with its current price
+        query = f"""
+        INSERT INTO OrderItems (OrderID, ProductID, Quantity, Price)
+        {dialect.output_inserted("ProductID", "Quantity")}
+        SELECT ?, c.ProductID, c.Quantity, p.Price
+        FROM Cart c
+        JOIN Products p ON c.ProductID = p.ProductID
+        WHERE c.UserID = ?
+        {dialect.returning("ProductID", "Quantity")}
+        """
+        items = execute_query(query, (order_id, user_id), fetch=True) or []
+
+        if update_stock:
+            query = dialect.update_join(
+                "Products", "p", "StockQuantity = p.StockQuantity - c.Quantity",
+                "Cart", "c", "c.ProductID = p.ProductID", "c.UserID = ?"
+            )
+            execute_query(query, (user_id,))
+            # The ordered quantities, as Furniture.update_stock reports them
+            for item in items:
+                CatalogSubject.notify(
+                    CatalogSubject.STOCK_ADJUSTED, item['ProductID'], {"Quantity": item['Quantity']}
+                )
+
+        query = "DELETE FROM Cart WHERE UserID = ?"
+        execute_query(query, (user_id,))
+
     def update_order(self, order_id):
         """Update order status and total amount."""
-        query = """
+        query = f"""
         UPDATE Orders
-        SET Status = ?, TotalAmount = ?, UpdatedAt = GETDATE()
+        SET Status = ?, TotalAmount = ?, UpdatedAt = {get_dialect().now}
         WHERE OrderID = ?
         """
         execute_query(query, (self.status, self.total_amount, order_id))
@@ -89,6 +171,22 @@ class Order:
             return result[0]
         return None
 
+    @staticmethod
+    def get_order_stamp(order_id):
+        """Get the columns an order's details change with, in one primary key lookup."""
+        query = """
+        SELECT o.Status, o.TotalAmount, o.PaymentMethod, o.CreatedAt, o.UpdatedAt,
+               u.Name as UserName, u.Email as UserEmail
+        FROM Orders o
+        JOIN Users u ON o.UserID = u.UserID
+        WHERE o.OrderID = ?
+        """
+        result = execute_query(query, (order_id,), fetch=True)
+
+        if result:
+            return result[0]
+        return None
+
     @staticmethod
     def get_order_items(order_id):
         """Get all items for an order."""
@@ -123,14 +221,51 @@ class Order:
         WHERE o.Status = ?
         ORDER BY o.CreatedAt DESC
         """
-        return execute_query(query, (status,), fetch=True)
+        return execute_query(query, (status,), fetch=True, compact=True)
+
+    @staticmethod
+    def get_orders_page(user_id=None, status=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """Get one page of orders, newest first, by user and/or status.
+
+        Orders come in (CreatedAt, OrderID) descending order. Returns
+        ``(orders, next_cursor)``, or ``(None, None)`` on a database error.
+        """
+        where, params = [], []
+        if user_id:
+            where.append("o.UserID = ?")
+            params.append(user_id)
+        if status:
+            where.append("o.Status = ?")
+            params.append(status)
+
+        select = """
+        SELECT o.*, u.Name as UserName,
+            (SELECT COUNT(*) FROM OrderItems oi WHERE oi.OrderID = o.OrderID) as ItemCount
+        FROM Orders o
+        JOIN Users u ON o.UserID = u.UserID"""
+        return fetch_page(
+            select, ("o.CreatedAt", "o.OrderID"), ("CreatedAt", "OrderID"),
+            where, params, cursor=cursor, limit=limit, descending=True
+        )
+
+    @staticmethod
+    def stream_orders_by_status(status):
+        """Stream orders with a specific status without loading them into memory."""
+        query = """
+        SELECT o.*, u.Name as UserName
+        FROM Orders o
+        JOIN Users u ON o.UserID = u.UserID
+        WHERE o.Status = ?
+        ORDER BY o.CreatedAt DESC
+        """
+        return stream_query(query, (status,))
 
     @staticmethod
     def update_order_status(order_id, status):
         """Update order status."""
-        query = """
+        query = f"""
         UPDATE Orders
-        SET Status = ?, UpdatedAt = GETDATE()
+        SET Status = ?, UpdatedAt = {get_dialect().now}
         WHERE OrderID = ?
         """
         execute_query(query, (status, order_id))
@@ -1,4 +1,4 @@
-from app.db import execute_query
+from app.db import execute_query, execute_many, BATCH_CHUNK_SIZE
 
 
 class OrderItem:
@@ -19,6 +19,18 @@ class OrderItem:
         execute_query(query, (self.order_id, self.product_id, self.quantity, self.price))
         print(f"Order item for product {self.product_id} added successfully.")
 
+    @staticmethod
+    def add_order_items(order_items, chunk_size=BATCH_CHUNK_SIZE):
+        """Add many order items with a single batched insert."""
+        query = """
+        INSERT INTO OrderItems (OrderID, ProductID, Quantity, Price)
+        VALUES (?, ?, ?, ?)
+        """
+        params = ((item.order_id, item.product_id, item.quantity, item.price) for item in order_items)
+        count = execute_many(query, params, chunk_size=chunk_size)
+        print(f"{count or 0} order items added successfully.")
+        return count
+
     def update_order_item(self, order_item_id):
         """Update an existing order item."""
         query = """
@@ -1,4 +1,4 @@
-from app.db import execute_query
+from app.db import execute_query, get_dialect
 import hashlib
 import os
 import uuid
@@ -21,9 +21,9 @@ class User:
         # Hash the password with the salt
         hashed_password = self._hash_password(self.password, salt)
 
-        query = """
+        query = f"""
         INSERT INTO Users (Name, Email, Password, Salt, Role, CreatedAt)
-        VALUES (?, ?, ?, ?, ?, GETDATE())
+        VALUES (?, ?, ?, ?, ?, {get_dialect().now})
         """
         execute_query(query, (self.name, self.email, hashed_password, salt, self.role))
         print(f"User '{self.name}' added successfully.")
@@ -112,12 +112,13 @@ class User:
     def generate_auth_token(user_id):
         """Generate authentication token for user."""
         token = str(uuid.uuid4())
-        expiry = "DATEADD(hour, 24, GETDATE())"  # Token expires in 24 hours
+        dialect = get_dialect()
+        expiry = dialect.add_hours(24)  # Token expires in 24 hours
 
-        query = """
+        query = f"""
         INSERT INTO AuthTokens (UserID, Token, ExpiresAt, CreatedAt)
-        VALUES (?, ?, {}, GETDATE())
-        """.format(expiry)
+        VALUES (?, ?, {expiry}, {dialect.now})
+        """
 
         execute_query(query, (user_id, token))
         return token
@@ -125,11 +126,11 @@ class User:
     @staticmethod
     def validate_auth_token(token):
         """Validate an authentication token."""
-        query = """
+        query = f"""
         SELECT u.* 
         FROM AuthTokens t
         JOIN Users u ON t.UserID = u.UserID
-        WHERE t.Token = ? AND t.ExpiresAt > GETDATE()
+        WHERE t.Token = ? AND t.ExpiresAt > {get_dialect().now}
         """
 
         result = execute_query(query, (token,), fetch=True)
@@ -4,3 +4,4 @@ from app.routes.product_routes import product_routes
 from app.routes.cart_routes import cart_routes
 from app.routes.order_routes import order_routes
 from app.routes.checkout_routes import checkout_routes
+from app.routes.category_routes import category_routes
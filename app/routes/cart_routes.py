@@ -37,8 +37,10 @@ def add_to_cart():
 
     # Call cart service
     try:
-        result = CartService.add_to_cart(data['user_id'], data['product_id'], data['quantity'])
-        return jsonify({"message": result}), 201
+        result, item = CartService.add_to_cart(data['user_id'], data['product_id'], data['quantity'])
+        if "⚠️" in result:
+            return jsonify({"message": result}), 400
+        return jsonify({"message": result, "item": item}), 201
     except ValueError as e:
         return jsonify({"message": str(e)}), 400
 
@@ -57,8 +59,10 @@ def update_cart(product_id):
 
     # Call cart service
     try:
-        result = CartService.update_cart(data['user_id'], product_id, data['quantity'])
-        return jsonify({"message": result}), 200
+        result, item = CartService.update_cart(data['user_id'], product_id, data['quantity'])
+        if "⚠️" in result:
+            return jsonify({"message": result}), 400
+        return jsonify({"message": result, "item": item}), 200
     except ValueError as e:
         return jsonify({"message": str(e)}), 400
 
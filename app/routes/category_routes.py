@@ -0,0 +1,58 @@
+from flask import Blueprint, request, jsonify
+from app.services import CategoryService, ProductService
+from app.routes.response_cache import cached_json
+
+category_routes = Blueprint('category_routes', __name__)
+
+# Category tree with product counts
+@category_routes.route('/categories', methods=['GET'])
+@cached_json(ProductService.catalog_version, ProductService.catalog_modified)
+def get_categories():
+    return jsonify({"categories": CategoryService.get_category_tree()}), 200
+
+# Products of a category and all its subcategories
+@category_routes.route('/categories/<int:category_id>/products', methods=['GET'])
+@cached_json(ProductService.catalog_version, ProductService.catalog_modified)
+def get_category_products(category_id):
+    products = CategoryService.get_products_in_category(category_id)
+    if products is None:
+        return jsonify({"message": "⚠️ Category not found."}), 404
+
+    return jsonify({"products": products}), 200
+
+@category_routes.route('/categories', methods=['POST'])
+def add_category():
+    data = request.get_json()
+
+    if not data or not data.get('name'):
+        return jsonify({"message": "⚠️ Missing required field: name"}), 400
+
+    result = CategoryService.add_category(data.get('name'), data.get('description'), data.get('parent_id'))
+
+    # Check for errors
+    if result and "⚠️" in result:
+        return jsonify({"message": result}), 400
+
+    return jsonify({"message": result}), 201
+
+@category_routes.route('/categories/<int:category_id>', methods=['PUT'])
+def update_category(category_id):
+    data = request.get_json()
+
+    # Check if category exists
+    category = CategoryService.get_category_by_id(category_id)
+    if not category:
+        return jsonify({"message": "⚠️ Category not found."}), 404
+
+    result = CategoryService.update_category(
+        category_id,
+        data.get('name', category['Name']),
+        data.get('description', category['Description']),
+        data.get('parent_id', category.get('ParentID'))
+    )
+
+    # Check for errors
+    if result and "⚠️" in result:
+        return jsonify({"message": result}), 400
+
+    return jsonify({"message": result}), 200
@@ -0,0 +1,48 @@
+import hashlib
+from datetime import datetime, timezone
+from flask import current_app, request
+
+
+def etag_of(*parts):
+    """Strong entity tag for the values a representation is built from."""
+    return hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+
+def http_time(value):
+    """``value`` (a datetime or an ISO 8601 string) as an aware UTC datetime, or None.
+
+    Naive values are the server's local time, as the database stores them.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def not_modified(etag, last_modified=None):
+    """Whether the client's copy, as described by its conditional headers, is current.
+
+    ``If-None-Match`` wins over ``If-Modified-Since`` when both are sent.
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if last_modified is not None and request.if_modified_since is not None:
+        return last_modified <= request.if_modified_since
+    return False
+
+
+def validated(response, etag, last_modified=None):
+    """Attach the validators to ``response``."""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    return response
+
+
+def not_modified_response(etag, last_modified=None):
+    """An empty 304 carrying the validators."""
+    return validated(current_app.response_class(status=304), etag, last_modified)
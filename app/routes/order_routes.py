@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify
 from app.services import OrderService
 from app.models.order import Order
+from app.routes.streaming import stream_format, stream_rows
+from app.routes.pagination import page_args, page_response
+from app.routes.conditional import etag_of, http_time, not_modified, not_modified_response, validated
 
 order_routes = Blueprint('order_routes', __name__)
 
@@ -53,6 +56,24 @@ def delete_order(order_id):
 @order_routes.route('/orders', methods=['GET'])
 def view_orders():
     user_id = request.args.get('user_id')
+    status = request.args.get('status')
+
+    # Keyset pagination with ?limit=N&cursor=..., newest orders first
+    try:
+        page = page_args()
+        if page and (user_id or status):
+            cursor, limit = page
+            orders, next_cursor = OrderService.get_orders_page(user_id, status, cursor, limit)
+            return page_response("orders", orders, next_cursor)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # Orders by status (all users), streamed on request
+    if status and not user_id:
+        fmt = stream_format()
+        if fmt:
+            return stream_rows("orders", OrderService.stream_orders_by_status(status), fmt)
+        return jsonify({"orders": OrderService.get_orders_by_status(status) or []}), 200
 
     if not user_id:
         return jsonify({"message": "⚠️ User ID is required."}), 400
@@ -64,9 +85,19 @@ def view_orders():
 
     return jsonify({"orders": orders}), 200
 
-# Get order details
+# Get order details; If-None-Match / If-Modified-Since are answered from the order's stamp
 @order_routes.route('/orders/<int:order_id>', methods=['GET'])
 def get_order(order_id):
+    stamp = OrderService.get_order_stamp(order_id)
+
+    if not stamp:
+        return jsonify({"message": "⚠️ Order not found."}), 404
+
+    etag = etag_of(order_id, *stamp.values())
+    last_modified = http_time(stamp['UpdatedAt'] or stamp['CreatedAt'])
+    if not_modified(etag, last_modified):
+        return not_modified_response(etag, last_modified)
+
     order = OrderService.get_order_by_id(order_id)
 
     if not order:
@@ -75,7 +106,8 @@ def get_order(order_id):
     # Get order items
     order_items = Order.get_order_items(order_id)
 
-    return jsonify({
+    response = jsonify({
         "order": order,
         "items": order_items
-    }), 200
+    })
+    return validated(response, etag, last_modified), 200
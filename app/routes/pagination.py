@@ -0,0 +1,19 @@
+from flask import jsonify, request
+from app.db import parse_page_size
+
+
+def page_args():
+    """Return ``(cursor, limit)`` when the client asked for a page, else None.
+
+    Pagination is opt-in: ``?limit=N`` starts it and ``?cursor=...`` (the
+    ``next_cursor`` of the previous page) continues it. Raises ValueError
+    for an invalid page size.
+    """
+    if 'limit' not in request.args and 'cursor' not in request.args:
+        return None
+    return request.args.get('cursor') or None, parse_page_size(request.args.get('limit'))
+
+
+def page_response(key, rows, next_cursor):
+    """Respond with one page of rows and the cursor of the next one."""
+    return jsonify({key: rows, "next_cursor": next_cursor}), 200
@@ -1,8 +1,25 @@
+import io
 from flask import Blueprint, request, jsonify
 from app.services import ProductService
+from app.models import Furniture
+from app.services.product_import import IMPORT_FORMATS, read_records
+from app.routes.streaming import stream_format, stream_rows
+from app.routes.pagination import page_args, page_response
+from app.routes.response_cache import cached_json
 
 product_routes = Blueprint('product_routes', __name__)
 
+# Query parameters only the combined filter understands
+FILTER_ARGS = ('min_price', 'max_price', 'in_stock', 'sort', 'facets',
+               'min_width', 'max_width', 'min_depth', 'max_depth', 'min_height', 'max_height')
+
+# Request body types a bulk import accepts
+IMPORT_MIMETYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+}
+
 @product_routes.route('/products', methods=['POST'])
 def add_product():
     data = request.get_json()
@@ -76,6 +93,17 @@ def add_product():
 
     return jsonify({"message": result}), 201
 
+# Bulk import from a CSV or JSON Lines body, read as it arrives
+@product_routes.route('/products/bulk', methods=['POST'])
+def import_products():
+    fmt = request.args.get('format') or IMPORT_MIMETYPES.get(request.mimetype)
+    if fmt not in IMPORT_FORMATS:
+        return jsonify({"message": "⚠️ Send a CSV (text/csv) or JSON Lines (application/x-ndjson) body."}), 400
+
+    stream = io.TextIOWrapper(request.stream, encoding='utf-8-sig', errors='replace', newline='')
+    report = ProductService.import_products(read_records(stream, fmt))
+    return jsonify(report), 200
+
 @product_routes.route('/products/<int:product_id>', methods=['PUT'])
 def update_product(product_id):
     data = request.get_json()
@@ -162,25 +190,159 @@ def delete_product(product_id):
 
     return jsonify({"message": result}), 200
 
+# Listings are replayed from serialized bytes until the catalog changes
 @product_routes.route('/products', methods=['GET'])
+@cached_json(ProductService.catalog_version, ProductService.catalog_modified, bypass=stream_format)
 def get_products():
+    # Multi-get: ?ids=1,2,3
+    if 'ids' in request.args:
+        return products_by_ids(request.args.get('ids', '').split(','))
+
     # Check if category filter is provided
     category_id = request.args.get('category_id')
     furniture_type = request.args.get('furniture_type')
     search_term = request.args.get('search')
 
+    # Filters that combine, answered with facet counts
+    attributes = ProductService.parse_attribute_filters(request.args.items(multi=True))
+    if attributes or any(arg in request.args for arg in FILTER_ARGS) or \
+            sum(1 for value in (category_id, furniture_type, search_term) if value) > 1:
+        return filter_products(category_id, furniture_type, search_term, attributes)
+
+    # Keyset pagination with ?limit=N&cursor=...
+    if not search_term:
+        try:
+            page = page_args()
+            if page:
+                cursor, limit = page
+                products, next_cursor = ProductService.get_products_page(
+                    category_id, furniture_type, cursor, limit
+                )
+                return page_response("products", products, next_cursor)
+        except ValueError as e:
+            return jsonify({"message": str(e)}), 400
+
     if category_id:
         products = ProductService.get_products_by_category(category_id)
     elif furniture_type:
         products = ProductService.get_products_by_furniture_type(furniture_type)
     elif search_term:
-        products = ProductService.search_products(search_term)
+        # ?fuzzy=true tolerates typos in the search term
+        products = ProductService.search_products(search_term, fuzzy=_flag('fuzzy'))
     else:
+        # Large catalogs can be streamed instead of buffered
+        fmt = stream_format()
+        if fmt:
+            return stream_rows("products", ProductService.stream_all_products(), fmt)
         products = ProductService.get_all_products()
 
     return jsonify({"products": products}), 200
 
+def _flag(name):
+    return request.args.get(name, '').lower() in ('1', 'true', 'yes')
+
+def filter_products(category_id, furniture_type, search_term, attributes):
+    try:
+        min_price = request.args.get('min_price', type=float)
+        max_price = request.args.get('max_price', type=float)
+        if 'min_price' in request.args and min_price is None or \
+                'max_price' in request.args and max_price is None:
+            return jsonify({"message": "⚠️ min_price and max_price must be numbers."}), 400
+        in_stock = _flag('in_stock') if 'in_stock' in request.args else None
+        # Sizes in centimetres: ?max_width=120&min_height=70
+        dimensions = ProductService.parse_dimension_filters(request.args)
+
+        page = page_args()
+        cursor, limit = page if page else (None, None)
+        products, facets, next_cursor = ProductService.filter_products(
+            category_id, furniture_type, min_price, max_price, in_stock,
+            search_term, _flag('fuzzy'), cursor, limit, request.args.get('sort') or None, attributes,
+            dimensions
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    response = {"products": products, "facets": facets}
+    if page:
+        response["next_cursor"] = next_cursor
+    return jsonify(response), 200
+
+# Multi-get for pages showing several known products: {"ids": [1, 2, 3]}
+@product_routes.route('/products/batch', methods=['POST'])
+def get_products_batch():
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    if not isinstance(ids, list):
+        return jsonify({"message": "⚠️ ids must be a list of product IDs."}), 400
+    return products_by_ids(ids)
+
+def products_by_ids(values):
+    try:
+        ids = [int(value) for value in values if str(value).strip()]
+    except (TypeError, ValueError):
+        return jsonify({"message": "⚠️ ids must be product IDs."}), 400
+    if not ids:
+        return jsonify({"message": "⚠️ ids must list at least one product ID."}), 400
+
+    try:
+        products, missing = ProductService.get_products_by_ids(ids)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    return jsonify({"products": Furniture.to_dicts(products), "missing": missing}), 200
+
+# Autocomplete for search boxes: ?q=<prefix>&limit=<n>
+@product_routes.route('/products/suggest', methods=['GET'])
+@cached_json(ProductService.catalog_version, ProductService.catalog_modified)
+def suggest_products():
+    prefix = request.args.get('q', '')
+    if not prefix.strip():
+        return jsonify({"message": "⚠️ Query parameter q is required."}), 400
+
+    try:
+        limit = int(request.args.get('limit', 10))
+    except ValueError:
+        return jsonify({"message": "⚠️ limit must be an integer."}), 400
+    if limit < 1:
+        return jsonify({"message": "⚠️ limit must be at least 1."}), 400
+
+    suggestions = ProductService.suggest_products(prefix, limit)
+    return jsonify({"suggestions": suggestions}), 200
+
+# Cost of a sitewide promotion: ?percentage=15[&category_id=..][&furniture_type=..][&products=false]
+@product_routes.route('/products/discount-preview', methods=['GET'])
+@cached_json(ProductService.catalog_version, ProductService.catalog_modified)
+def preview_discount():
+    if 'percentage' not in request.args:
+        return jsonify({"message": "⚠️ percentage is required."}), 400
+
+    try:
+        report = ProductService.preview_discount(
+            request.args.get('percentage'),
+            request.args.get('category_id'),
+            request.args.get('furniture_type'),
+            include_products=request.args.get('products', 'true').lower() not in ('0', 'false', 'no')
+        )
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    if report is None:
+        return jsonify({"message": "⚠️ The catalog is too large to preview in memory."}), 503
+
+    return jsonify(report), 200
+
+# Rebuild the search index of this process, e.g. to warm it after a deploy
+@product_routes.route('/products/search/rebuild', methods=['POST'])
+def rebuild_search_index():
+    result = ProductService.rebuild_search_index()
+
+    if result and "⚠️" in result:
+        return jsonify({"message": result}), 503
+
+    return jsonify({"message": result}), 200
+
 @product_routes.route('/products/<int:product_id>', methods=['GET'])
+@cached_json(ProductService.catalog_version, ProductService.catalog_modified)
 def get_product(product_id):
     product = ProductService.get_product_by_id(product_id)
 
@@ -0,0 +1,211 @@
+import gzip
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from app.db.unit_of_work import current_unit
+from app.routes.conditional import not_modified, not_modified_response, validated
+
+try:
+    import brotli
+except ImportError:  # optional; responses are then offered gzipped only
+    brotli = None
+
+# Response cache configuration (seconds for the TTL)
+RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("RESPONSE_CACHE_MAX_BYTES", 64 * 2 ** 20))
+RESPONSE_CACHE_TTL = float(os.environ.get("RESPONSE_CACHE_TTL", os.environ.get("CATALOG_CACHE_TTL", 300)))
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 1024
+
+# Content codings a cached response can be served in
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def _compress(body, encoding):
+    if encoding == "br":
+        return brotli.compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+
+class CachedResponse:
+    """One serialized JSON body and its compressed variants, built on first use."""
+
+    __slots__ = ("key", "version", "expires", "bodies")
+
+    def __init__(self, key, version, body, ttl):
+        self.key = key
+        self.version = version
+        self.expires = time.monotonic() + ttl
+        self.bodies = {"identity": body}
+
+    @property
+    def size(self):
+        return sum(len(body) for body in self.bodies.values())
+
+    def body(self, encoding):
+        body = self.bodies.get(encoding)
+        if body is None:
+            body = self.bodies[encoding] = _compress(self.bodies["identity"], encoding)
+        return body
+
+
+class ResponseCache:
+    """Serialized JSON responses of catalog reads, kept per catalog version.
+
+    A response is serialized once and its bytes are replayed, gzip or
+    brotli compressed on demand and then kept too, until the catalog version
+    it was built for changes or ``ttl`` seconds pass. Entries are evicted
+    least recently used beyond ``max_entries`` or ``max_bytes``.
+    """
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 2 ** 20, ttl=300.0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Drop every entry and reset the counters."""
+        with self._lock:
+            self._entries = OrderedDict()
+            self._bytes = 0
+            self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key, version):
+        """Return the entry for ``key`` built at ``version``, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version or entry.expires < time.monotonic():
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, key, version, body):
+        """Store a serialized body for ``key`` and return its entry."""
+        entry = CachedResponse(key, version, body, self.ttl)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.size
+            if len(body) <= self.max_bytes:
+                self._entries[key] = entry
+                self._bytes += len(body)
+                self._evict()
+        return entry
+
+    def compressed(self, entry, encoding):
+        """Body of ``entry`` in ``encoding``, compressing and keeping it on first use."""
+        if encoding in entry.bodies:
+            return entry.bodies[encoding]
+        body = entry.body(encoding)
+        with self._lock:
+            if self._entries.get(entry.key) is entry:
+                self._bytes += len(body)
+                self._evict()
+        return body
+
+    def stats(self):
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            return stats
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, entry = self._entries.popitem(last=False)
+            self._bytes -= entry.size
+            self._stats["evictions"] += 1
+
+
+def init_app(app):
+    """Give the app its own response cache."""
+    app.extensions["response_cache"] = ResponseCache(
+        RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_MAX_BYTES, RESPONSE_CACHE_TTL
+    )
+
+
+def get_response_cache():
+    """The response cache of the current app."""
+    return current_app.extensions["response_cache"]
+
+
+def _encoding():
+    # Best content coding the client accepts among the ones we produce
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        return "br"
+    if accepted["gzip"]:
+        return "gzip"
+    return "identity"
+
+
+def _etag(version, encoding):
+    # Strong validators differ between content codings of the same data
+    return version if encoding == "identity" else f"{version}-{encoding}"
+
+
+def cached_json(version, last_modified=None, bypass=None):
+    """Serve a JSON view from the response cache while ``version()`` stays the same.
+
+    ``version()`` returns a string that changes whenever the data behind
+    the view does. It is the strong ETag of the response, so a matching
+    ``If-None-Match`` gets a 304 before the view or the cache are even
+    consulted. ``last_modified()``, if given, returns the datetime of that
+    change for ``Last-Modified``. The view runs only on a miss, and only its
+    200 JSON responses are kept, unless a query failed while it ran.
+    ``bypass()`` returning true skips all of it for that request, e.g. for
+    streamed formats.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if bypass is not None and bypass():
+                return view(*args, **kwargs)
+
+            # Read before building, so a change made meanwhile is not cached as current
+            current = version()
+            modified = last_modified() if last_modified is not None else None
+            # The client may hold this version in any content coding
+            for encoding in ENCODINGS:
+                etag = _etag(current, encoding)
+                if not_modified(etag, modified):
+                    return not_modified_response(etag, modified)
+
+            cache = get_response_cache()
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            entry = cache.get(key, current)
+            if entry is None:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.is_streamed or \
+                        response.mimetype != "application/json":
+                    return response
+                # A query failed while the view ran, e.g. an empty fallback
+                # listing: served once, but never replayed
+                unit = current_unit()
+                if unit is not None and unit.failed:
+                    return response
+                entry = cache.put(key, current, response.get_data())
+            return _respond(cache, entry, modified)
+        return wrapper
+    return decorator
+
+
+def _respond(cache, entry, modified):
+    encoding = _encoding()
+    if len(entry.bodies["identity"]) < MIN_COMPRESS_SIZE:
+        encoding = "identity"
+    body = entry.bodies["identity"] if encoding == "identity" else cache.compressed(entry, encoding)
+    response = current_app.response_class(body, status=200, mimetype="application/json")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return validated(response, _etag(entry.version, encoding), modified)
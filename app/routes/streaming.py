@@ -0,0 +1,51 @@
+from contextlib import ExitStack
+from flask import Response, json, request, stream_with_context
+
+JSON_LINES_MIMETYPE = "application/x-ndjson"
+
+
+def stream_format():
+    """Return the streaming format asked for by the client, or None.
+
+    ``?format=jsonl`` or an ``Accept: application/x-ndjson`` header selects
+    JSON Lines; ``?stream=true`` selects a streamed JSON array.
+    """
+    if request.args.get('format') == 'jsonl':
+        return 'jsonl'
+    if request.accept_mimetypes.best == JSON_LINES_MIMETYPE:
+        return 'jsonl'
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return 'json'
+    return None
+
+
+def stream_rows(key, rows_source, fmt='json'):
+    """Stream rows from ``rows_source`` (a context manager yielding rows).
+
+    The rows are serialized one at a time while the database cursor is open,
+    so memory use does not grow with the size of the result. ``json`` wraps
+    them as ``{key: [...]}``, the same shape as the buffered response;
+    ``jsonl`` writes one JSON object per line.
+    """
+    # Open the query now so database errors surface before the 200 is sent
+    resources = ExitStack()
+    rows = resources.enter_context(rows_source)
+
+    def generate():
+        if fmt == 'jsonl':
+            for row in rows:
+                yield json.dumps(row) + "\n"
+            return
+
+        yield '{"%s": [' % key
+        separator = ""
+        for row in rows:
+            yield separator + json.dumps(row)
+            separator = ","
+        yield "]}"
+
+    mimetype = JSON_LINES_MIMETYPE if fmt == 'jsonl' else "application/json"
+    response = Response(stream_with_context(generate()), status=200, mimetype=mimetype)
+    # Release the cursor and connection once the response is done, even if cut short
+    response.call_on_close(resources.close)
+    return response
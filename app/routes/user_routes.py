@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify
 from app.services import UserService
+from app.routes.streaming import stream_format, stream_rows
+from app.routes.pagination import page_args, page_response
 
 user_routes = Blueprint('user_routes', __name__)
 
@@ -95,6 +97,21 @@ def delete_user(user_id):
 # Get all users
 @user_routes.route('/users', methods=['GET'])
 def get_users():
+    # Keyset pagination with ?limit=N&cursor=...
+    try:
+        page = page_args()
+        if page:
+            cursor, limit = page
+            users, next_cursor = UserService.get_users_page(cursor, limit)
+            return page_response("users", users, next_cursor)
+    except ValueError as e:
+        return jsonify({"message": str(e)}), 400
+
+    # Large user lists can be streamed instead of buffered
+    fmt = stream_format()
+    if fmt:
+        return stream_rows("users", UserService.stream_users(), fmt)
+
     users = UserService.get_users()
 
     if not users:
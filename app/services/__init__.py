@@ -4,3 +4,4 @@ from app.services.product_service import ProductService
 from app.services.cart_service import CartService, PercentageDiscount, BuyOneGetOneDiscount, BulkDiscount
 from app.services.order_service import OrderService
 from app.services.checkout_service import CheckoutService, OrderObserver, OrderSubject
+from app.services.category_service import CategoryService
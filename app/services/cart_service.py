@@ -80,33 +80,36 @@ class CartService:
 
     @staticmethod
     def add_to_cart(user_id, product_id, quantity):
-        """Add item to cart."""
+        """Add item to cart.
+
+        Returns the message and the cart line as the database left it, with
+        the quantity it now holds, or None for the line on a database error.
+        """
         if quantity <= 0:
             raise ValueError("⚠️ Quantity must be greater than 0.")
 
         cart = Cart(user_id)
-        cart.add_to_cart(product_id, quantity)
-        return "Product added to cart successfully."
+        line = cart.add_to_cart(product_id, quantity)
+        if line is None:
+            return "⚠️ The product could not be added to the cart.", None
+        return "Product added to cart successfully.", line
 
     @staticmethod
     def update_cart(user_id, product_id, new_quantity):
-        """Update cart item quantity."""
+        """Update cart item quantity; returns the message and the updated cart line."""
         if new_quantity <= 0:
             raise ValueError("⚠️ Quantity must be greater than 0.")
 
         cart = Cart(user_id)
-        cart.update_cart(product_id, new_quantity)
-        return "Cart updated successfully."
+        line = cart.update_cart(product_id, new_quantity)
+        if line is None:
+            return "⚠️ The cart could not be updated.", None
+        return "Cart updated successfully.", line
 
     @staticmethod
     def remove_from_cart(user_id, product_id):
         """Remove item from cart."""
         cart = Cart(user_id)
-        # Check if item exists in cart before removing
-        item = cart.get_cart_item(product_id)
-        if not item:
-            raise ValueError("⚠️ Product not found in cart.")
-
         cart.remove_from_cart(product_id)
         return "Product removed from cart successfully."
 
@@ -0,0 +1,316 @@
+import secrets
+import threading
+import time
+from bisect import bisect_right
+from collections import OrderedDict
+from app.models.catalog_events import CatalogObserver, CatalogSubject
+
+# Columns whose change moves a product between list views
+_VIEW_COLUMNS = ("Name", "CategoryID", "FurnitureType")
+
+
+def _sort_key(row):
+    return sort_key(row['Name'], row['ProductID'])
+
+
+def sort_key(name, product_id):
+    """Position of a product in list views."""
+    # Same order as ORDER BY Name, ProductID under a case-insensitive collation
+    return (str(name).casefold(), product_id)
+
+
+class CatalogCache(CatalogObserver):
+    """In-process snapshot of the Products table.
+
+    ``loader`` returns every Products row (or None on a database error).
+    The snapshot is indexed by product id, category and furniture type and
+    kept current by the catalog events Furniture writes send after they
+    commit, which add, patch or remove single rows. Sorted list views are built lazily and kept in an LRU of
+    ``max_views`` entries.
+
+    A catalog larger than ``max_rows`` is not kept; list reads then return
+    None so callers query the database. Single products, hydrated with their
+    type-specific attributes which the snapshot lacks, are cached separately,
+    up to ``max_products``. ``ttl`` bounds how long a snapshot is trusted,
+    for changes made by other processes. ``version`` increases on every
+    change, and ``modified_at`` is the wall-clock time of the last one.
+    """
+
+    def __init__(self, loader, max_rows=50000, max_views=256, max_products=1024, ttl=300.0):
+        self._loader = loader
+        self.max_rows = max_rows
+        self.max_views = max_views
+        self.max_products = max_products
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self.version = 0
+        self.generation = 0  # increases every time the snapshot is (re)loaded
+        self.modified_at = time.time()
+        self._epoch = secrets.token_hex(4)  # tells this process's versions from others'
+        self._versioned_at = time.monotonic()
+        self.clear()
+
+    def clear(self):
+        """Drop everything, counters included."""
+        with self._lock:
+            self._reset()
+            self._products = OrderedDict()  # product id -> Furniture
+            self._stats = {
+                "hits": 0,
+                "misses": 0,
+                "loads": 0,
+                "invalidations": 0,
+                "evictions": 0,
+            }
+
+    def _reset(self):
+        self._by_id = None  # product id -> row; None until loaded
+        self._by_category = {}
+        self._by_type = {}
+        self._views = OrderedDict()  # view key -> (product ids, sort keys) in name order
+        self._loaded_at = 0.0
+        self._oversized_until = 0.0
+
+    def invalidate(self):
+        """Forget the snapshot; the next read loads it again."""
+        with self._lock:
+            self._reset()
+            self._products.clear()
+            self._changed()
+            self._stats["invalidations"] += 1
+
+    def _changed(self):
+        self.version += 1
+        self.modified_at = time.time()
+        self._versioned_at = time.monotonic()
+
+    def tag(self):
+        """The catalog version as a string, unique across processes and restarts.
+
+        It also moves on once ``ttl`` seconds pass without a change, so
+        nothing derived from it is trusted longer than a snapshot, whatever
+        other processes write meanwhile.
+        """
+        with self._lock:
+            if time.monotonic() - self._versioned_at >= self.ttl:
+                self._changed()
+            return f"{self._epoch}-{self.version}"
+
+    # Reads
+
+    def all(self):
+        """Every product in name order, or None if the catalog is not cached."""
+        return self.page()
+
+    def by_category(self, category_id):
+        """Products of one category in name order, or None if not cached."""
+        return self.page(category_id=category_id)
+
+    def by_type(self, furniture_type):
+        """Products of one furniture type in name order, or None if not cached."""
+        return self.page(furniture_type=furniture_type)
+
+    def page(self, category_id=None, furniture_type=None, after=None, limit=None):
+        """Products in name order, optionally filtered, or None if not cached.
+
+        ``after`` is the (Name, ProductID) of the last product already seen;
+        at most ``limit`` products after it are returned. The start of the
+        page is found by binary search, so deep pages cost the same as the
+        first.
+        """
+        if category_id is not None:
+            key = ("category", category_id)
+            ids_source = lambda: self._by_category.get(category_id, ())  # noqa: E731
+        elif furniture_type is not None:
+            key = ("type", furniture_type)
+            ids_source = lambda: self._by_type.get(furniture_type, ())  # noqa: E731
+        else:
+            key = ("all",)
+            ids_source = lambda: self._by_id  # noqa: E731
+
+        with self._lock:
+            view = self._view(key, ids_source)
+            if view is None:
+                return None
+            ids, keys = view
+            start = bisect_right(keys, sort_key(*after)) if after else 0
+            end = len(ids) if limit is None else start + limit
+            return [self._by_id[product_id] for product_id in ids[start:end]]
+
+    def ensure_loaded(self):
+        """Load the snapshot if needed; False when the catalog is not cached."""
+        with self._lock:
+            return self._ensure_loaded()
+
+    def products(self, ids=None):
+        """Rows for ``ids`` in the given order (all rows without ``ids``), or None if not cached.
+
+        Unknown ids are skipped.
+        """
+        with self._lock:
+            if not self._ensure_loaded():
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            if ids is None:
+                return list(self._by_id.values())
+            return [self._by_id[product_id] for product_id in ids if product_id in self._by_id]
+
+    def category_counts(self):
+        """Number of products in each category, or None if the catalog is not cached.
+
+        Read off the category index, which follows every product write.
+        """
+        with self._lock:
+            if not self._ensure_loaded():
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            return {
+                category_id: len(ids) for category_id, ids in self._by_category.items()
+                if category_id is not None and ids
+            }
+
+    def get_product(self, product_id):
+        """Return a Furniture object for ``product_id``, or None on a miss."""
+        with self._lock:
+            product = self._products.get(product_id)
+            if product is None:
+                self._stats["misses"] += 1
+                return None
+            self._products.move_to_end(product_id)
+            self._stats["hits"] += 1
+            return product
+
+    def put_product(self, product_id, product):
+        """Remember a product fetched from the database after a miss."""
+        with self._lock:
+            self._products[product_id] = product
+            self._products.move_to_end(product_id)
+            while len(self._products) > self.max_products:
+                self._products.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def stats(self):
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["version"] = self.version
+            stats["size"] = len(self._by_id) if self._by_id is not None else 0
+            stats["views"] = len(self._views)
+            stats["products"] = len(self._products)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+            return stats
+
+    def _view(self, key, ids_source):
+        # (product ids, sort keys) of a list view, both in name order
+        if not self._ensure_loaded():
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+
+        view = self._views.get(key)
+        if view is None:
+            rows = sorted((self._by_id[product_id] for product_id in ids_source()), key=_sort_key)
+            view = self._views[key] = (
+                [row['ProductID'] for row in rows],
+                [_sort_key(row) for row in rows]
+            )
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+                self._stats["evictions"] += 1
+        else:
+            self._views.move_to_end(key)
+        return view
+
+    def _snapshot_ready(self):
+        return self._by_id is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def _ensure_loaded(self):
+        if self._snapshot_ready():
+            return True
+        now = time.monotonic()
+        if now < self._oversized_until:
+            return False
+
+        rows = self._loader()
+        self._stats["loads"] += 1
+        if rows is None:
+            return False
+        if len(rows) > self.max_rows:
+            self._reset()
+            self._oversized_until = now + self.ttl
+            return False
+
+        self._reset()
+        self._by_id = {}
+        for row in rows:
+            self._index(row)
+        self._products.clear()
+        self._loaded_at = now
+        self._changed()
+        self.generation += 1
+        return True
+
+    def _index(self, row):
+        product_id = row['ProductID']
+        self._by_id[product_id] = row
+        self._by_category.setdefault(row.get('CategoryID'), set()).add(product_id)
+        self._by_type.setdefault(row.get('FurnitureType'), set()).add(product_id)
+
+    def _unindex(self, row):
+        product_id = row['ProductID']
+        del self._by_id[product_id]
+        self._by_category.get(row.get('CategoryID'), set()).discard(product_id)
+        self._by_type.get(row.get('FurnitureType'), set()).discard(product_id)
+
+    # Catalog events
+
+    def update(self, event, product_id=None, changes=None):
+        """Patch or invalidate the cache after a committed catalog change."""
+        with self._lock:
+            if event == CatalogSubject.CATEGORY_CHANGED:
+                # Product rows only hold the category id
+                self._changed()
+                return
+            self._products.pop(product_id, None)
+            if product_id is None:
+                self.invalidate()
+                return
+
+            self._changed()
+            if self._by_id is None:
+                return
+            if event == CatalogSubject.ADDED:
+                self._index(changes)
+                self._views.clear()
+                return
+            row = self._by_id.get(product_id)
+            if row is None:
+                return
+
+            if event == CatalogSubject.DELETED:
+                self._unindex(row)
+                self._views.clear()
+            elif event == CatalogSubject.STOCK_ADJUSTED:
+                self._by_id[product_id] = self._patched(row, {
+                    "StockQuantity": row['StockQuantity'] - changes["Quantity"]
+                })
+            elif event == CatalogSubject.UPDATED:
+                patched = self._patched(row, changes)
+                if any(patched.get(column) != row.get(column) for column in _VIEW_COLUMNS):
+                    self._unindex(row)
+                    self._index(patched)
+                    self._views.clear()
+                else:
+                    self._by_id[product_id] = patched
+            else:
+                self.invalidate()
+
+    @staticmethod
+    def _patched(row, changes):
+        # Cached rows may be read-only Row objects, so patch a copy
+        patched = dict(row)
+        patched.update(changes or {})
+        return patched
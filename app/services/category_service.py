@@ -0,0 +1,95 @@
+import heapq
+from app.models import Category
+from app.models.catalog_events import CatalogSubject
+from app.db import execute_query
+from app.services.catalog_cache import sort_key
+from app.services.category_tree import CategoryTree
+from app.services.product_service import catalog_cache, CATALOG_CACHE_TTL
+
+# Shared by every request; reloaded after category writes
+category_tree = CategoryTree(
+    Category.get_all_categories, catalog_cache, Category.get_product_counts, ttl=CATALOG_CACHE_TTL
+)
+CatalogSubject.attach(category_tree)
+
+
+def _product_sort_key(row):
+    return sort_key(row['Name'], row['ProductID'])
+
+
+class CategoryService:
+    @staticmethod
+    def get_category_tree():
+        """
+        Every category, nested under its parent, with its product counts.
+        """
+        return category_tree.tree() or []
+
+    @staticmethod
+    def get_category_by_id(category_id):
+        """Get a category by ID, from the cached tree."""
+        return category_tree.get(category_id)
+
+    @staticmethod
+    def add_category(name, description, parent_id=None):
+        """
+        Add a category, at the top level or under an existing parent.
+        """
+        if not name:
+            return "⚠️ Category name is required"
+        if parent_id is not None and category_tree.get(parent_id) is None:
+            return f"⚠️ Parent category with ID {parent_id} not found"
+
+        category_id = Category(name, description, parent_id).add_category()
+        if category_id is None:
+            return "⚠️ The category could not be added"
+        return f"Category '{name}' added successfully."
+
+    @staticmethod
+    def update_category(category_id, name, description, parent_id=None):
+        """
+        Rename a category and move it, with its subcategories, under ``parent_id``.
+        """
+        category = category_tree.get(category_id)
+        if category is None:
+            return f"⚠️ Category with ID {category_id} not found"
+        if not name:
+            return "⚠️ Category name is required"
+        if parent_id is not None and category_tree.get(parent_id) is None:
+            return f"⚠️ Parent category with ID {parent_id} not found"
+
+        try:
+            if parent_id != category.get('ParentID') and not Category.move_category(category_id, parent_id):
+                return "⚠️ The category could not be moved"
+        except ValueError as e:
+            return str(e)
+        Category(name, description).update_category(category_id)
+        return f"Category '{name}' updated successfully."
+
+    @staticmethod
+    def get_products_in_category(category_id):
+        """
+        Products of a category and all its subcategories in name order, or
+        None if there is no such category.
+        """
+        category_ids = category_tree.subtree_ids(category_id)
+        if category_ids is None:
+            return None
+
+        if catalog_cache.ensure_loaded():
+            views = [catalog_cache.by_category(subcategory_id) for subcategory_id in category_ids]
+            if all(view is not None for view in views):
+                return list(heapq.merge(*views, key=_product_sort_key))
+
+        # One range of the closure table's primary key finds the category
+        # and its subcategories, each joined to its products by index
+        query = """
+        SELECT p.* FROM Products p
+        JOIN CategoryClosure c ON p.CategoryID = c.DescendantID
+        WHERE c.AncestorID = ?
+        ORDER BY p.Name, p.ProductID
+        """
+        try:
+            return execute_query(query, (category_id,), fetch=True, compact=True) or []
+        except Exception:
+            return []
@@ -0,0 +1,120 @@
+import threading
+import time
+from app.models.catalog_events import CatalogObserver, CatalogSubject
+
+
+class CategoryTree(CatalogObserver):
+    """In-process copy of the category tree, with product counts.
+
+    ``loader`` returns every Categories row in name order (or None on a
+    database error); parents and children are linked through ``ParentID``.
+    The tree is kept until a category changes or ``ttl`` seconds pass.
+
+    Product counts are read off ``catalog_cache``, whose category index
+    follows every product write one row at a time. When the catalog is too
+    large to cache, ``count_loader`` returns (CategoryID, ProductCount)
+    rows instead; new products are added to those, and they are reloaded
+    after any other product change. Subtree totals are summed over the
+    tree, without a database round trip.
+    """
+
+    def __init__(self, loader, catalog_cache, count_loader, ttl=300.0):
+        self._loader = loader
+        self._catalog_cache = catalog_cache
+        self._count_loader = count_loader
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Drop the tree and the counts; the next read loads them."""
+        with self._lock:
+            self._rows = None  # category id -> Categories row, in name order
+            self._children = {}  # parent id (None for the top level) -> child ids, in name order
+            self._loaded_at = 0.0
+            self._counts = None  # counts from count_loader, while the catalog is not cached
+
+    def tree(self):
+        """Top-level categories in name order, each with its ``Children``, or None.
+
+        Every node also carries ``ProductCount``, the products filed
+        directly under it, and ``SubtreeProductCount``, those of its whole
+        subtree.
+        """
+        with self._lock:
+            if not self._ensure_loaded():
+                return None
+            counts = self._product_counts()
+            return [self._node(category_id, counts) for category_id in self._children.get(None, ())]
+
+    def get(self, category_id):
+        """The Categories row of ``category_id``, or None if there is no such category."""
+        with self._lock:
+            if not self._ensure_loaded():
+                return None
+            return self._rows.get(category_id)
+
+    def subtree_ids(self, category_id):
+        """``category_id`` and the ids of all its subcategories, or None if it does not exist."""
+        with self._lock:
+            if not self._ensure_loaded() or category_id not in self._rows:
+                return None
+            ids = [category_id]
+            for parent_id in ids:
+                ids.extend(self._children.get(parent_id, ()))
+            return ids
+
+    def _node(self, category_id, counts):
+        children = [self._node(child_id, counts) for child_id in self._children.get(category_id, ())]
+        count = counts.get(category_id, 0)
+        node = dict(self._rows[category_id])
+        node["ProductCount"] = count
+        node["SubtreeProductCount"] = count + sum(child["SubtreeProductCount"] for child in children)
+        node["Children"] = children
+        return node
+
+    def _product_counts(self):
+        counts = self._catalog_cache.category_counts()
+        if counts is not None:
+            return counts
+        if self._counts is None:
+            rows = self._count_loader()
+            if rows is None:
+                return {}
+            self._counts = {row['CategoryID']: row['ProductCount'] for row in rows}
+        return self._counts
+
+    def _ensure_loaded(self):
+        now = time.monotonic()
+        if self._rows is not None and now - self._loaded_at < self.ttl:
+            return True
+
+        rows = self._loader()
+        if rows is None:
+            return False
+        self._rows = {row['CategoryID']: row for row in rows}
+        self._children = {}
+        for row in rows:
+            parent_id = row.get('ParentID')
+            if parent_id not in self._rows:
+                parent_id = None
+            self._children.setdefault(parent_id, []).append(row['CategoryID'])
+        self._loaded_at = now
+        return True
+
+    # Catalog events
+
+    def update(self, event, product_id=None, changes=None):
+        """Forget the tree after a category write; keep loaded counts in step with product writes."""
+        with self._lock:
+            if event == CatalogSubject.CATEGORY_CHANGED:
+                self._rows = None
+            elif event == CatalogSubject.STOCK_ADJUSTED or self._counts is None:
+                return
+            elif event == CatalogSubject.ADDED and product_id is not None:
+                category_id = (changes or {}).get('CategoryID')
+                if category_id is not None:
+                    self._counts[category_id] = self._counts.get(category_id, 0) + 1
+            else:
+                # The event does not say which category the product left
+                self._counts = None
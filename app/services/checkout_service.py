@@ -1,9 +1,8 @@
 from abc import ABC, abstractmethod
 from app.services.order_service  import CartService
 from app.models import Order
-from app.models import OrderItem
 from app.models import Furniture
-from app.db import execute_query
+from app.db import execute_query, get_dialect
 
 
 # Observer Pattern for order notifications
@@ -26,9 +25,9 @@ class EmailNotification(OrderObserver):
         print(f"Order status: {status}, Total amount: {total_amount}")
 
         # Mock implementation - in reality would use an email service
-        query = """
+        query = f"""
         INSERT INTO Notifications (UserID, OrderID, Message, CreatedAt)
-        VALUES (?, ?, ?, GETDATE())
+        VALUES (?, ?, ?, {get_dialect().now})
         """
         message = f"Your order #{order_id} status is now: {status}. Total amount: {total_amount}"
         execute_query(query, (user_id, order_id, message))
@@ -91,36 +90,21 @@ class CheckoutService:
     @staticmethod
     def checkout(user_id):
         """Process checkout for a user's cart."""
-        # 1. Get cart contents
-        cart_items = CartService.get_cart_items(user_id)
-        if not cart_items:
-            return "⚠️ No items in the cart."
-
-        # 2. Calculate total amount
-        total_amount = 0
-        for item in cart_items:
-            product_id = item['ProductID']
-            quantity = item['Quantity']
-            price = item['Price']
-            total_amount += price * quantity
-
-        # 3. Create order
-        order = Order(user_id, total_amount, "pending")
-        order_id = order.add_order()  # Returns the new order ID
-
-        # 4. Add order items
-        for item in cart_items:
-            product_id = item['ProductID']
-            quantity = item['Quantity']
-            price = item['Price']
-            order_item = OrderItem(order_id, product_id, quantity, price)
-            order_item.add_order_item()
-
-        # 5. Notify observers of the new order
-        OrderSubject.notify(order_id, user_id, total_amount, "pending")
+        # Create the order and its items and clear the cart in one transaction.
+        # Stock is reserved later by InventoryUpdate when the order is confirmed.
+        try:
+            order = Order.create_from_cart(user_id, "pending", update_stock=False)
+        except ValueError as e:
+            return str(e)
+
+        if not order:
+            return "⚠️ Failed to create order."
 
-        # 6. Clear the cart
-        CartService.clear_cart(user_id)
+        order_id = order['OrderID']
+        total_amount = order['TotalAmount']
+
+        # Notify observers of the new order
+        OrderSubject.notify(order_id, user_id, total_amount, "pending")
 
         return f"✅ Checkout completed successfully. Total amount: {total_amount}."
 
@@ -131,9 +115,9 @@ class CheckoutService:
         # For this implementation, we'll just update the order status
 
         # Update order status to "paid"
-        query = """
+        query = f"""
         UPDATE Orders
-        SET Status = 'paid', PaymentMethod = ?, UpdatedAt = GETDATE()
+        SET Status = 'paid', PaymentMethod = ?, UpdatedAt = {get_dialect().now}
         WHERE OrderID = ?
         """
         execute_query(query, (payment_method, order_id))
@@ -156,9 +140,9 @@ class CheckoutService:
     def update_order_status(order_id, new_status):
         """Update order status and notify observers."""
         # Update order status
-        query = """
+        query = f"""
         UPDATE Orders
-        SET Status = ?, UpdatedAt = GETDATE()
+        SET Status = ?, UpdatedAt = {get_dialect().now}
         WHERE OrderID = ?
         """
         execute_query(query, (new_status, order_id))
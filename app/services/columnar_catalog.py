@@ -0,0 +1,246 @@
+import threading
+import numpy as np
+from app.models.catalog_events import CatalogObserver, CatalogSubject
+
+# Sort keys accepted by ColumnarCatalog.query; prefix with "-" for descending
+SORT_COLUMNS = {
+    "price": "_prices",
+    "stock": "_stock",
+    "id": "_ids",
+}
+
+# Category code of products without a category
+NO_CATEGORY = -1
+
+
+class ColumnarCatalog(CatalogObserver):
+    """Column arrays of the cached catalog for vectorized filters and sorts.
+
+    ProductID, Price, StockQuantity and CategoryID are NumPy arrays and
+    FurnitureType is interned to small integer codes, so a filter is one
+    boolean mask over the whole catalog and "the cheapest 20" an
+    ``argpartition`` instead of a full sort.
+
+    Built from the catalog cache snapshot, rebuilt when the cache reloads
+    it, and patched in place from catalog events: changed rows are
+    overwritten, deleted ones masked out and new ones appended to spare
+    capacity.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Drop the snapshot; the next query rebuilds it."""
+        with self._lock:
+            self._generation = None  # cache generation the arrays were built from
+            self._size = 0  # rows in use, deleted ones included
+            self._rows = {}  # product id -> row number
+            self._type_codes = {}  # furniture type -> code
+            self._allocate(0)
+
+    def query(self, category_id=None, furniture_type=None, min_price=None, max_price=None,
+              in_stock=None, ids=None, sort=None, limit=None):
+        """Return the ids of matching products, or None if the catalog is not cached.
+
+        ``sort`` is one of SORT_COLUMNS, "-" prefixed for descending order,
+        with ties broken by product id; without it ids come in no
+        particular order. ``limit`` keeps the first ``limit`` of them.
+        Raises ValueError for an unknown sort key.
+        """
+        descending = bool(sort) and sort.startswith("-")
+        column = SORT_COLUMNS.get(sort.lstrip("-")) if sort else None
+        if sort and column is None:
+            raise ValueError(f"⚠️ Cannot sort by '{sort}'. Use one of: {', '.join(SORT_COLUMNS)}.")
+
+        with self._lock:
+            if not self._ensure_current():
+                return None
+
+            size = self._size
+            mask = self._live[:size].copy()
+            if category_id is not None:
+                mask &= self._categories[:size] == category_id
+            if furniture_type is not None:
+                mask &= self._types[:size] == self._type_codes.get(furniture_type, -1)
+            if min_price is not None:
+                mask &= self._prices[:size] >= min_price
+            if max_price is not None:
+                mask &= self._prices[:size] <= max_price
+            if in_stock is not None:
+                mask &= (self._stock[:size] > 0) if in_stock else (self._stock[:size] <= 0)
+            if ids is not None:
+                mask &= np.isin(self._ids[:size], np.fromiter(ids, dtype=np.int64))
+
+            rows = np.flatnonzero(mask)
+            if column is not None:
+                rows = self._sorted(rows, getattr(self, column)[:size], descending, limit)
+            elif limit is not None:
+                rows = rows[:limit]
+            return self._ids[rows].tolist()
+
+    def _sorted(self, rows, values, descending, limit):
+        keys = values[rows]
+        if descending:
+            keys = -keys
+        if limit is not None and limit < len(rows):
+            # Everything tied with the limit-th key may belong in the top K
+            cutoff = np.partition(keys, limit - 1)[limit - 1]
+            keep = keys <= cutoff
+            rows, keys = rows[keep], keys[keep]
+        order = np.lexsort((self._ids[rows], keys))
+        if limit is not None:
+            order = order[:limit]
+        return rows[order]
+
+    def discounts(self, percentage, rules, flags, category_id=None, furniture_type=None):
+        """Evaluate the calculate_discount rules for every product at once, or None if not cached.
+
+        Every product gets ``percentage`` off its price, plus its type's
+        extra rate when its rule attribute is set. ``rules`` maps furniture
+        types to (extra rate, attribute default) and ``flags`` maps product
+        ids to their stored attribute value; products without one get the
+        default. Returns the ``ids``, ``prices``, ``stock``, ``categories``
+        (NO_CATEGORY for none) and ``discounts`` arrays of the products
+        selected by the filters.
+        """
+        with self._lock:
+            if not self._ensure_current():
+                return None
+
+            size = self._size
+            mask = self._live[:size].copy()
+            if category_id is not None:
+                mask &= self._categories[:size] == category_id
+            if furniture_type is not None:
+                mask &= self._types[:size] == self._type_codes.get(furniture_type, -1)
+            rows = np.flatnonzero(mask)
+            ids = self._ids[rows]
+            types = self._types[rows]
+            prices = self._prices[rows]
+
+            # Per type code: the extra rate and whether the attribute defaults to set
+            codes = len(self._type_codes)
+            rates = np.zeros(codes)
+            defaults = np.zeros(codes, dtype=np.bool_)
+            for name, code in self._type_codes.items():
+                rates[code], defaults[code] = rules.get(name, (0.0, False))
+
+            flagged = defaults[types]
+            if flags:
+                stored_ids = np.fromiter(flags.keys(), dtype=np.int64, count=len(flags))
+                stored_values = np.fromiter(flags.values(), dtype=np.bool_, count=len(flags))
+                order = np.argsort(stored_ids)
+                stored_ids, stored_values = stored_ids[order], stored_values[order]
+                positions = np.searchsorted(stored_ids, ids).clip(max=len(stored_ids) - 1)
+                stored = stored_ids[positions] == ids
+                flagged = np.where(stored, stored_values[positions], flagged)
+
+            share = percentage / 100 + np.where(flagged, rates[types], 0.0)
+            return {
+                "ids": ids,
+                "prices": prices,
+                "stock": self._stock[rows],
+                "categories": self._categories[rows],
+                "discounts": prices * share,
+            }
+
+    def stats(self):
+        """Return the size of the snapshot."""
+        with self._lock:
+            return {
+                "products": int(self._live[:self._size].sum()),
+                "rows": self._size,
+                "capacity": len(self._ids),
+                "furniture_types": len(self._type_codes),
+            }
+
+    # Building
+
+    def _allocate(self, capacity):
+        # Grow every column to ``capacity`` rows, keeping the rows in use
+        size = self._size
+        columns = {
+            "_ids": np.int64, "_prices": np.float64, "_stock": np.int64,
+            "_categories": np.int64, "_types": np.int32, "_live": np.bool_,
+        }
+        for name, dtype in columns.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if size:
+                array[:size] = getattr(self, name)[:size]
+            setattr(self, name, array)
+
+    def _ensure_current(self):
+        if not self._cache.ensure_loaded():
+            return False
+        if self._generation == self._cache.generation:
+            return True
+
+        generation = self._cache.generation
+        rows = self._cache.products()
+        if rows is None:
+            return False
+        self.clear()
+        self._allocate(len(rows))
+        types = [self._type_code(row.get('FurnitureType')) for row in rows]
+        count = len(rows)
+        self._ids[:count] = [row['ProductID'] for row in rows]
+        self._prices[:count] = [float(row.get('Price') or 0) for row in rows]
+        self._stock[:count] = [row.get('StockQuantity') or 0 for row in rows]
+        self._categories[:count] = [
+            NO_CATEGORY if row.get('CategoryID') is None else row['CategoryID'] for row in rows
+        ]
+        self._types[:count] = types
+        self._live[:count] = True
+        self._rows = {row['ProductID']: number for number, row in enumerate(rows)}
+        self._size = count
+        self._generation = generation
+        return True
+
+    def _type_code(self, furniture_type):
+        code = self._type_codes.get(furniture_type)
+        if code is None:
+            code = self._type_codes[furniture_type] = len(self._type_codes)
+        return code
+
+    def _store(self, row):
+        product_id = row['ProductID']
+        number = self._rows.get(product_id)
+        if number is None:
+            if self._size == len(self._ids):
+                self._allocate(max(16, 2 * self._size))
+            number = self._rows[product_id] = self._size
+            self._size += 1
+        self._ids[number] = product_id
+        self._prices[number] = float(row.get('Price') or 0)
+        self._stock[number] = row.get('StockQuantity') or 0
+        self._categories[number] = NO_CATEGORY if row.get('CategoryID') is None else row['CategoryID']
+        self._types[number] = self._type_code(row.get('FurnitureType'))
+        self._live[number] = True
+
+    # Catalog events
+
+    def update(self, event, product_id=None, changes=None):
+        """Patch the columns after a committed catalog change."""
+        if event == CatalogSubject.CATEGORY_CHANGED:
+            return
+        with self._lock:
+            if self._generation is None:
+                return
+            if product_id is None:
+                # The cache reloads, and the arrays with it
+                self._generation = None
+                return
+
+            if event == CatalogSubject.DELETED:
+                number = self._rows.pop(product_id, None)
+                if number is not None:
+                    self._live[number] = False
+                return
+
+            # The cache has already applied the change
+            rows = self._cache.products([product_id])
+            if rows:
+                self._store(rows[0])
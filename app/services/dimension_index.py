@@ -0,0 +1,111 @@
+import threading
+import numpy as np
+from app.models.catalog_events import CatalogObserver, CatalogSubject
+from app.models.furniture import DIMENSION_COLUMNS
+
+# Names of the dimensions in range filters, in DIMENSION_COLUMNS order
+DIMENSIONS = ("width", "depth", "height")
+
+
+class DimensionIndex(CatalogObserver):
+    """Sorted arrays of product widths, depths and heights for size-range filters.
+
+    For each dimension the products with parsed dimensions are kept in
+    value order, so the products in a range are one slice found by binary
+    search. A query takes the narrowest slice among the ranges asked for
+    and checks the other dimensions on just those rows.
+
+    Built from the catalog cache snapshot. Any product write marks it
+    stale and it is sorted again on the next query; stock changes never
+    touch it.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Drop the arrays; the next query rebuilds them."""
+        with self._lock:
+            self._generation = None  # cache generation the arrays were built from
+            self._stale = True  # a product changed since the arrays were built
+            self._ids = np.zeros(0, dtype=np.int64)  # row -> product id
+            self._values = np.zeros((0, len(DIMENSIONS)))  # row -> width, depth, height
+            self._orders = {}  # dimension -> (sorted values, rows in that order)
+
+    def query(self, ranges):
+        """Return the ids of the products inside every range, or None if the catalog is not cached.
+
+        ``ranges`` maps dimension names to ``(low, high)`` in centimetres,
+        both inclusive and either None for an open end. Products whose
+        dimensions could not be parsed never match. Raises ValueError for
+        an unknown dimension.
+        """
+        for name in ranges:
+            if name not in DIMENSIONS:
+                raise ValueError(f"⚠️ Unknown dimension: {name}. Use one of: {', '.join(DIMENSIONS)}.")
+
+        with self._lock:
+            if not self._ensure_current():
+                return None
+
+            rows = None
+            for name, (low, high) in ranges.items():
+                values, order = self._orders[name]
+                start = 0 if low is None else np.searchsorted(values, low, side="left")
+                end = len(values) if high is None else np.searchsorted(values, high, side="right")
+                if rows is None or end - start < len(rows):
+                    rows = order[start:end]
+            if rows is None:
+                rows = np.arange(len(self._ids))
+
+            mask = np.ones(len(rows), dtype=np.bool_)
+            for name, (low, high) in ranges.items():
+                column = self._values[rows, DIMENSIONS.index(name)]
+                if low is not None:
+                    mask &= column >= low
+                if high is not None:
+                    mask &= column <= high
+            return self._ids[rows[mask]].tolist()
+
+    def stats(self):
+        """Return the number of products indexed."""
+        with self._lock:
+            return {"products": len(self._ids)}
+
+    def _ensure_current(self):
+        if not self._cache.ensure_loaded():
+            return False
+        if self._generation == self._cache.generation and not self._stale:
+            return True
+
+        generation = self._cache.generation
+        rows = self._cache.products()
+        if rows is None:
+            return False
+        measured = [
+            row for row in rows
+            if all(row.get(column) is not None for column in DIMENSION_COLUMNS)
+        ]
+        self._ids = np.fromiter((row['ProductID'] for row in measured), dtype=np.int64, count=len(measured))
+        self._values = np.array(
+            [[float(row[column]) for column in DIMENSION_COLUMNS] for row in measured],
+            dtype=np.float64
+        ).reshape(len(measured), len(DIMENSIONS))
+        self._orders = {}
+        for position, name in enumerate(DIMENSIONS):
+            order = np.argsort(self._values[:, position], kind="stable")
+            self._orders[name] = (self._values[order, position], order)
+        self._generation = generation
+        self._stale = False
+        return True
+
+    # Catalog events
+
+    def update(self, event, product_id=None, changes=None):
+        """Mark the arrays stale after a committed product write."""
+        if event in (CatalogSubject.CATEGORY_CHANGED, CatalogSubject.STOCK_ADJUSTED):
+            return
+        with self._lock:
+            self._stale = True
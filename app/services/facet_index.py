@@ -0,0 +1,222 @@
+import threading
+from app.models.catalog_events import CatalogObserver, CatalogSubject
+
+# Upper bounds of the price buckets; the last bucket has none
+PRICE_BUCKETS = (100, 250, 500, 1000, 2500)
+
+# Facets in the order they are reported
+FACETS = ("category_id", "furniture_type", "price", "in_stock")
+
+
+def price_bucket(price):
+    """Label of the price bucket ``price`` falls in, e.g. "100-250"."""
+    low = 0
+    for high in PRICE_BUCKETS:
+        if price < high:
+            return f"{low}-{high}"
+        low = high
+    return f"{low}+"
+
+
+def _bucket_bounds():
+    # (label, low, high) of every bucket, high None for the last one
+    bounds, low = [], 0
+    for high in PRICE_BUCKETS:
+        bounds.append((f"{low}-{high}", low, high))
+        low = high
+    bounds.append((f"{low}+", low, None))
+    return bounds
+
+
+def popcount(bitmap):
+    """Number of set bits."""
+    return bin(bitmap).count("1")
+
+
+def bitmap_of(slots, size):
+    """Bitmap with the bits of ``slots`` set."""
+    data = bytearray((size + 7) // 8)
+    for slot in slots:
+        data[slot >> 3] |= 1 << (slot & 7)
+    return int.from_bytes(data, "little")
+
+
+def slots_of(bitmap):
+    """Positions of the set bits, lowest first."""
+    bits = bin(bitmap)[:1:-1]
+    position = bits.find("1")
+    while position >= 0:
+        yield position
+        position = bits.find("1", position + 1)
+
+
+class FacetIndex(CatalogObserver):
+    """Bitmap indexes over the cached catalog for combined filters and facet counts.
+
+    Every product gets a slot, and every facet value (a category, a
+    furniture type, a price bucket, in or out of stock) a bitmap of the
+    slots holding it, as a Python int. A filter is the AND of the bitmaps
+    it selects; the counts of a facet are the popcounts of its bitmaps
+    ANDed with the other filters, so picking a category still shows how
+    many products the other categories have.
+
+    Built from the catalog cache snapshot, rebuilt when the cache reloads
+    it and patched in between from catalog events.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Drop the index; the next filter rebuilds it."""
+        with self._lock:
+            self._generation = None  # cache generation the index was built from
+            self._slots = {}  # product id -> slot
+            self._ids = []  # slot -> product id, None once removed
+            self._values = []  # slot -> its facet values, in FACETS order
+            self._prices = []  # slot -> price
+            self._bitmaps = {facet: {} for facet in FACETS}
+            self._all = 0
+
+    def filter(self, category_id=None, furniture_type=None, min_price=None, max_price=None,
+               in_stock=None, ids=None):
+        """Return ``(product ids, facet counts)`` of the products matching every filter given.
+
+        ``ids`` restricts the result to those products, e.g. search hits.
+        Product ids come in no particular order. Returns None if the
+        catalog is not cached.
+        """
+        with self._lock:
+            if not self._ensure_current():
+                return None
+
+            masks = {}
+            if category_id is not None:
+                masks["category_id"] = self._bitmaps["category_id"].get(category_id, 0)
+            if furniture_type is not None:
+                masks["furniture_type"] = self._bitmaps["furniture_type"].get(furniture_type, 0)
+            if min_price is not None or max_price is not None:
+                masks["price"] = self._price_mask(min_price, max_price)
+            if in_stock is not None:
+                masks["in_stock"] = self._bitmaps["in_stock"].get(bool(in_stock), 0)
+            if ids is not None:
+                masks["ids"] = bitmap_of(
+                    (self._slots[product_id] for product_id in ids if product_id in self._slots),
+                    len(self._ids)
+                )
+
+            facets = {}
+            for facet in FACETS:
+                others = self._all
+                for name, mask in masks.items():
+                    if name != facet:
+                        others &= mask
+                counts = {}
+                for value, bitmap in self._bitmaps[facet].items():
+                    count = popcount(bitmap & others)
+                    if count:
+                        counts[value] = count
+                facets[facet] = counts
+
+            matched = self._all
+            for mask in masks.values():
+                matched &= mask
+            return [self._ids[slot] for slot in slots_of(matched)], facets
+
+    def _price_mask(self, min_price, max_price):
+        mask = 0
+        for label, low, high in _bucket_bounds():
+            bitmap = self._bitmaps["price"].get(label, 0)
+            if not bitmap:
+                continue
+            if (min_price is not None and high is not None and high <= min_price) or \
+                    (max_price is not None and low > max_price):
+                continue
+            if (min_price is None or low >= min_price) and \
+                    (max_price is None or (high is not None and high <= max_price)):
+                mask |= bitmap  # the whole bucket is in range
+                continue
+            # Bucket straddles a bound: check its products one by one
+            mask |= bitmap_of(
+                (slot for slot in slots_of(bitmap)
+                 if (min_price is None or self._prices[slot] >= min_price)
+                 and (max_price is None or self._prices[slot] <= max_price)),
+                len(self._ids)
+            )
+        return mask
+
+    def _ensure_current(self):
+        if not self._cache.ensure_loaded():
+            return False
+        if self._generation == self._cache.generation:
+            return True
+
+        generation = self._cache.generation
+        rows = self._cache.products()
+        if rows is None:
+            return False
+        self.clear()
+        for row in rows:
+            self._add(row)
+        self._generation = generation
+        return True
+
+    def _add(self, row):
+        slot = len(self._ids)
+        price = float(row.get('Price') or 0)
+        values = (
+            row.get('CategoryID'),
+            row.get('FurnitureType'),
+            price_bucket(price),
+            (row.get('StockQuantity') or 0) > 0,
+        )
+        self._slots[row['ProductID']] = slot
+        self._ids.append(row['ProductID'])
+        self._values.append(values)
+        self._prices.append(price)
+
+        bit = 1 << slot
+        self._all |= bit
+        for facet, value in zip(FACETS, values):
+            if value is not None:
+                bitmaps = self._bitmaps[facet]
+                bitmaps[value] = bitmaps.get(value, 0) | bit
+
+    def _remove(self, product_id):
+        slot = self._slots.pop(product_id, None)
+        if slot is None:
+            return
+        # The slot stays empty until the next rebuild
+        bit = 1 << slot
+        self._all &= ~bit
+        for facet, value in zip(FACETS, self._values[slot]):
+            bitmaps = self._bitmaps[facet]
+            if value in bitmaps:
+                bitmaps[value] &= ~bit
+                if not bitmaps[value]:
+                    del bitmaps[value]
+        self._ids[slot] = None
+        self._values[slot] = ()
+
+    # Catalog events
+
+    def update(self, event, product_id=None, changes=None):
+        """Keep the bitmaps in step with committed catalog changes."""
+        if event == CatalogSubject.CATEGORY_CHANGED:
+            return
+        with self._lock:
+            if self._generation is None:
+                return
+            if product_id is None:
+                # The cache reloads, and the index with it
+                self._generation = None
+                return
+
+            self._remove(product_id)
+            if event != CatalogSubject.DELETED:
+                # The cache has already applied the change
+                rows = self._cache.products([product_id])
+                if rows:
+                    self._add(rows[0])
@@ -1,8 +1,6 @@
 from app.models import Order
-from app.models import OrderItem
-from app.models import Furniture
 from app.services.cart_service import CartService
-from app.db import execute_query
+from app.db import execute_query, DEFAULT_PAGE_SIZE
 from app.services.checkout_service import OrderSubject
 
 
@@ -12,44 +10,19 @@ class OrderService:
         """
         Create a new order based on cart contents.
         """
-        # 1. Get cart contents
-        cart_items = CartService.get_cart_items(user_id)
-        if not cart_items:
-            return "⚠️ No items in the cart."
+        # Order, items, inventory and cart clear run as one transaction
+        try:
+            order = Order.create_from_cart(user_id)
+        except ValueError as e:
+            return str(e)
 
-        total_amount = 0
-        # 2. Calculate total amount
-        for item in cart_items:
-            product_id = item['ProductID']
-            quantity = item['Quantity']
-            price = item['Price']
-            total_amount += price * quantity
-
-        # 3. Create order
-        order = Order(user_id, total_amount)
-        order_id = order.add_order()  # Add order to database
-
-        if not order_id:
+        if not order:
             return "⚠️ Failed to create order."
 
-        # 4. Add order items
-        for item in cart_items:
-            product_id = item['ProductID']
-            quantity = item['Quantity']
-            price = item['Price']
-            order_item = OrderItem(order_id, product_id, quantity, price)
-            order_item.add_order_item()
+        order_id = order['OrderID']
+        total_amount = order['TotalAmount']
 
-        # 5. Update inventory
-        for item in cart_items:
-            product_id = item['ProductID']
-            quantity = item['Quantity']
-            Furniture.update_stock(product_id, quantity)
-
-        # 6. Clear the cart
-        CartService.clear_cart(user_id)
-
-        # 7. Notify observers
+        # Notify observers
         OrderSubject.notify(order_id, user_id, total_amount, "pending")
 
         return f"✅ Order completed successfully. Total amount: {total_amount}."
@@ -113,3 +86,38 @@ class OrderService:
         Get order details by ID.
         """
         return Order.get_order_by_id(order_id)
+
+    @staticmethod
+    def get_order_stamp(order_id):
+        """
+        Get what an order's details change with (status, totals, update
+        time, customer), or None if the order does not exist. Cheaper than
+        fetching the details, for answering conditional requests.
+        """
+        return Order.get_order_stamp(order_id)
+
+    @staticmethod
+    def get_orders_by_status(status):
+        """
+        Get all orders with a specific status.
+        """
+        return Order.get_orders_by_status(status)
+
+    @staticmethod
+    def get_orders_page(user_id=None, status=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of orders, newest first, for a user and/or a status.
+
+        Returns ``(orders, next_cursor)``. Raises ValueError for a malformed cursor.
+        """
+        orders, next_cursor = Order.get_orders_page(user_id, status, cursor, limit)
+        return orders or [], next_cursor
+
+    @staticmethod
+    def stream_orders_by_status(status):
+        """
+        Stream all orders with a specific status.
+
+        Use as ``with OrderService.stream_orders_by_status(status) as orders:``.
+        """
+        return Order.stream_orders_by_status(status)
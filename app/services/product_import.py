@@ -0,0 +1,54 @@
+import csv
+import json
+
+# Formats a product feed can come in
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Fields every imported product must have, as for POST /api/products
+REQUIRED_FIELDS = ('name', 'description', 'price', 'dimensions', 'stock_quantity',
+                   'category_id', 'image_url', 'furniture_type')
+
+
+def read_records(stream, fmt):
+    """Yield ``(row number, record)`` for every product in a CSV or JSON Lines text stream.
+
+    Rows are read one at a time, so a feed of any size is never held in
+    memory. A record is a dict of the row's non-empty fields, or a "⚠️"
+    message for a row that could not be read. CSV rows are numbered from
+    the first one after the header, JSON Lines rows by line. Raises
+    ValueError for an unknown format.
+    """
+    if fmt == "csv":
+        return _read_csv(stream)
+    if fmt == "jsonl":
+        return _read_jsonl(stream)
+    raise ValueError(f"⚠️ Unknown import format '{fmt}'. Use one of: {', '.join(IMPORT_FORMATS)}.")
+
+
+def _read_csv(stream):
+    number = 0
+    try:
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            if None in row:
+                yield number, "⚠️ Row has more fields than the header."
+                continue
+            yield number, {key.strip(): value for key, value in row.items() if value not in (None, "")}
+    except csv.Error as e:
+        # The rest of the file cannot be split into rows reliably
+        yield number + 1, f"⚠️ Unreadable CSV: {e}"
+
+
+def _read_jsonl(stream):
+    for number, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, "⚠️ Invalid JSON."
+            continue
+        if not isinstance(record, dict):
+            yield number, "⚠️ Each line must be a JSON object."
+            continue
+        yield number, {key: value for key, value in record.items() if value is not None}
@@ -1,11 +1,87 @@
+import os
+from datetime import datetime, timezone
+import numpy as np
 from app.models import FurnitureFactory, Furniture
-from app.db import execute_query
+from app.models.furniture import ATTRIBUTE_TYPES, attribute_filter_query, coerce_attribute
+from app.models.catalog_events import CatalogSubject
+from app.db import get_dialect, execute_query, stream_query, transaction, fetch_page, page_of, decode_cursor, DEFAULT_PAGE_SIZE
+from app.services.catalog_cache import CatalogCache, sort_key
+from app.services.facet_index import FacetIndex
+from app.services.columnar_catalog import ColumnarCatalog, SORT_COLUMNS, NO_CATEGORY
+from app.services.dimension_index import DimensionIndex, DIMENSIONS
+from app.services.search_index import SearchIndex
+from app.services.suggest_index import SuggestIndex, MAX_SUGGESTIONS
+from app.services.product_import import REQUIRED_FIELDS
+
+# Catalog cache configuration (seconds for the TTL)
+CATALOG_CACHE_MAX_ROWS = int(os.environ.get("CATALOG_CACHE_MAX_ROWS", 50000))
+CATALOG_CACHE_TTL = float(os.environ.get("CATALOG_CACHE_TTL", 300))
+
+# Largest number of products one multi-get may ask for
+MAX_BATCH_IDS = 500
+
+# Bulk imports commit this many products at a time
+IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", 1000))
+
+# Per-row errors kept in an import report; the rest are only counted
+MAX_IMPORT_ERRORS = 1000
+
+# Products columns behind the sort keys of filter_products
+_SORT_COLUMNS_SQL = {"price": "Price", "stock": "StockQuantity", "id": "ProductID"}
+
+# Products columns behind the dimension range filters
+_DIMENSION_COLUMNS_SQL = {"width": "Width", "depth": "Depth", "height": "Height"}
+
+
+def _load_catalog():
+    """Read the whole Products table for the catalog cache."""
+    query = "SELECT * FROM Products"
+    return execute_query(query, fetch=True, compact=True)
+
+
+def _load_suggestions():
+    """Read every product name with its units sold for the suggestion index."""
+    query = """
+    SELECT p.ProductID, p.Name, COALESCE(s.Sold, 0) AS Popularity
+    FROM Products p
+    LEFT JOIN (
+        SELECT ProductID, SUM(Quantity) AS Sold FROM OrderItems GROUP BY ProductID
+    ) s ON s.ProductID = p.ProductID
+    """
+    return execute_query(query, fetch=True, compact=True)
+
+
+# Shared by every request; kept current by the catalog events of Furniture writes
+catalog_cache = CatalogCache(_load_catalog, max_rows=CATALOG_CACHE_MAX_ROWS, ttl=CATALOG_CACHE_TTL)
+CatalogSubject.attach(catalog_cache)
+
+# Full-text index over the cached catalog
+search_index = SearchIndex(catalog_cache)
+CatalogSubject.attach(search_index)
+
+# Bitmap indexes for combined filters and facet counts
+facet_index = FacetIndex(catalog_cache)
+CatalogSubject.attach(facet_index)
+
+# Column arrays for vectorized sorts and top-K
+columnar_catalog = ColumnarCatalog(catalog_cache)
+CatalogSubject.attach(columnar_catalog)
+
+# Sorted width, depth and height arrays for size ranges
+dimension_index = DimensionIndex(catalog_cache)
+CatalogSubject.attach(dimension_index)
+
+# Name autocomplete; independent of the cache size limit
+suggest_index = SuggestIndex(_load_suggestions, ttl=CATALOG_CACHE_TTL)
+CatalogSubject.attach(suggest_index)
+
 
 class ProductService:
     @staticmethod
-    def add_product(name, description, price, dimensions, stock_quantity, category_id, image_url, furniture_type, **additional_attributes):
+    def validate_product(name, description, price, stock_quantity):
         """
-        Add a new furniture product to the database after validation.
+        Check the fields every product needs; return the first problem
+        found, or None.
         """
         # Validate name and description
         if not name or not description:
@@ -18,6 +94,16 @@ class ProductService:
         # Validate stock quantity
         if stock_quantity < 0:
             return "⚠️ Stock quantity must be greater than or equal to 0"
+        return None
+
+    @staticmethod
+    def add_product(name, description, price, dimensions, stock_quantity, category_id, image_url, furniture_type, **additional_attributes):
+        """
+        Add a new furniture product to the database after validation.
+        """
+        error = ProductService.validate_product(name, description, price, stock_quantity)
+        if error:
+            return error
 
         # Create furniture object using factory pattern
         try:
@@ -52,17 +138,9 @@ class ProductService:
         if not existing_product:
             return f"⚠️ Product with ID {product_id} not found"
 
-        # Validate name and description
-        if not name or not description:
-            return "⚠️ Name and description are required"
-
-        # Validate price
-        if price <= 0:
-            return "⚠️ Price must be greater than 0"
-
-        # Validate stock quantity
-        if stock_quantity < 0:
-            return "⚠️ Stock quantity must be greater than or equal to 0"
+        error = ProductService.validate_product(name, description, price, stock_quantity)
+        if error:
+            return error
 
         # Create furniture object using factory pattern
         try:
@@ -87,6 +165,108 @@ class ProductService:
         except Exception as e:
             return f"⚠️ An error occurred: {str(e)}"
 
+    @staticmethod
+    def import_products(records, chunk_size=IMPORT_CHUNK_SIZE):
+        """
+        Add the products of ``records`` (as yielded by
+        ``product_import.read_records``) in batches of ``chunk_size``, each
+        committed on its own.
+
+        Rows are checked with the rules of add_product and the
+        FurnitureFactory; a batch the database rejects is split in halves
+        and retried, so one bad row never costs the others. Returns a report with
+        the number imported and failed, and up to MAX_IMPORT_ERRORS
+        ``{"row", "message"}`` errors.
+        """
+        if chunk_size < 1:
+            raise ValueError("⚠️ Chunk size must be greater than 0.")
+
+        report = {"imported": 0, "failed": 0, "errors": []}
+
+        def fail(number, message):
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_IMPORT_ERRORS:
+                report["errors"].append({"row": number, "message": message})
+
+        def flush(chunk):
+            if ProductService._add_batch([furniture for _, furniture in chunk]):
+                report["imported"] += len(chunk)
+            elif len(chunk) == 1:
+                fail(chunk[0][0], "⚠️ The database rejected this row.")
+            else:
+                # Halve the batch until the rows the database refuses are alone
+                middle = len(chunk) // 2
+                flush(chunk[:middle])
+                flush(chunk[middle:])
+
+        chunk = []
+        for number, record in records:
+            if isinstance(record, str):
+                fail(number, record)
+                continue
+            try:
+                chunk.append((number, ProductService.furniture_from_record(record)))
+            except ValueError as e:
+                message = str(e)
+                fail(number, message if message.startswith("⚠️") else f"⚠️ {message}")
+                continue
+            if len(chunk) >= chunk_size:
+                flush(chunk)
+                chunk = []
+        if chunk:
+            flush(chunk)
+        return report
+
+    @staticmethod
+    def furniture_from_record(record):
+        """
+        Build the furniture object of one imported record; raises ValueError
+        if it misses a field or breaks a product rule. Text values, as CSV
+        gives them, are converted to the type of their field.
+        """
+        for field in REQUIRED_FIELDS:
+            if record.get(field) in (None, ""):
+                raise ValueError(f"⚠️ Missing required field: {field}")
+
+        values = {}
+        for field, kind in (('price', float), ('stock_quantity', int), ('category_id', int)):
+            try:
+                values[field] = kind(record[field])
+            except (TypeError, ValueError):
+                raise ValueError(f"⚠️ {field} must be a number.") from None
+
+        error = ProductService.validate_product(
+            record['name'], record['description'], values['price'], values['stock_quantity']
+        )
+        if error:
+            raise ValueError(error)
+
+        attributes = {}
+        for name, value in record.items():
+            kind = ATTRIBUTE_TYPES.get(name)
+            if kind is not None and kind is not str and isinstance(value, str):
+                value = coerce_attribute(name, value)
+                if kind is int and value.is_integer():
+                    value = int(value)
+            attributes[name] = value
+
+        return FurnitureFactory.create_furniture(
+            record['furniture_type'], record['name'], record['description'], values['price'],
+            record['dimensions'], values['stock_quantity'], values['category_id'], record['image_url'],
+            attributes
+        )
+
+    @staticmethod
+    def _add_batch(furnitures):
+        # Insert and commit on its own, whatever unit of work is around
+        try:
+            with transaction(join=False) as unit:
+                count = Furniture.add_many(furnitures)
+        except Exception as e:
+            print(f"Error while committing imported products: {e}")
+            return False
+        return count is not None and not unit.failed
+
     @staticmethod
     def delete_product(product_id):
         """
@@ -112,7 +292,12 @@ class ProductService:
             return None
 
         try:
-            return Furniture.get_furniture_by_id(product_id)
+            product = catalog_cache.get_product(product_id)
+            if product is None:
+                product = Furniture.get_furniture_by_id(product_id)
+                if product is not None:
+                    catalog_cache.put_product(product_id, product)
+            return product
         except Exception:
             return None
 
@@ -136,24 +321,319 @@ class ProductService:
         except Exception as e:
             return f"⚠️ An error occurred: {str(e)}"
 
+    @staticmethod
+    def get_products_by_ids(product_ids):
+        """
+        Get many products at once, in the order asked for, each only once.
+
+        Products in the cache of hydrated products are taken from it, the
+        rest are read with a single query. Returns ``(products, missing
+        ids)``. Raises ValueError for more than MAX_BATCH_IDS ids.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
+        if len(product_ids) > MAX_BATCH_IDS:
+            raise ValueError(f"⚠️ At most {MAX_BATCH_IDS} product IDs can be fetched at once.")
+
+        found = {}
+        for product_id in product_ids:
+            product = catalog_cache.get_product(product_id)
+            if product is not None:
+                found[product_id] = product
+
+        wanted = [product_id for product_id in product_ids if product_id not in found and product_id > 0]
+        if wanted:
+            for product_id, product in Furniture.get_furnitures_by_ids(wanted).items():
+                catalog_cache.put_product(product_id, product)
+                found[product_id] = product
+
+        products = [found[product_id] for product_id in product_ids if product_id in found]
+        missing = [product_id for product_id in product_ids if product_id not in found]
+        return products, missing
+
     @staticmethod
     def get_all_products():
         """Get all products."""
+        products = catalog_cache.all()
+        if products is not None:
+            return products
+
         query = """
         SELECT * FROM Products
         ORDER BY Name
         """
         try:
-            return execute_query(query, fetch=True) or []
+            return execute_query(query, fetch=True, compact=True) or []
         except Exception:
             return []
 
     @staticmethod
-    def search_products(search_term):
-        """Search products by name or description."""
+    def get_products_page(category_id=None, furniture_type=None, cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of products ordered by (Name, ProductID), optionally
+        filtered by category or furniture type.
+
+        Returns ``(products, next_cursor)``; pass ``next_cursor`` back to get
+        the following page. Raises ValueError for a malformed cursor.
+        """
+        after = decode_cursor(cursor, 2) if cursor else None
+        try:
+            # Query string values arrive as text
+            cached_category = int(category_id) if category_id else None
+        except (TypeError, ValueError):
+            cached_category = None
+
+        if cached_category is not None or not category_id:
+            products = catalog_cache.page(cached_category, furniture_type or None, after, limit + 1)
+            if products is not None:
+                return page_of(products, limit, ("Name", "ProductID"))
+
+        where, params = [], []
+        if category_id:
+            where.append("CategoryID = ?")
+            params.append(category_id)
+        elif furniture_type:
+            where.append("FurnitureType = ?")
+            params.append(furniture_type)
+
+        products, next_cursor = fetch_page(
+            "SELECT * FROM Products", ("Name", "ProductID"), ("Name", "ProductID"),
+            where, params, cursor=cursor, limit=limit
+        )
+        return products or [], next_cursor
+
+    @staticmethod
+    def filter_products(category_id=None, furniture_type=None, min_price=None, max_price=None,
+                        in_stock=None, search_term=None, fuzzy=False, cursor=None, limit=None, sort=None,
+                        attributes=None, dimensions=None):
+        """
+        Get the products matching every given filter, with facet counts.
+
+        Results come in name order, or best matches first with a search
+        term. ``facets`` maps each of category_id, furniture_type, price
+        (bucket) and in_stock to {value: product count}, counting every
+        filter except that facet's own; it is None when the catalog is too
+        large to cache. Without a search term, ``limit`` and ``cursor`` page
+        the results like ``get_products_page``.
+
+        ``sort`` ("price", "stock" or "id", "-" prefixed for descending)
+        orders the results by that column instead, and ``limit`` then keeps
+        the top ``limit`` of them; it cannot be combined with a cursor.
+
+        ``attributes`` are ``(name, operator, value)`` filters on the
+        type-specific attributes, see ``parse_attribute_filters``, and
+        ``dimensions`` maps width, depth or height to a ``(low, high)`` range
+        in centimetres, see ``parse_dimension_filters``.
+
+        Returns ``(products, facets, next_cursor)``. Raises ValueError for
+        a malformed cursor or sort.
+        """
+        if sort:
+            if sort.lstrip("-") not in SORT_COLUMNS:
+                raise ValueError(f"⚠️ Cannot sort by '{sort}'. Use one of: {', '.join(SORT_COLUMNS)}.")
+            if cursor:
+                raise ValueError("⚠️ cursor cannot be combined with sort; use limit for the top results.")
+        after = decode_cursor(cursor, 2) if cursor and not search_term else None
+        if category_id:
+            try:
+                # Query string values arrive as text
+                category_id = int(category_id)
+            except (TypeError, ValueError):
+                return [], None, None
+
+        ids = None
+        if search_term:
+            hits = search_index.search(search_term, fuzzy=fuzzy)
+            ids = [row['ProductID'] for row in hits] if hits is not None else None
+        if attributes and (ids is not None or not search_term):
+            # Answered from the attribute indexes, then combined with the rest
+            matching = Furniture.find_ids_by_attributes(attributes)
+            if ids is None:
+                ids = matching
+            else:
+                matching = set(matching)
+                ids = [product_id for product_id in ids if product_id in matching]
+
+        sized = True
+        if dimensions and (ids is not None or not search_term):
+            # Answered from the sorted dimension arrays
+            matching = dimension_index.query(dimensions)
+            if matching is None:
+                sized = False
+            elif ids is None:
+                ids = matching
+            else:
+                matching = set(matching)
+                ids = [product_id for product_id in ids if product_id in matching]
+
+        result = None
+        if sized and (ids is not None or not search_term):
+            result = facet_index.filter(
+                category_id or None, furniture_type or None, min_price, max_price, in_stock, ids
+            )
+
+        if sort and result is not None:
+            # Filter, sort and take the top K over the column arrays
+            ordered = columnar_catalog.query(
+                category_id or None, furniture_type or None, min_price, max_price, in_stock, ids, sort, limit
+            )
+            if ordered is not None:
+                return catalog_cache.products(ordered) or [], result[1], None
+
+        if sort:
+            products = ProductService._filter_products_query(
+                category_id, furniture_type, min_price, max_price, in_stock, search_term, sort, limit, attributes,
+                dimensions
+            )
+            return products, result[1] if result else None, None
+        if result is not None:
+            matched, facets = result
+            if search_term:
+                # Keep the search ranking
+                matched = set(matched)
+                ids = [product_id for product_id in ids if product_id in matched]
+                return catalog_cache.products(ids) or [], facets, None
+            products = sorted(
+                catalog_cache.products(matched) or [],
+                key=lambda row: sort_key(row['Name'], row['ProductID'])
+            )
+        else:
+            facets = None
+            products = ProductService._filter_products_query(
+                category_id, furniture_type, min_price, max_price, in_stock, search_term, attributes=attributes,
+                dimensions=dimensions
+            )
+
+        if search_term or limit is None:
+            return products, facets, None
+        if after:
+            start = sort_key(*after)
+            products = [row for row in products if sort_key(row['Name'], row['ProductID']) > start]
+        products, next_cursor = page_of(products[:limit + 1], limit, ("Name", "ProductID"))
+        return products, facets, next_cursor
+
+    @staticmethod
+    def parse_attribute_filters(args):
+        """
+        Turn query string pairs naming furniture attributes into filters.
+
+        ``seats=3`` compares for equality; ``seats>=3`` and ``seats<=4``
+        (which arrive as the keys ``seats>`` and ``seats<``) for ranges.
+        Other keys are ignored.
+        """
+        filters = []
+        for key, value in args:
+            name, operator = key, "="
+            if key.endswith(">"):
+                name, operator = key[:-1], ">="
+            elif key.endswith("<"):
+                name, operator = key[:-1], "<="
+            if name in ATTRIBUTE_TYPES:
+                filters.append((name, operator, value))
+        return filters
+
+    @staticmethod
+    def parse_dimension_filters(args):
+        """
+        Turn ``min_width``, ``max_height`` and the like into ranges by
+        dimension, for ``filter_products``. Raises ValueError for a value
+        that is not a number.
+        """
+        ranges = {}
+        for name in DIMENSIONS:
+            bounds = []
+            for key in (f"min_{name}", f"max_{name}"):
+                value = args.get(key)
+                if value is None:
+                    bounds.append(None)
+                    continue
+                try:
+                    bounds.append(float(value))
+                except (TypeError, ValueError):
+                    raise ValueError(f"⚠️ {key} must be a number.")
+            if bounds != [None, None]:
+                ranges[name] = tuple(bounds)
+        return ranges
+
+    @staticmethod
+    def _filter_products_query(category_id, furniture_type, min_price, max_price, in_stock, search_term,
+                               sort=None, limit=None, attributes=None, dimensions=None):
+        # Catalog too large to cache: filter in SQL, without facet counts
+        where, params = [], []
+        if category_id:
+            where.append("CategoryID = ?")
+            params.append(category_id)
+        if furniture_type:
+            where.append("FurnitureType = ?")
+            params.append(furniture_type)
+        if min_price is not None:
+            where.append("Price >= ?")
+            params.append(min_price)
+        if max_price is not None:
+            where.append("Price <= ?")
+            params.append(max_price)
+        if in_stock is not None:
+            where.append("StockQuantity > 0" if in_stock else "StockQuantity <= 0")
+        if search_term:
+            where.append("(Name LIKE ? OR Description LIKE ?)")
+            params.extend([f"%{search_term}%"] * 2)
+        if attributes:
+            attribute_query, attribute_params = attribute_filter_query(attributes)
+            where.append(f"ProductID IN ({attribute_query})")
+            params.extend(attribute_params)
+        for name, (low, high) in (dimensions or {}).items():
+            column = _DIMENSION_COLUMNS_SQL.get(name)
+            if column is None:
+                raise ValueError(f"⚠️ Unknown dimension: {name}. Use one of: {', '.join(DIMENSIONS)}.")
+            if low is not None:
+                where.append(f"{column} >= ?")
+                params.append(low)
+            if high is not None:
+                where.append(f"{column} <= ?")
+                params.append(high)
+
+        query = "SELECT * FROM Products"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        if sort:
+            direction = " DESC" if sort.startswith("-") else ""
+            query += f" ORDER BY {_SORT_COLUMNS_SQL[sort.lstrip('-')]}{direction}, ProductID"
+            if limit is not None:
+                query += " " + get_dialect().limit(limit)
+        else:
+            query += " ORDER BY Name, ProductID"
+        try:
+            return execute_query(query, tuple(params), fetch=True, compact=True) or []
+        except Exception:
+            return []
+
+    @staticmethod
+    def stream_all_products():
+        """
+        Stream all products without loading them into memory.
+
+        Use as ``with ProductService.stream_all_products() as products:``.
+        """
+        query = """
+        SELECT * FROM Products
+        ORDER BY Name
+        """
+        return stream_query(query)
+
+    @staticmethod
+    def search_products(search_term, fuzzy=False):
+        """
+        Search products by name or description, best matches first.
+
+        With ``fuzzy``, misspelled words ("cabinett") still find products.
+        """
         if not search_term:
             return []
 
+        products = search_index.search(search_term, fuzzy=fuzzy)
+        if products is not None:
+            return products
+
+        # Catalog too large to cache: fall back to a scan
         query = """
         SELECT * FROM Products
         WHERE Name LIKE ? OR Description LIKE ?
@@ -165,12 +645,140 @@ class ProductService:
         except Exception:
             return []
 
+    @staticmethod
+    def suggest_products(prefix, limit=10):
+        """
+        Suggest up to ``limit`` product names with a word starting with
+        ``prefix``, best sellers first.
+        """
+        if not prefix or not prefix.strip():
+            return []
+        limit = max(1, min(int(limit), MAX_SUGGESTIONS))
+
+        suggestions = suggest_index.suggest(prefix, limit)
+        if suggestions is None:
+            return []
+        return [{"id": product_id, "name": name} for product_id, name in suggestions]
+
+    @staticmethod
+    def catalog_version():
+        """
+        Tag that changes whenever a product or category changes, for caching
+        and validating what is built from the catalog. Checked in-process,
+        without a database round trip.
+        """
+        return catalog_cache.tag()
+
+    @staticmethod
+    def catalog_modified():
+        """
+        Time of the last catalog change this process knows of.
+        """
+        return datetime.fromtimestamp(catalog_cache.modified_at, timezone.utc).replace(microsecond=0)
+
+    @staticmethod
+    def preview_discount(percentage, category_id=None, furniture_type=None, include_products=True):
+        """
+        What a ``percentage`` promotion would take off the catalog, with
+        each furniture type's calculate_discount rule on top, evaluated for
+        every product in one pass over the column arrays.
+
+        Returns ``{"percentage", "summary", "categories", "products"}``:
+        the totals, the same per category, and each product's discount and
+        sale price (left out without ``include_products``). ``list_value``
+        sums prices and ``stock_discount`` weighs each discount by the units
+        in stock. Returns None when the catalog is too large to cache.
+        Raises ValueError for a percentage outside 0-100.
+        """
+        try:
+            percentage = float(percentage)
+        except (TypeError, ValueError):
+            raise ValueError("⚠️ percentage must be a number.")
+        if not 0 <= percentage <= 100:
+            raise ValueError("⚠️ percentage must be between 0 and 100.")
+        if category_id:
+            try:
+                # Query string values arrive as text
+                category_id = int(category_id)
+            except (TypeError, ValueError):
+                raise ValueError("⚠️ category_id must be a number.")
+
+        if not catalog_cache.ensure_loaded():
+            return None
+        rules = FurnitureFactory.discount_rules()
+        rows = Furniture.get_discount_flags(rules)
+        if rows is None:
+            return None
+        flags = {row['ProductID']: bool(row['Flag']) for row in rows}
+        columns = columnar_catalog.discounts(
+            percentage, {name: (rate, default) for name, (_, rate, default) in rules.items()}, flags,
+            category_id or None, furniture_type or None
+        )
+        if columns is None:
+            return None
+
+        prices, discounts = columns["prices"], columns["discounts"]
+        stock_discounts = discounts * np.maximum(columns["stock"], 0)
+        keys, groups = np.unique(columns["categories"], return_inverse=True)
+        counts = np.bincount(groups, minlength=len(keys))
+        totals = [np.bincount(groups, weights=values, minlength=len(keys)).round(2).tolist()
+                  for values in (prices, discounts, stock_discounts)]
+
+        report = {
+            "percentage": percentage,
+            "summary": {
+                "products": len(prices),
+                "list_value": round(float(prices.sum()), 2),
+                "discount": round(float(discounts.sum()), 2),
+                "stock_discount": round(float(stock_discounts.sum()), 2),
+            },
+            "categories": [
+                {
+                    "category_id": None if key == NO_CATEGORY else key,
+                    "products": count,
+                    "list_value": list_value,
+                    "discount": discount,
+                    "stock_discount": stock_discount,
+                }
+                for key, count, list_value, discount, stock_discount
+                in zip(keys.tolist(), counts.tolist(), *totals)
+            ],
+        }
+        if include_products:
+            report["products"] = [
+                {"id": product_id, "price": price, "discount": discount, "sale_price": sale_price}
+                for product_id, price, discount, sale_price in zip(
+                    columns["ids"].tolist(), prices.round(2).tolist(),
+                    discounts.round(2).tolist(), (prices - discounts).round(2).tolist()
+                )
+            ]
+        return report
+
+    @staticmethod
+    def rebuild_search_index():
+        """
+        Rebuild the search index from a fresh catalog snapshot.
+        """
+        catalog_cache.invalidate()
+        count = search_index.rebuild()
+        if count is None:
+            return "⚠️ The catalog is too large to index or could not be loaded."
+        return f"Search index rebuilt with {count} products."
+
     @staticmethod
     def get_products_by_category(category_id):
         """Get products by category."""
         if not category_id:
             return []
 
+        try:
+            # Query string values arrive as text
+            products = catalog_cache.by_category(int(category_id))
+        except (TypeError, ValueError):
+            products = None
+        if products is not None:
+            return products
+
         query = """
         SELECT * FROM Products
         WHERE CategoryID = ?
@@ -187,6 +795,10 @@ class ProductService:
         if not furniture_type:
             return []
 
+        products = catalog_cache.by_type(furniture_type)
+        if products is not None:
+            return products
+
         query = """
         SELECT * FROM Products
         WHERE FurnitureType = ?
@@ -0,0 +1,270 @@
+import math
+import re
+import threading
+from bisect import bisect_left
+from collections import Counter
+from app.models.catalog_events import CatalogObserver, CatalogSubject
+
+_TOKEN = re.compile(r"\w+")
+
+# Term weights per field: a match in the name counts more than one in the description
+FIELD_WEIGHTS = (("Name", 2), ("Description", 1))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Most terms a trailing prefix ("cha" -> chair, chaise, ...) expands to
+MAX_PREFIX_TERMS = 50
+
+# Most terms a misspelled query term ("cabinett" -> cabinet, ...) expands to,
+# and most vocabulary terms it is compared with to find them
+MAX_FUZZY_TERMS = 20
+MAX_FUZZY_CANDIDATES = 200
+
+
+def tokenize(text):
+    """Split text into case-folded word tokens."""
+    return _TOKEN.findall(str(text).casefold()) if text else []
+
+
+def trigrams(term):
+    """Character trigrams of a term, padded so short terms have some too."""
+    padded = f"$${term}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_typos(term):
+    """Edit distance a query term of this length tolerates."""
+    return 1 if len(term) <= 5 else 2
+
+
+def edit_distance(a, b, limit):
+    """Edits (insert, delete, substitute or swap two adjacent characters) turning ``a`` into ``b``.
+
+    Gives up and returns ``limit + 1`` as soon as the distance exceeds ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            distance = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b)
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                distance = min(distance, before[j - 2] + 1)
+            current.append(distance)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+class SearchIndex(CatalogObserver):
+    """In-process inverted index over product names and descriptions.
+
+    Built from the catalog cache snapshot, rebuilt whenever the cache
+    reloads it, and patched in between from catalog events. Results are
+    ranked with BM25; every query term must match, and the last one also
+    matches as a prefix so results follow the user's typing.
+
+    Fuzzy searches look each query term up in a trigram index of the
+    vocabulary, so misspellings only get compared with terms that share
+    enough trigrams with them, and rank matches lower the more edits they
+    take.
+    """
+
+    def __init__(self, cache):
+        self._cache = cache
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Drop the index; the next search rebuilds it."""
+        with self._lock:
+            self._generation = None  # cache generation the index was built from
+            self._postings = {}  # term -> {product id: weighted term frequency}
+            self._doc_terms = {}  # product id -> Counter of its terms
+            self._doc_lengths = {}
+            self._total_length = 0
+            self._sorted_terms = None  # built lazily for prefix lookups
+            self._trigrams = {}  # trigram -> terms containing it
+
+    def rebuild(self):
+        """Index the whole catalog again; returns the number of products, or None if not cached."""
+        with self._lock:
+            self._generation = None
+            if not self._ensure_current():
+                return None
+            return len(self._doc_terms)
+
+    def stats(self):
+        """Return the size of the index."""
+        with self._lock:
+            return {
+                "documents": len(self._doc_terms),
+                "terms": len(self._postings),
+                "postings": sum(len(postings) for postings in self._postings.values()),
+            }
+
+    def search(self, text, limit=None, fuzzy=False):
+        """Return matching product rows, best first, or None if the catalog is not cached.
+
+        With ``fuzzy``, query terms also match terms a few typos away.
+        """
+        terms = tokenize(text)
+        with self._lock:
+            if not self._ensure_current():
+                return None
+            if not terms:
+                return []
+            ranked = self._rank(terms, fuzzy)
+        if limit is not None:
+            ranked = ranked[:limit]
+        return self._cache.products(ranked)
+
+    def _rank(self, terms, fuzzy=False):
+        count = len(self._doc_terms)
+        average_length = self._total_length / count if count else 0.0
+
+        scores = None
+        for position, term in enumerate(terms):
+            # (term, weight) pairs the query term matches
+            if fuzzy:
+                expansions = self._expand_fuzzy(term)
+            elif position == len(terms) - 1:
+                expansions = [(expansion, 1.0) for expansion in self._expand(term)]
+            else:
+                expansions = [(term, 1.0)] if term in self._postings else []
+
+            # Best scoring expansion per product for this query term
+            term_scores = {}
+            for expansion, weight in expansions:
+                postings = self._postings[expansion]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for product_id, frequency in postings.items():
+                    norm = K1 * (1 - B + B * self._doc_lengths[product_id] / average_length)
+                    score = weight * idf * frequency * (K1 + 1) / (frequency + norm)
+                    if score > term_scores.get(product_id, 0.0):
+                        term_scores[product_id] = score
+
+            if scores is None:
+                scores = term_scores
+            else:
+                # Every term has to match
+                scores = {
+                    product_id: score + term_scores[product_id]
+                    for product_id, score in scores.items() if product_id in term_scores
+                }
+            if not scores:
+                return []
+
+        return sorted(scores, key=lambda product_id: (-scores[product_id], product_id))
+
+    def _expand(self, prefix):
+        if self._sorted_terms is None:
+            self._sorted_terms = sorted(self._postings)
+        terms = []
+        start = bisect_left(self._sorted_terms, prefix)
+        for term in self._sorted_terms[start:start + MAX_PREFIX_TERMS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _expand_fuzzy(self, term):
+        limit = max_typos(term)
+        shared = Counter()
+        for gram in trigrams(term):
+            shared.update(self._trigrams.get(gram, ()))
+
+        # Terms sharing the most trigrams are the likeliest to be close
+        matches = []
+        for candidate, _ in shared.most_common(MAX_FUZZY_CANDIDATES):
+            distance = edit_distance(term, candidate, limit)
+            if distance <= limit:
+                matches.append((distance, candidate))
+        matches.sort()
+        return [(candidate, 1.0 / (1 + distance)) for distance, candidate in matches[:MAX_FUZZY_TERMS]]
+
+    def _ensure_current(self):
+        if not self._cache.ensure_loaded():
+            return False
+        if self._generation == self._cache.generation:
+            return True
+
+        generation = self._cache.generation
+        rows = self._cache.products()
+        if rows is None:
+            return False
+        self.clear()
+        for row in rows:
+            self._add(row['ProductID'], row)
+        self._generation = generation
+        return True
+
+    def _add(self, product_id, row):
+        terms = Counter()
+        for column, weight in FIELD_WEIGHTS:
+            for term in tokenize(row.get(column)):
+                terms[term] += weight
+        self._doc_terms[product_id] = terms
+        length = sum(terms.values())
+        self._doc_lengths[product_id] = length
+        self._total_length += length
+        for term, frequency in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._sorted_terms = None
+                for gram in trigrams(term):
+                    self._trigrams.setdefault(gram, set()).add(term)
+            postings[product_id] = frequency
+
+    def _remove(self, product_id):
+        terms = self._doc_terms.pop(product_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(product_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[product_id]
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+                for gram in trigrams(term):
+                    self._trigrams[gram].discard(term)
+
+    # Catalog events
+
+    def update(self, event, product_id=None, changes=None):
+        """Keep the index in step with committed catalog changes."""
+        if event == CatalogSubject.CATEGORY_CHANGED:
+            return
+        with self._lock:
+            if self._generation is None:
+                return
+            if product_id is None:
+                # The cache reloads, and the index with it
+                self._generation = None
+            elif event == CatalogSubject.DELETED:
+                self._remove(product_id)
+            elif event == CatalogSubject.ADDED:
+                self._remove(product_id)
+                self._add(product_id, changes)
+            elif event == CatalogSubject.UPDATED and changes:
+                columns = [column for column, _ in FIELD_WEIGHTS]
+                if all(column in changes for column in columns):
+                    row = changes
+                elif any(column in changes for column in columns):
+                    rows = self._cache.products([product_id])
+                    row = rows[0] if rows else None
+                else:
+                    return  # e.g. a stock change
+                if row is not None:
+                    self._remove(product_id)
+                    self._add(product_id, row)
@@ -0,0 +1,240 @@
+import heapq
+import re
+import threading
+import time
+from array import array
+from app.models.catalog_events import CatalogObserver, CatalogSubject
+
+_WORD_START = re.compile(r"\w+")
+
+# Largest number of suggestions a client may ask for
+MAX_SUGGESTIONS = 50
+
+
+def word_offsets(folded_name):
+    """Offsets where the words of a (case-folded) name start."""
+    return [match.start() for match in _WORD_START.finditer(folded_name)]
+
+
+class SuggestIndex(CatalogObserver):
+    """Autocomplete over product names, most popular first.
+
+    Every word start of every name is an entry in a sorted array, so the
+    names matching a prefix ("chai" finds "Office Chair") form one
+    contiguous range found by binary search. A segment tree over the
+    entries' popularity then yields the top K of that range in
+    O(K log n), whatever the size of the range.
+
+    ``loader`` returns (ProductID, Name, Popularity) rows, or None on a
+    database error. Product writes are applied from catalog events to a
+    small overlay that is merged into the sorted array once it holds
+    ``max_pending`` products; sales (stock taken off) raise popularity in
+    place. The whole index is reloaded after ``ttl`` seconds.
+    """
+
+    def __init__(self, loader, ttl=300.0, max_pending=1024):
+        self._loader = loader
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Drop the index; the next lookup loads it."""
+        with self._lock:
+            self._loaded_at = None
+            self._names = {}  # product id -> current name
+            self._base_folded = {}  # product id -> case-folded name its entries were sorted by
+            self._popularity = {}  # product id -> units sold
+            self._entry_ids = array('q')  # sorted entries: product id...
+            self._entry_offsets = array('l')  # ...and the word start in its name
+            self._scores = array('d')  # popularity of each entry
+            self._positions = {}  # product id -> its entry positions
+            self._tree = array('l')
+            self._size = 0
+            self._stale = set()  # ids whose entries no longer match their name
+            self._pending = set()  # ids added or renamed since the last merge
+
+    def suggest(self, prefix, limit=10):
+        """Return up to ``limit`` (ProductID, Name) pairs whose name has a word starting with ``prefix``.
+
+        Returns None if the index could not be loaded.
+        """
+        prefix = " ".join(str(prefix).casefold().split())
+        if not prefix:
+            return []
+        with self._lock:
+            if not self._ensure_loaded():
+                return None
+            ranked = self._top(prefix, limit)
+            ranked.extend(self._pending_matches(prefix))
+            ranked.sort(key=lambda item: (-item[0], self._names[item[1]].casefold(), item[1]))
+            return [(product_id, self._names[product_id]) for _, product_id in ranked[:limit]]
+
+    def stats(self):
+        """Return the size of the index."""
+        with self._lock:
+            return {
+                "products": len(self._names),
+                "entries": self._size,
+                "pending": len(self._pending),
+            }
+
+    # Lookups
+
+    def _top(self, prefix, limit):
+        start = self._bisect(prefix)
+        end = self._bisect(prefix + "\U0010ffff")
+        if start >= end:
+            return []
+
+        results = []
+        seen = set()
+        best = self._argmax(start, end)
+        heap = [(-self._scores[best], best, start, end)]
+        while heap and len(results) < limit:
+            _, position, low, high = heapq.heappop(heap)
+            product_id = self._entry_ids[position]
+            if product_id not in seen and product_id not in self._stale:
+                seen.add(product_id)
+                results.append((self._scores[position], product_id))
+            # The rest of the range, split around the entry just taken
+            for low, high in ((low, position), (position + 1, high)):
+                if low < high:
+                    best = self._argmax(low, high)
+                    heapq.heappush(heap, (-self._scores[best], best, low, high))
+        return results
+
+    def _pending_matches(self, prefix):
+        matches = []
+        for product_id in self._pending:
+            folded = self._names[product_id].casefold()
+            if any(folded.startswith(prefix, offset) for offset in word_offsets(folded)):
+                matches.append((self._popularity.get(product_id, 0.0), product_id))
+        return matches
+
+    def _key(self, position):
+        return self._base_folded[self._entry_ids[position]][self._entry_offsets[position]:]
+
+    def _bisect(self, key):
+        # First entry not below ``key``
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _better(self, a, b):
+        if a < 0:
+            return b
+        if b < 0:
+            return a
+        return a if self._scores[a] > self._scores[b] or (self._scores[a] == self._scores[b] and a < b) else b
+
+    def _argmax(self, low, high):
+        best = -1
+        low += self._size
+        high += self._size
+        while low < high:
+            if low & 1:
+                best = self._better(best, self._tree[low])
+                low += 1
+            if high & 1:
+                high -= 1
+                best = self._better(best, self._tree[high])
+            low >>= 1
+            high >>= 1
+        return best
+
+    # Building
+
+    def _ensure_loaded(self):
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl:
+            return True
+        rows = self._loader()
+        if rows is None:
+            return False
+
+        self.clear()
+        for row in rows:
+            product_id = row['ProductID']
+            self._names[product_id] = row['Name'] or ""
+            self._popularity[product_id] = float(row['Popularity'] or 0)
+        self._build()
+        self._loaded_at = time.monotonic()
+        return True
+
+    def _build(self):
+        self._base_folded = folded = {product_id: name.casefold() for product_id, name in self._names.items()}
+        entries = sorted(
+            ((product_id, offset) for product_id, name in folded.items() for offset in word_offsets(name)),
+            key=lambda entry: folded[entry[0]][entry[1]:]
+        )
+        self._size = size = len(entries)
+        self._entry_ids = array('q', (product_id for product_id, _ in entries))
+        self._entry_offsets = array('l', (offset for _, offset in entries))
+        self._scores = array('d', (self._popularity.get(product_id, 0.0) for product_id, _ in entries))
+        self._positions = {}
+        for position, (product_id, _) in enumerate(entries):
+            self._positions.setdefault(product_id, []).append(position)
+
+        # Leaves hold their own position; each parent the better of its children
+        tree = array('l', [-1]) * (2 * size)
+        tree[size:] = array('l', range(size))
+        for node in range(size - 1, 0, -1):
+            tree[node] = self._better(tree[2 * node], tree[2 * node + 1])
+        self._tree = tree
+        self._stale = set()
+        self._pending = set()
+
+    def _set_popularity(self, product_id, popularity):
+        self._popularity[product_id] = popularity
+        for position in self._positions.get(product_id, ()):
+            self._scores[position] = popularity
+            node = (position + self._size) >> 1
+            while node:
+                self._tree[node] = self._better(self._tree[2 * node], self._tree[2 * node + 1])
+                node >>= 1
+
+    # Catalog events
+
+    def update(self, event, product_id=None, changes=None):
+        """Keep suggestions in step with committed catalog changes."""
+        if event == CatalogSubject.CATEGORY_CHANGED:
+            return
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            if product_id is None:
+                self._loaded_at = None  # reload on the next lookup
+                return
+
+            if event == CatalogSubject.STOCK_ADJUSTED:
+                sold = changes.get("Quantity", 0) if changes else 0
+                if sold > 0 and product_id in self._names:
+                    self._set_popularity(product_id, self._popularity.get(product_id, 0.0) + sold)
+                return
+
+            if event == CatalogSubject.DELETED:
+                if self._names.pop(product_id, None) is not None:
+                    self._popularity.pop(product_id, None)
+                    self._pending.discard(product_id)
+                    self._stale.add(product_id)
+                return
+
+            name = (changes or {}).get("Name")
+            if event not in (CatalogSubject.ADDED, CatalogSubject.UPDATED) or name is None:
+                return
+            if self._names.get(product_id) == name:
+                return
+            # Entries of the old name are skipped until the next merge
+            if product_id in self._positions:
+                self._stale.add(product_id)
+            self._names[product_id] = name
+            self._popularity.setdefault(product_id, 0.0)
+            self._pending.add(product_id)
+            if len(self._pending) >= self.max_pending:
+                self._build()
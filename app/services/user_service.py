@@ -1,5 +1,5 @@
 from app.models import User
-from app.db import execute_query
+from app.db import execute_query, stream_query, fetch_page, DEFAULT_PAGE_SIZE
 import hashlib
 import re
 
@@ -130,12 +130,36 @@ class UserService:
         """
         try:
             query = "SELECT UserID, Name, Email, Role, CreatedAt FROM Users"
-            result = execute_query(query, fetch=True)
+            result = execute_query(query, fetch=True, compact=True)
             return result if result else []
         except Exception as e:
             print(f"Error fetching users: {str(e)}")
             return []
 
+    @staticmethod
+    def get_users_page(cursor=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        Get one page of users ordered by (CreatedAt, UserID).
+
+        Returns ``(users, next_cursor)``. Raises ValueError for a malformed cursor.
+        """
+        users, next_cursor = fetch_page(
+            "SELECT UserID, Name, Email, Role, CreatedAt FROM Users",
+            ("CreatedAt", "UserID"), ("CreatedAt", "UserID"),
+            cursor=cursor, limit=limit
+        )
+        return users or [], next_cursor
+
+    @staticmethod
+    def stream_users():
+        """
+        Stream all users without loading them into memory.
+
+        Use as ``with UserService.stream_users() as users:``.
+        """
+        query = "SELECT UserID, Name, Email, Role, CreatedAt FROM Users"
+        return stream_query(query)
+
     @staticmethod
     def get_user_by_id(user_id):
         """
@@ -0,0 +1,69 @@
+"""Compare dict-list and columnar filtering, sorting and top-K on the catalog.
+
+Usage:
+    python benchmarks/bench_columnar.py [product_count]
+
+Builds a synthetic catalog (no database needed) and times "the 20
+cheapest in-stock sofas" and a full price sort, first over the list of
+row dicts the catalog cache holds, then over the NumPy column arrays.
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.catalog_cache import CatalogCache  # noqa: E402
+from app.services.columnar_catalog import ColumnarCatalog  # noqa: E402
+
+DEFAULT_PRODUCT_COUNT = 200_000
+TYPES = ("Chair", "Table", "Sofa", "Bed", "Cabinet")
+
+
+def build_rows(product_count):
+    rng = random.Random(42)
+    return [
+        {
+            "ProductID": product_id, "Name": f"Product {product_id}",
+            "Price": round(rng.uniform(20, 3000), 2), "StockQuantity": rng.randint(0, 40),
+            "CategoryID": rng.randint(1, 12), "FurnitureType": rng.choice(TYPES),
+        }
+        for product_id in range(1, product_count + 1)
+    ]
+
+
+def best_of(function, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    rows = build_rows(product_count)
+    columns = ColumnarCatalog(CatalogCache(lambda: rows, max_rows=product_count))
+    columns.query()
+
+    def dicts_top_k():
+        matches = [row for row in rows if row["FurnitureType"] == "Sofa" and row["StockQuantity"] > 0]
+        return sorted(matches, key=lambda row: (row["Price"], row["ProductID"]))[:20]
+
+    def dicts_sort():
+        return sorted(rows, key=lambda row: (row["Price"], row["ProductID"]))
+
+    print(f"{product_count:,} products")
+    print(f"{'query':<28}{'dicts (ms)':>12}{'columns (ms)':>14}")
+    for name, dicts, columnar in (
+        ("20 cheapest in-stock sofas", dicts_top_k,
+         lambda: columns.query(furniture_type="Sofa", in_stock=True, sort="price", limit=20)),
+        ("full sort by price", dicts_sort, lambda: columns.query(sort="price")),
+    ):
+        print(f"{name:<28}{best_of(dicts) * 1000:>12.1f}{best_of(columnar) * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare per-object and vectorized evaluation of the discount rules.
+
+Usage:
+    python benchmarks/bench_discount_preview.py [product_count]
+
+Builds a synthetic catalog (no database needed) and prices a 15%
+promotion for every product, first by hydrating furniture objects and
+calling their ``calculate_discount``, then in one pass over the NumPy
+column arrays, and sums both per category.
+"""
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.furniture import FurnitureFactory  # noqa: E402
+from app.services.catalog_cache import CatalogCache  # noqa: E402
+from app.services.columnar_catalog import ColumnarCatalog  # noqa: E402
+
+DEFAULT_PRODUCT_COUNT = 200_000
+PERCENTAGE = 15
+
+
+def build_catalog(product_count):
+    rng = random.Random(42)
+    rules = FurnitureFactory.discount_rules()
+    types = sorted(rules)
+    rows, flags = [], {}
+    for product_id in range(1, product_count + 1):
+        furniture_type = rng.choice(types)
+        rows.append({
+            "ProductID": product_id, "Name": f"Product {product_id}", "Description": "", "Dimensions": "",
+            "ImageURL": "", "Price": round(rng.uniform(20, 3000), 2), "StockQuantity": rng.randint(0, 40),
+            "CategoryID": rng.randint(1, 12), "FurnitureType": furniture_type,
+        })
+        flags[product_id] = rng.random() < 0.3
+    return rows, flags, rules
+
+
+def best_of(function, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    rows, flags, rules = build_catalog(product_count)
+    columns = ColumnarCatalog(CatalogCache(lambda: rows, max_rows=product_count))
+    columns.query()
+    attributes = {
+        row["ProductID"]: {rules[row["FurnitureType"]][0]: flags[row["ProductID"]]} for row in rows
+    }
+    vector_rules = {name: (rate, default) for name, (_, rate, default) in rules.items()}
+
+    def objects():
+        totals = defaultdict(float)
+        for product in FurnitureFactory.create_many(rows, attributes):
+            totals[product.category_id] += product.calculate_discount(PERCENTAGE)
+        return totals
+
+    def vectorized():
+        result = columns.discounts(PERCENTAGE, vector_rules, flags)
+        totals = defaultdict(float)
+        for category_id, discount in zip(result["categories"].tolist(), result["discounts"].tolist()):
+            totals[category_id] += discount
+        return totals
+
+    expected, actual = objects(), vectorized()
+    assert all(abs(expected[key] - actual[key]) < 1e-6 * max(1.0, expected[key]) for key in expected)
+
+    print(f"{product_count:,} products")
+    print(f"{'evaluation':<32}{'time (ms)':>12}")
+    for name, function in (("calculate_discount per object", objects), ("column arrays", vectorized)):
+        print(f"{name:<32}{best_of(function) * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Measure hydrating Products rows into Furniture objects.
+
+Usage:
+    python benchmarks/bench_hydration.py [row_count]
+
+Hydrates 1M synthetic rows (no database needed) with the slotted Furniture
+classes, one ``create_furniture`` call per row and then in one
+``create_many`` call, and compares their memory with the same objects
+built from plain ``__dict__`` classes.
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.models.furniture import FurnitureFactory  # noqa: E402
+
+DEFAULT_ROW_COUNT = 1_000_000
+TYPES = ("Chair", "Table", "Sofa", "Bed", "Cabinet")
+
+
+class PlainChair:
+    """A Chair as a plain ``__dict__`` object, for comparison."""
+
+    def __init__(self, name, description, price, dimensions, stock_quantity, category_id, image_url,
+                 max_weight_capacity=100, has_armrests=True, is_adjustable=False):
+        self.name = name
+        self.description = description
+        self.price = price
+        self.dimensions = dimensions
+        self.stock_quantity = stock_quantity
+        self.category_id = category_id
+        self.image_url = image_url
+        self.max_weight_capacity = max_weight_capacity
+        self.has_armrests = has_armrests
+        self.is_adjustable = is_adjustable
+
+
+def build_rows(row_count):
+    return [
+        {
+            "ProductID": i, "Name": "Product", "Description": "Solid wood", "Price": 100.0,
+            "Dimensions": "60x60x100", "StockQuantity": 5, "CategoryID": 1,
+            "ImageURL": "/images/p.jpg", "FurnitureType": TYPES[i % len(TYPES)],
+        }
+        for i in range(row_count)
+    ]
+
+
+def one_by_one(rows):
+    create = FurnitureFactory.create_furniture
+    return [
+        create(row['FurnitureType'], row['Name'], row['Description'], row['Price'], row['Dimensions'],
+               row['StockQuantity'], row['CategoryID'], row['ImageURL'], row)
+        for row in rows
+    ]
+
+
+def plain(rows):
+    return [
+        PlainChair(row['Name'], row['Description'], row['Price'], row['Dimensions'],
+                   row['StockQuantity'], row['CategoryID'], row['ImageURL'])
+        for row in rows
+    ]
+
+
+def measure(build, rows):
+    gc.collect()
+    started = time.perf_counter()
+    objects = build(rows)
+    elapsed = time.perf_counter() - started
+    del objects
+
+    gc.collect()
+    tracemalloc.start()
+    objects = build(rows)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return elapsed, size
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROW_COUNT
+    rows = build_rows(row_count)
+
+    print(f"{row_count:,} rows")
+    print(f"{'hydration':<28}{'time (s)':>10}{'memory (MiB)':>15}")
+    for name, build in (
+        ("create_furniture per row", one_by_one),
+        ("create_many", FurnitureFactory.create_many),
+        ("plain __dict__ objects", plain),
+    ):
+        elapsed, size = measure(build, rows)
+        print(f"{name:<28}{elapsed:>10.2f}{size / 2 ** 20:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
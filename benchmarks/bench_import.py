@@ -0,0 +1,88 @@
+"""Measure importing a product feed into SQLite.
+
+Usage:
+    python benchmarks/bench_import.py [row_count]
+
+Imports a synthetic CSV feed of 20k products (on a temporary file-backed
+SQLite database) once through ``ProductService.import_products`` and once
+with one ``add_product`` call per row, the way ``POST /api/products``
+loads them.
+"""
+import csv
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db import configure, get_connection, get_dialect  # noqa: E402
+from app.services.product_import import read_records  # noqa: E402
+from app.services.product_service import ProductService  # noqa: E402
+
+DEFAULT_ROW_COUNT = 20_000
+TYPES = ("Chair", "Table", "Sofa", "Bed", "Cabinet")
+FIELDS = ("name", "description", "price", "dimensions", "stock_quantity", "category_id",
+          "image_url", "furniture_type", "seats", "has_lock")
+
+
+def build_feed(row_count):
+    feed = io.StringIO()
+    writer = csv.writer(feed)
+    writer.writerow(FIELDS)
+    for i in range(row_count):
+        furniture_type = TYPES[i % len(TYPES)]
+        writer.writerow([
+            f"Product {i}", "Solid wood", 100 + i % 900, "60x60x100", i % 20, 1, "/images/p.jpg",
+            furniture_type, 3 if furniture_type == "Sofa" else "", "true" if furniture_type == "Cabinet" else "",
+        ])
+    return feed.getvalue()
+
+
+def fresh_database(path):
+    if os.path.exists(path):
+        os.remove(path)
+    configure(f"sqlite:///{path}")
+    with get_connection() as connection:
+        get_dialect().bootstrap_schema(connection)
+    with get_connection() as connection:
+        connection.execute("INSERT INTO Categories (Name) VALUES ('Living room')")
+
+
+def bulk(feed):
+    report = ProductService.import_products(read_records(io.StringIO(feed), "csv"))
+    return report["imported"]
+
+
+def one_by_one(feed):
+    count = 0
+    for _, record in read_records(io.StringIO(feed), "csv"):
+        furniture = ProductService.furniture_from_record(record)
+        result = ProductService.add_product(
+            furniture.name, furniture.description, furniture.price, furniture.dimensions,
+            furniture.stock_quantity, furniture.category_id, furniture.image_url,
+            furniture.get_furniture_type(), **furniture.attributes()
+        )
+        count += "⚠️" not in result
+    return count
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROW_COUNT
+    feed = build_feed(row_count)
+    path = os.path.join(tempfile.gettempdir(), "bench_import.db")
+
+    print(f"{row_count:,} products")
+    print(f"{'import':<24}{'time (s)':>10}{'rows/s':>12}")
+    for name, load in (("import_products", bulk), ("add_product per row", one_by_one)):
+        fresh_database(path)
+        started = time.perf_counter()
+        count = load(feed)
+        elapsed = time.perf_counter() - started
+        print(f"{name:<24}{elapsed:>10.2f}{count / elapsed:>12,.0f}")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
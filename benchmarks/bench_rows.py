@@ -0,0 +1,91 @@
+"""Compare dict rows with compact Row objects on a 100k-row read.
+
+Usage:
+    python benchmarks/bench_rows.py [row_count]
+
+Reads the rows from an in-memory SQLite table shaped like Products, so no
+SQL Server is needed, and reports build time, peak memory and JSON
+serialization time for both row formats.
+"""
+import json
+import os
+import sqlite3
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.rows import Row, schema_for  # noqa: E402
+
+DEFAULT_ROW_COUNT = 100_000
+
+
+def build_table(row_count):
+    connection = sqlite3.connect(":memory:")
+    connection.execute("""
+        CREATE TABLE Products (
+            ProductID INTEGER PRIMARY KEY, Name TEXT, Description TEXT, Price REAL,
+            Dimensions TEXT, StockQuantity INTEGER, CategoryID INTEGER,
+            ImageURL TEXT, FurnitureType TEXT, CreatedAt TEXT
+        )
+    """)
+    connection.executemany(
+        "INSERT INTO Products VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (i, f"Product {i}", "Solid wood, hand finished", 100.0 + i % 900, "60x60x100",
+             i % 50, i % 12, f"/images/{i}.jpg", "Chair", "2024-01-01 00:00:00")
+            for i in range(1, row_count + 1)
+        )
+    )
+    return connection
+
+
+def fetch_rows(connection):
+    cursor = connection.execute("SELECT * FROM Products ORDER BY Name")
+    return cursor.description, cursor.fetchall()
+
+
+def as_dicts(description, raw_rows):
+    # Same conversion execute_query does by default
+    columns = [column[0] for column in description]
+    return [dict(zip(columns, row)) for row in raw_rows]
+
+
+def as_compact_rows(description, raw_rows):
+    schema = schema_for(description)
+    return [Row(schema, row) for row in raw_rows]
+
+
+def measure(build, description, raw_rows, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build(description, raw_rows)
+        best = min(best, time.perf_counter() - started)
+
+    # Memory held by the converted rows on top of the raw tuples
+    tracemalloc.start()
+    rows = build(description, raw_rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    json.dumps(rows, default=lambda o: o.to_dict())
+    serialize = time.perf_counter() - started
+    return best, peak, serialize
+
+
+def main():
+    row_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROW_COUNT
+    description, raw_rows = fetch_rows(build_table(row_count))
+
+    print(f"{row_count} rows x {len(description)} columns")
+    print(f"{'format':<10}{'build (ms)':>14}{'memory (MiB)':>16}{'to JSON (ms)':>16}")
+    for name, build in (("dict", as_dicts), ("Row", as_compact_rows)):
+        best, peak, serialize = measure(build, description, raw_rows)
+        print(f"{name:<10}{best * 1000:>14.1f}{peak / 2 ** 20:>16.1f}{serialize * 1000:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
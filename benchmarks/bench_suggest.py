@@ -0,0 +1,59 @@
+"""Time name autocomplete over a synthetic catalog of 1M products.
+
+Usage:
+    python benchmarks/bench_suggest.py [product_count]
+
+Builds the suggestion index from generated names and popularity (no
+database needed) and reports build time, then the median and worst
+latency of top-10 lookups for short and long prefixes.
+"""
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.suggest_index import SuggestIndex  # noqa: E402
+
+DEFAULT_PRODUCT_COUNT = 1_000_000
+ADJECTIVES = ("Oak", "Walnut", "Velvet", "Leather", "Rustic", "Modern", "Compact", "Ergonomic", "Folding", "Vintage")
+NOUNS = ("Chair", "Table", "Sofa", "Bed", "Cabinet", "Stool", "Bench", "Desk", "Wardrobe", "Shelf")
+PREFIXES = ("c", "ch", "cha", "chair", "oak", "oak d", "velv", "ergonomic desk", "w", "zz")
+
+
+def build_rows(product_count):
+    rng = random.Random(42)
+    return [
+        {
+            "ProductID": product_id,
+            "Name": f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {product_id}",
+            "Popularity": rng.randint(0, 10_000),
+        }
+        for product_id in range(1, product_count + 1)
+    ]
+
+
+def main():
+    product_count = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PRODUCT_COUNT
+    rows = build_rows(product_count)
+    index = SuggestIndex(lambda: rows)
+
+    started = time.perf_counter()
+    index.suggest("warm-up")
+    print(f"built index over {product_count:,} products in {time.perf_counter() - started:.1f}s "
+          f"({index.stats()['entries']:,} entries)")
+
+    print(f"{'prefix':<16}{'median':>12}{'worst':>12}")
+    for prefix in PREFIXES:
+        timings = []
+        for _ in range(200):
+            started = time.perf_counter()
+            index.suggest(prefix, 10)
+            timings.append(time.perf_counter() - started)
+        print(f"{prefix!r:<16}{statistics.median(timings) * 1e6:>10.0f}us{max(timings) * 1e6:>10.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,7 @@
-from flask import Flask
-from app.routes import user_routes
-from app.routes import product_routes
-from app.routes import cart_routes
-from app.routes import order_routes
-from app.routes import checkout_routes
+from app import create_app
 
-app = Flask(__name__)
-
-# Register routes
-app.register_blueprint(user_routes, url_prefix='/api')
-app.register_blueprint(product_routes, url_prefix='/api')
-app.register_blueprint(cart_routes, url_prefix='/api')
-app.register_blueprint(order_routes, url_prefix='/api')
-app.register_blueprint(checkout_routes, url_prefix='/api')
+# The same app the tests and the flask CLI build
+app = create_app()
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -82,7 +82,9 @@ class TestCompletePurchaseFlow(unittest.TestCase):
         print("\n2. Testing adding product to cart...")
         with patch('app.services.cart_service.CartService.add_to_cart') as mock_add_to_cart:
             # Mock add to cart service
-            mock_add_to_cart.return_value = "Product added to cart successfully."
+            mock_add_to_cart.return_value = ("Product added to cart successfully.", {
+                "CartID": 1, "UserID": self.test_user["id"], "ProductID": self.test_product["id"], "Quantity": 2
+            })
 
             # Send add to cart request
             add_cart_response = self.client.post('/api/cart', json={
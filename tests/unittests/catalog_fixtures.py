@@ -0,0 +1,39 @@
+import unittest
+from unittest.mock import MagicMock
+from app.models.catalog_events import CatalogSubject
+from app.services.catalog_cache import CatalogCache
+
+
+def product(product_id, name=None, **columns):
+    """A Products row as the catalog loader returns it; ``columns`` override the defaults."""
+    row = {
+        "ProductID": product_id, "Name": name or f"Product {product_id}", "Description": "", "Price": 100,
+        "Dimensions": "50x50x100", "StockQuantity": 5, "CategoryID": 1, "ImageURL": "/images/test.jpg",
+        "FurnitureType": "Chair"
+    }
+    row.update(columns)
+    return row
+
+
+class CatalogTestCase(unittest.TestCase):
+    """A CatalogCache over ``catalog_rows()`` and the observer ``make_index`` builds on it.
+
+    Both are attached to CatalogSubject for the test and detached after.
+    ``self.loader`` is the mocked catalog query, ``self.rows`` its rows.
+    """
+
+    def catalog_rows(self):
+        raise NotImplementedError
+
+    def make_index(self, cache):
+        return None
+
+    def setUp(self):
+        self.rows = self.catalog_rows()
+        self.loader = MagicMock(return_value=self.rows)
+        self.cache = CatalogCache(self.loader)
+        self.index = self.make_index(self.cache)
+        for observer in (self.cache, self.index):
+            if observer is not None:
+                CatalogSubject.attach(observer)
+                self.addCleanup(CatalogSubject.detach, observer)
@@ -5,50 +5,20 @@ from app.models.cart import Cart
 class TestCartModel(unittest.TestCase):
 
     @patch('app.models.cart.execute_query')
-    def test_add_to_cart_new_item(self, mock_execute_query):
-        # Simulate item not in cart
-        mock_execute_query.side_effect = [
-            None,  
-            None   
-        ]
-
-        # Create a basket object and add a new item.
-        cart = Cart(1)
-        cart.add_to_cart(101, 2)
-
-        # Check that execute_query is called twice.
-        self.assertEqual(mock_execute_query.call_count, 2)
-
-        # Verify second call (insert new item)
-        second_call_args = mock_execute_query.call_args_list[1][0]
-        self.assertIn("INSERT INTO Cart", second_call_args[0])
-        self.assertEqual(second_call_args[1][0], 1)  
-        self.assertEqual(second_call_args[1][1], 101)  
-        self.assertEqual(second_call_args[1][2], 2)  
-
-    @patch('app.models.cart.Cart.get_cart_item')
-    @patch('app.models.cart.Cart.update_cart')
-    def test_add_to_cart_existing_item(self, mock_update_cart, mock_get_cart_item):
-        # Simulate the item being in the cart
-        mock_get_cart_item.return_value = {
-            "CartID": 1,
-            "UserID": 1,
-            "ProductID": 101,
-            "Quantity": 3
-        }
-
-        
-        mock_update_cart.return_value = None
+    def test_add_to_cart_is_one_upsert(self, mock_execute_query):
+        mock_execute_query.return_value = [{"CartID": 1, "UserID": 1, "ProductID": 101, "Quantity": 5}]
 
-        # Create a basket object and add an existing item
+        # Create a basket object and add an item.
         cart = Cart(1)
-        cart.add_to_cart(101, 2)
-
-        
-        mock_get_cart_item.assert_called_once_with(101)
+        line = cart.add_to_cart(101, 2)
 
-       
-        mock_update_cart.assert_called_once_with(101, 5)  
+        # A single statement inserts the line or increments it
+        mock_execute_query.assert_called_once()
+        call_args = mock_execute_query.call_args[0]
+        self.assertIn("MERGE INTO Cart", call_args[0])
+        self.assertIn("Quantity = target.Quantity + source.Quantity", call_args[0])
+        self.assertEqual(call_args[1], (1, 101, 2))
+        self.assertEqual(line["Quantity"], 5)
 
     def test_add_to_cart_invalid_quantity(self):
         # Create a basket object
@@ -67,25 +37,20 @@ class TestCartModel(unittest.TestCase):
 
     @patch('app.models.cart.execute_query')
     def test_update_cart_success(self, mock_execute_query):
-        # Simulate sequential results: get_cart_item then update
-        mock_execute_query.side_effect = [
-            [{"CartID": 1, "ProductID": 101, "Quantity": 2}],  # get_cart_item result
-            None 
-        ]
+        mock_execute_query.return_value = [{"CartID": 1, "ProductID": 101, "Quantity": 5}]
 
         # Create the basket object and update the item quantity.
         cart = Cart(1)
-        cart.update_cart(101, 5)
+        line = cart.update_cart(101, 5)
 
-        
-        self.assertEqual(mock_execute_query.call_count, 2)
+        mock_execute_query.assert_called_once()
 
-        # Verify second recall (quantity update)
-        second_call_args = mock_execute_query.call_args_list[1][0]
-        self.assertIn("UPDATE Cart", second_call_args[0])
-        self.assertEqual(second_call_args[1][0], 5)  
-        self.assertEqual(second_call_args[1][1], 1)  
-        self.assertEqual(second_call_args[1][2], 101)  
+        # Verify the quantity update returns the line
+        call_args = mock_execute_query.call_args[0]
+        self.assertIn("UPDATE Cart", call_args[0])
+        self.assertIn("OUTPUT INSERTED.CartID", call_args[0])
+        self.assertEqual(call_args[1], (5, 1, 101))
+        self.assertEqual(line["Quantity"], 5)
 
     def test_update_cart_invalid_quantity(self):
         # Create a basket object
@@ -102,10 +67,10 @@ class TestCartModel(unittest.TestCase):
 
         self.assertIn("Quantity must be greater than 0", str(context.exception))
 
-    @patch('app.models.cart.Cart.get_cart_item')
-    def test_update_cart_item_not_found(self, mock_get_cart_item):
-        # Simulate item not in cart
-        mock_get_cart_item.return_value = None
+    @patch('app.models.cart.execute_query')
+    def test_update_cart_item_not_found(self, mock_execute_query):
+        # Simulate item not in cart: the update matches no row
+        mock_execute_query.return_value = []
 
         
         cart = Cart(1)
@@ -115,33 +80,29 @@ class TestCartModel(unittest.TestCase):
             cart.update_cart(101, 5)
 
         self.assertIn("Product not found in cart", str(context.exception))
-        mock_get_cart_item.assert_called_once_with(101)
+        mock_execute_query.assert_called_once()
 
     @patch('app.models.cart.execute_query')
     def test_remove_from_cart_success(self, mock_execute_query):
-        # Simulate sequential results: get_cart_item then delete
-        mock_execute_query.side_effect = [
-            [{"CartID": 1, "ProductID": 101, "Quantity": 2}],  
-            None  #result delete
-        ]
+        mock_execute_query.return_value = [{"CartID": 1, "ProductID": 101, "Quantity": 2}]
 
         # Create a basket object and remove an item
         cart = Cart(1)
-        cart.remove_from_cart(101)
+        line = cart.remove_from_cart(101)
 
-        # Check execute_query is called twice
-        self.assertEqual(mock_execute_query.call_count, 2)
+        # Check execute_query is called once
+        mock_execute_query.assert_called_once()
 
-        
-        second_call_args = mock_execute_query.call_args_list[1][0]
-        self.assertIn("DELETE FROM Cart", second_call_args[0])
-        self.assertEqual(second_call_args[1][0], 1)  
-        self.assertEqual(second_call_args[1][1], 101)  
+        call_args = mock_execute_query.call_args[0]
+        self.assertIn("DELETE FROM Cart", call_args[0])
+        self.assertIn("OUTPUT DELETED.CartID", call_args[0])
+        self.assertEqual(call_args[1], (1, 101))
+        self.assertEqual(line["Quantity"], 2)
 
-    @patch('app.models.cart.Cart.get_cart_item')
-    def test_remove_from_cart_item_not_found(self, mock_get_cart_item):
-        # Simulate item not in cart
-        mock_get_cart_item.return_value = None
+    @patch('app.models.cart.execute_query')
+    def test_remove_from_cart_item_not_found(self, mock_execute_query):
+        # Simulate item not in cart: the delete matches no row
+        mock_execute_query.return_value = []
 
         
         cart = Cart(1)
@@ -151,7 +112,7 @@ class TestCartModel(unittest.TestCase):
             cart.remove_from_cart(101)
 
         self.assertIn("Product not found in cart", str(context.exception))
-        mock_get_cart_item.assert_called_once_with(101)
+        mock_execute_query.assert_called_once()
 
     @patch('app.models.cart.execute_query')
     def test_clear_cart(self, mock_execute_query):
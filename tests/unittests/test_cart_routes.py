@@ -17,7 +17,7 @@ class TestCartRoutes(unittest.TestCase):
     @patch('app.services.cart_service.CartService.add_to_cart')
     def test_add_to_cart_success(self, mock_add):
         # Mock successful addition
-        mock_add.return_value = "Product added to cart successfully."
+        mock_add.return_value = ("Product added to cart successfully.", {"CartID": 1, "UserID": 1, "ProductID": 101, "Quantity": 5})
 
         # Test data
         data = {
@@ -32,11 +32,13 @@ class TestCartRoutes(unittest.TestCase):
         # Verify results
         self.assertEqual(response.status_code, 201)
         self.assertIn(b"Product added to cart successfully", response.data)
+        # The quantity the line holds after the upsert
+        self.assertEqual(response.json["item"]["Quantity"], 5)
 
     @patch('app.services.cart_service.CartService.add_to_cart')
     def test_add_to_cart_invalid_data(self, mock_add):
         # Mock invalid data
-        mock_add.return_value = "⚠️ Invalid product data."
+        mock_add.return_value = ("⚠️ Invalid product data.", None)
 
         # Incomplete data (missing product_id)
         data = {
@@ -53,7 +55,7 @@ class TestCartRoutes(unittest.TestCase):
     @patch('app.services.cart_service.CartService.update_cart')
     def test_update_cart_success(self, mock_update):
         # Mock successful update
-        mock_update.return_value = "Cart updated successfully."
+        mock_update.return_value = ("Cart updated successfully.", {"CartID": 1, "UserID": 1, "ProductID": 101, "Quantity": 5})
 
         data = {
             "user_id": 1,
@@ -63,6 +65,7 @@ class TestCartRoutes(unittest.TestCase):
         response = self.client.put('/api/cart/101', json=data)
         self.assertEqual(response.status_code, 200)
         self.assertIn(b"Cart updated successfully", response.data)
+        self.assertEqual(response.json["item"]["Quantity"], 5)
 
     def test_update_cart_invalid_quantity(self):
         # Test invalid quantity (negative)
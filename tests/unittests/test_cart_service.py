@@ -10,9 +10,17 @@ class TestCartService(unittest.TestCase):
     @patch('app.services.cart_service.Cart.add_to_cart')
     def test_add_to_cart(self, mock_add_to_cart):
         # Test successful addition
-        mock_add_to_cart.return_value = None
-        result = CartService.add_to_cart(user_id=1, product_id=1, quantity=2)
+        mock_add_to_cart.return_value = {"ProductID": 1, "Quantity": 5}
+        result, line = CartService.add_to_cart(user_id=1, product_id=1, quantity=2)
         self.assertEqual(result, "Product added to cart successfully.")
+        self.assertEqual(line["Quantity"], 5)
+
+    @patch('app.services.cart_service.Cart.add_to_cart')
+    def test_add_to_cart_database_error(self, mock_add_to_cart):
+        mock_add_to_cart.return_value = None
+        result, line = CartService.add_to_cart(user_id=1, product_id=1, quantity=2)
+        self.assertIn("⚠️", result)
+        self.assertIsNone(line)
 
     def test_add_to_cart_invalid_quantity(self):
         # Test negative quantity
@@ -25,9 +33,10 @@ class TestCartService(unittest.TestCase):
     @patch('app.services.cart_service.Cart.update_cart')
     def test_update_cart(self, mock_update_cart):
         # Test successful update
-        mock_update_cart.return_value = None
-        result = CartService.update_cart(user_id=1, product_id=1, new_quantity=3)
+        mock_update_cart.return_value = {"ProductID": 1, "Quantity": 3}
+        result, line = CartService.update_cart(user_id=1, product_id=1, new_quantity=3)
         self.assertEqual(result, "Cart updated successfully.")
+        self.assertEqual(line["Quantity"], 3)
 
     def test_update_cart_invalid_quantity(self):
         # Test negative quantity
@@ -37,19 +46,17 @@ class TestCartService(unittest.TestCase):
         with self.assertRaises(ValueError):
             CartService.update_cart(user_id=1, product_id=1, new_quantity=-1)
 
-    @patch('app.services.cart_service.Cart.get_cart_item')
     @patch('app.services.cart_service.Cart.remove_from_cart')
-    def test_remove_from_cart(self, mock_remove_from_cart, mock_get_cart_item):
+    def test_remove_from_cart(self, mock_remove_from_cart):
         # Test successful removal
-        mock_get_cart_item.return_value = {"ProductID": 1, "Quantity": 2}
-        mock_remove_from_cart.return_value = None
+        mock_remove_from_cart.return_value = {"ProductID": 1, "Quantity": 2}
         result = CartService.remove_from_cart(user_id=1, product_id=1)
         self.assertEqual(result, "Product removed from cart successfully.")
 
-    @patch('app.services.cart_service.Cart.get_cart_item')
-    def test_remove_from_cart_not_found(self, mock_get_cart_item):
+    @patch('app.services.cart_service.Cart.remove_from_cart')
+    def test_remove_from_cart_not_found(self, mock_remove_from_cart):
         # Test product not found in cart
-        mock_get_cart_item.return_value = None
+        mock_remove_from_cart.side_effect = ValueError("⚠️ Product not found in cart.")
         with self.assertRaises(ValueError) as context:
             CartService.remove_from_cart(user_id=1, product_id=999)
         self.assertTrue("Product not found in cart" in str(context.exception))
@@ -0,0 +1,168 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from app.db import transaction
+from app.models.catalog_events import CatalogSubject
+from app.models.furniture import Furniture
+from app.services.catalog_cache import CatalogCache
+from catalog_fixtures import CatalogTestCase, product
+
+
+class TestCatalogCache(CatalogTestCase):
+
+    def catalog_rows(self):
+        return [
+            product(1, "Stool", StockQuantity=10),
+            product(2, "armchair", StockQuantity=10),
+            product(3, "Dining Table", StockQuantity=10, CategoryID=2, FurnitureType="Table"),
+        ]
+
+    def test_loads_once_and_counts_hits(self):
+        names = [row["Name"] for row in self.cache.all()]
+        self.cache.all()
+
+        # Case-insensitive name order, like ORDER BY Name
+        self.assertEqual(names, ["armchair", "Dining Table", "Stool"])
+        self.loader.assert_called_once()
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["size"], 3)
+
+    def test_indexes_by_category_and_type(self):
+        self.assertEqual([row["ProductID"] for row in self.cache.by_category(1)], [2, 1])
+        self.assertEqual([row["ProductID"] for row in self.cache.by_type("Table")], [3])
+        self.assertEqual(self.cache.by_type("Bed"), [])
+        self.loader.assert_called_once()
+
+    def test_get_product_needs_hydrated_copy(self):
+        self.cache.all()
+
+        # Snapshot rows lack the type-specific attributes
+        self.assertIsNone(self.cache.get_product(1))
+        self.cache.put_product(1, Furniture.from_row(self.rows[0], {"is_adjustable": True}))
+
+        chair = self.cache.get_product(1)
+        self.assertEqual(chair.name, "Stool")
+        self.assertTrue(chair.is_adjustable)
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_changes_drop_hydrated_copy(self):
+        self.cache.put_product(1, Furniture.from_row(self.rows[0]))
+
+        CatalogSubject.notify(CatalogSubject.UPDATED, 1, {"Price": 90})
+
+        self.assertIsNone(self.cache.get_product(1))
+
+    def test_stock_adjustment_patches_row(self):
+        self.cache.all()
+        version = self.cache.version
+
+        CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, 1, {"Quantity": 3})
+
+        self.assertEqual(self.cache.products([1])[0]["StockQuantity"], 7)
+        self.assertGreater(self.cache.version, version)
+        self.loader.assert_called_once()
+
+    def test_update_moves_product_between_views(self):
+        self.cache.by_category(1)
+        changes = dict(product(1, "Stool"), CategoryID=2)
+        del changes["ProductID"]
+
+        CatalogSubject.notify(CatalogSubject.UPDATED, 1, changes)
+
+        self.assertEqual([row["ProductID"] for row in self.cache.by_category(1)], [2])
+        self.assertEqual([row["ProductID"] for row in self.cache.by_category(2)], [3, 1])
+
+    def test_delete_and_add(self):
+        self.cache.all()
+
+        CatalogSubject.notify(CatalogSubject.DELETED, 2)
+        self.assertEqual([row["ProductID"] for row in self.cache.all()], [3, 1])
+
+        # New products are added to the snapshot...
+        CatalogSubject.notify(CatalogSubject.ADDED, 4, product(4, "Bed", FurnitureType="Bed"))
+        self.assertEqual([row["ProductID"] for row in self.cache.by_type("Bed")], [4])
+
+        # ...unless their id is unknown, then it is reloaded
+        CatalogSubject.notify(CatalogSubject.ADDED, changes=product(None, "Cot"))
+        self.cache.all()
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_category_counts_follow_writes(self):
+        self.assertEqual(self.cache.category_counts(), {1: 2, 2: 1})
+
+        CatalogSubject.notify(CatalogSubject.UPDATED, 1, {"CategoryID": 2})
+        CatalogSubject.notify(CatalogSubject.DELETED, 2)
+
+        self.assertEqual(self.cache.category_counts(), {2: 2})
+        self.loader.assert_called_once()
+
+    def test_catalog_over_max_rows_is_not_kept(self):
+        cache = CatalogCache(self.loader, max_rows=2)
+
+        self.assertIsNone(cache.all())
+        self.assertIsNone(cache.by_type("Chair"))
+
+        # Not retried until the TTL runs out
+        self.loader.assert_called_once()
+
+    def test_single_products_are_evicted_least_recently_used(self):
+        cache = CatalogCache(self.loader, max_products=2)
+        for product_id in (1, 2, 3):
+            cache.put_product(product_id, MagicMock())
+
+        self.assertIsNone(cache.get_product(1))
+        self.assertIsNotNone(cache.get_product(3))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_views_are_evicted_least_recently_used(self):
+        cache = CatalogCache(self.loader, max_views=1)
+        cache.by_category(1)
+        cache.by_category(2)
+
+        self.assertEqual(cache.stats()["views"], 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    @patch('app.models.furniture.execute_query')
+    def test_rolled_back_write_leaves_cache_alone(self, mock_execute_query):
+        self.cache.all()
+
+        with self.assertRaises(ValueError):
+            with transaction():
+                Furniture.update_stock(1, 5)
+                raise ValueError("⚠️ Payment declined.")
+
+        self.assertEqual(self.cache.products([1])[0]["StockQuantity"], 10)
+
+    @patch('app.models.furniture.execute_query')
+    def test_committed_write_patches_cache(self, mock_execute_query):
+        self.cache.all()
+
+        Furniture.update_stock(1, 5)
+
+        self.assertEqual(self.cache.products([1])[0]["StockQuantity"], 5)
+
+    @patch('app.models.category.execute_query')
+    def test_category_write_moves_the_tag_only(self, mock_execute_query):
+        from app.models.category import Category
+        self.cache.all()
+        tag = self.cache.tag()
+
+        Category("Outdoor", "Garden furniture").add_category()
+
+        self.assertNotEqual(self.cache.tag(), tag)
+        self.assertEqual(len(self.cache.all()), 3)
+        self.loader.assert_called_once()
+
+    def test_tag_moves_on_after_ttl(self):
+        tag = self.cache.tag()
+        self.assertEqual(self.cache.tag(), tag)
+
+        with patch('app.services.catalog_cache.time.monotonic', return_value=10 ** 9):
+            self.assertNotEqual(self.cache.tag(), tag)
+
+    def test_tags_differ_between_caches(self):
+        self.assertNotEqual(self.cache.tag(), CatalogCache(self.loader).tag())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -148,5 +148,24 @@ class TestCategoryModel(unittest.TestCase):
         # Verify the result
         self.assertEqual(categories, [])
 
+    @patch('app.models.category.execute_query')
+    @patch('app.models.category.execute_many')
+    def test_add_categories(self, mock_execute_many, mock_execute_query):
+        mock_execute_many.return_value = 2
+
+        categories = [Category("Chairs", "All chairs"), Category("Tables", "All tables")]
+        count = Category.add_categories(categories)
+
+        # All categories go through a single batched insert
+        mock_execute_many.assert_called_once()
+        call_args = mock_execute_many.call_args[0]
+        self.assertIn("INSERT INTO Categories", call_args[0])
+        self.assertEqual(list(call_args[1]), [("Chairs", "All chairs"), ("Tables", "All tables")])
+        self.assertEqual(count, 2)
+
+        # One more statement gives them all their closure self rows
+        mock_execute_query.assert_called_once()
+        self.assertIn("INSERT INTO CategoryClosure", mock_execute_query.call_args[0][0])
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,170 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from app import create_app
+from app.db import connection, configure, get_connection
+from app.models.catalog_events import CatalogSubject
+from app.models.category import Category
+from app.models.furniture import Chair
+from app.services.category_service import CategoryService, category_tree
+from app.services.product_service import catalog_cache
+from app.services.category_tree import CategoryTree
+
+
+def category(category_id, name, parent_id=None):
+    return {"CategoryID": category_id, "Name": name, "Description": "Test", "ParentID": parent_id}
+
+
+class TestCategoryTree(unittest.TestCase):
+
+    def setUp(self):
+        # In name order, as the loader returns them
+        self.rows = [
+            category(2, "Chairs", 1),
+            category(1, "Furniture"),
+            category(4, "Garden"),
+            category(3, "Stools", 2),
+        ]
+        self.loader = MagicMock(return_value=self.rows)
+        self.catalog_cache = MagicMock()
+        self.catalog_cache.category_counts.return_value = {1: 1, 2: 2, 3: 4}
+        self.count_loader = MagicMock(return_value=[{"CategoryID": 4, "ProductCount": 5}])
+        self.tree = CategoryTree(self.loader, self.catalog_cache, self.count_loader)
+        CatalogSubject.attach(self.tree)
+
+    def tearDown(self):
+        CatalogSubject.detach(self.tree)
+
+    def test_nests_children_with_subtree_counts(self):
+        roots = self.tree.tree()
+
+        self.assertEqual([node["Name"] for node in roots], ["Furniture", "Garden"])
+        furniture = roots[0]
+        self.assertEqual(furniture["ProductCount"], 1)
+        self.assertEqual(furniture["SubtreeProductCount"], 7)
+        self.assertEqual(furniture["Children"][0]["Children"][0]["Name"], "Stools")
+        self.assertEqual(roots[1]["SubtreeProductCount"], 0)
+
+    def test_loads_once_until_a_category_changes(self):
+        self.tree.tree()
+        self.tree.subtree_ids(1)
+        self.loader.assert_called_once()
+
+        CatalogSubject.notify(CatalogSubject.CATEGORY_CHANGED)
+        self.tree.tree()
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_subtree_ids(self):
+        self.assertEqual(self.tree.subtree_ids(1), [1, 2, 3])
+        self.assertEqual(self.tree.subtree_ids(4), [4])
+        self.assertIsNone(self.tree.subtree_ids(99))
+
+    def test_counts_are_queried_when_the_catalog_is_not_cached(self):
+        self.catalog_cache.category_counts.return_value = None
+
+        self.assertEqual(self.tree.tree()[1]["ProductCount"], 5)
+
+        # New products are counted in place...
+        CatalogSubject.notify(CatalogSubject.ADDED, 10, {"CategoryID": 4})
+        self.assertEqual(self.tree.tree()[1]["ProductCount"], 6)
+        self.count_loader.assert_called_once()
+
+        # ...other product writes reload the counts
+        CatalogSubject.notify(CatalogSubject.DELETED, 10)
+        self.tree.tree()
+        self.assertEqual(self.count_loader.call_count, 2)
+
+    def test_database_error(self):
+        self.loader.return_value = None
+        self.assertIsNone(self.tree.tree())
+        self.assertIsNone(self.tree.subtree_ids(1))
+
+
+class TestCategoryService(unittest.TestCase):
+    """Subtree reads against an in-memory SQLite database."""
+
+    def setUp(self):
+        self.dialect = configure("sqlite://")
+        with get_connection() as conn:
+            self.dialect.bootstrap_schema(conn)
+        catalog_cache.clear()
+        category_tree.clear()
+
+        self.furniture_id = Category("Furniture", "All").add_category()
+        self.chairs_id = Category("Chairs", "Seating", self.furniture_id).add_category()
+        self.garden_id = Category("Garden", "Outdoor").add_category()
+        for name, category_id in (("Sofa Table", self.furniture_id), ("Armchair", self.chairs_id),
+                                  ("Deck Chair", self.garden_id)):
+            Chair(name, "Test", 100.0, "60x60x100", 1, category_id, "/c.jpg", True, False, 100).add_furniture()
+
+    def tearDown(self):
+        configure(connection.DATABASE_URL)
+        catalog_cache.clear()
+        category_tree.clear()
+
+    def products_in(self, category_id):
+        return [row['Name'] for row in CategoryService.get_products_in_category(category_id)]
+
+    def test_products_of_the_whole_subtree(self):
+        self.assertEqual(self.products_in(self.furniture_id), ["Armchair", "Sofa Table"])
+        self.assertEqual(self.products_in(self.chairs_id), ["Armchair"])
+        self.assertIsNone(CategoryService.get_products_in_category(999))
+
+    @patch('app.services.category_service.catalog_cache.ensure_loaded', return_value=False)
+    def test_closure_query_without_the_catalog_cache(self, mock_ensure_loaded):
+        self.assertEqual(self.products_in(self.furniture_id), ["Armchair", "Sofa Table"])
+
+    def test_move_carries_the_subtree(self):
+        message = CategoryService.update_category(self.chairs_id, "Chairs", "Seating", self.garden_id)
+
+        self.assertNotIn("⚠️", message)
+        self.assertEqual(self.products_in(self.garden_id), ["Armchair", "Deck Chair"])
+        self.assertEqual(self.products_in(self.furniture_id), ["Sofa Table"])
+
+    def test_move_under_own_subcategory_is_refused(self):
+        message = CategoryService.update_category(self.furniture_id, "Furniture", "All", self.chairs_id)
+        self.assertIn("⚠️", message)
+
+    def test_unknown_parent(self):
+        self.assertIn("not found", CategoryService.add_category("Lamps", "Light", 999))
+
+
+class TestCategoryRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    @patch('app.services.category_service.CategoryService.get_category_tree')
+    def test_get_categories(self, mock_get_tree):
+        mock_get_tree.return_value = [dict(category(1, "Furniture"), ProductCount=2, SubtreeProductCount=2, Children=[])]
+
+        response = self.client.get('/api/categories')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["categories"][0]["SubtreeProductCount"], 2)
+
+    @patch('app.services.category_service.CategoryService.get_products_in_category')
+    def test_unknown_category_products(self, mock_get_products):
+        mock_get_products.return_value = None
+
+        response = self.client.get('/api/categories/9/products')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_add_category_needs_a_name(self):
+        response = self.client.post('/api/categories', json={"description": "Nameless"})
+        self.assertEqual(response.status_code, 400)
+
+    @patch('app.services.category_service.CategoryService.get_category_tree')
+    def test_served_by_main_app(self, mock_get_tree):
+        from main import app
+        mock_get_tree.return_value = []
+
+        response = app.test_client().get('/api/categories')
+
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
 from app import create_app
+from app.db import connection, configure, get_connection
+from app.models.user import User
 
 class TestCheckoutRoutes(unittest.TestCase):
 
@@ -38,5 +40,34 @@ class TestCheckoutRoutes(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn("Payment processed successfully", response.get_json().get("message", ""))
 
+class TestEmptyCartCheckout(unittest.TestCase):
+    """Checkout of an empty cart against an in-memory SQLite database."""
+
+    def setUp(self):
+        self.dialect = configure("sqlite://")
+        with get_connection() as conn:
+            self.dialect.bootstrap_schema(conn)
+        User("Jane", "jane@example.com", "secret").add_user()
+        self.user_id = User.get_user_by_email("jane@example.com")['UserID']
+
+        app = create_app()
+        app.testing = True
+        self.client = app.test_client()
+
+    def tearDown(self):
+        configure(connection.DATABASE_URL)
+
+    def test_checkout_empty_cart(self):
+        response = self.client.post('/api/checkout', json={"user_id": self.user_id})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("No items in the cart", response.get_json()["message"])
+
+    def test_create_order_empty_cart(self):
+        response = self.client.post('/api/orders', json={"user_id": self.user_id})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("No items in the cart", response.get_json()["message"])
+
 if __name__ == '__main__':
     unittest.main()
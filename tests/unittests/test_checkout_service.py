@@ -5,30 +5,34 @@ from unittest.mock import patch
 
 class TestCheckoutService(unittest.TestCase):
 
-    @patch('app.services.checkout_service.CartService.get_cart_items')
-    @patch('app.services.checkout_service.Order.add_order')
-    @patch('app.services.checkout_service.OrderItem.add_order_item')
-    @patch('app.services.checkout_service.CartService.clear_cart')
-    def test_checkout_success(self, mock_clear_cart, mock_add_order_item, mock_add_order, mock_get_cart_items):
-        # 1️⃣ Mock cart data
-        mock_get_cart_items.return_value = [
-            {"ProductID": 1, "Quantity": 2, "Price": 100},
-            {"ProductID": 2, "Quantity": 1, "Price": 200}
-        ]
-
-        # 2️⃣ Mock order creation
-        mock_add_order.return_value = 1
-
-        # 3️⃣ Mock adding order items
-        mock_add_order_item.return_value = None
+    @patch('app.services.checkout_service.Order.create_from_cart')
+    @patch('app.services.checkout_service.OrderSubject.notify')
+    def test_checkout_success(self, mock_notify, mock_create_from_cart):
+        # 1️⃣ Mock the order created from the cart in one transaction
+        mock_create_from_cart.return_value = {"OrderID": 1, "TotalAmount": 400}
 
-        # 4️⃣ Mock clearing the cart after purchase
-        mock_clear_cart.return_value = None
+        # 2️⃣ Mock sending notifications
+        mock_notify.return_value = None
 
         # ✅ Execute the checkout process and verify the result
         result = CheckoutService.checkout(user_id=1)
         self.assertEqual(result, "✅ Checkout completed successfully. Total amount: 400.")
 
+        # Stock is left to the InventoryUpdate observer
+        mock_create_from_cart.assert_called_once_with(1, "pending", update_stock=False)
+        mock_notify.assert_called_once_with(1, 1, 400, "pending")
+
+    @patch('app.services.checkout_service.Order.create_from_cart')
+    @patch('app.services.checkout_service.OrderSubject.notify')
+    def test_checkout_empty_cart(self, mock_notify, mock_create_from_cart):
+        # Mock an empty cart
+        mock_create_from_cart.side_effect = ValueError("⚠️ No items in the cart.")
+
+        result = CheckoutService.checkout(user_id=1)
+
+        self.assertEqual(result, "⚠️ No items in the cart.")
+        mock_notify.assert_not_called()
+
     @patch('app.services.checkout_service.OrderSubject.notify')
     def test_notify_observers(self, mock_notify):
         # Mock sending notifications
@@ -0,0 +1,91 @@
+import unittest
+from app.models.catalog_events import CatalogSubject
+from app.services.catalog_cache import CatalogCache
+from app.services.columnar_catalog import ColumnarCatalog
+from catalog_fixtures import CatalogTestCase, product
+
+
+class TestColumnarCatalog(CatalogTestCase):
+
+    def catalog_rows(self):
+        return [
+            product(1, CategoryID=1, FurnitureType="Sofa", Price=899),
+            product(2, CategoryID=1, FurnitureType="Sofa", Price=450, StockQuantity=0),
+            product(3, CategoryID=2, FurnitureType="Sofa", Price=650),
+            product(4, CategoryID=2, FurnitureType="Chair", Price=120),
+            product(5, CategoryID=None, FurnitureType="Sofa", Price=650, StockQuantity=12),
+            product(6, CategoryID=3, FurnitureType="Bed", Price=1500, StockQuantity=1),
+        ]
+
+    def make_index(self, cache):
+        return ColumnarCatalog(cache)
+
+    def setUp(self):
+        super().setUp()
+        self.columns = self.index
+
+    def test_filters(self):
+        self.assertEqual(sorted(self.columns.query()), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(sorted(self.columns.query(category_id=2)), [3, 4])
+        self.assertEqual(sorted(self.columns.query(furniture_type="Sofa", in_stock=True)), [1, 3, 5])
+        self.assertEqual(sorted(self.columns.query(min_price=500, max_price=900)), [1, 3, 5])
+        self.assertEqual(self.columns.query(in_stock=False), [2])
+        self.assertEqual(self.columns.query(furniture_type="Wardrobe"), [])
+        self.assertEqual(sorted(self.columns.query(ids=[4, 6, 99], max_price=1000)), [4])
+
+    def test_sorts_and_top_k(self):
+        # Cheapest in-stock sofas, ties broken by product id
+        self.assertEqual(self.columns.query(furniture_type="Sofa", in_stock=True, sort="price", limit=2), [3, 5])
+        self.assertEqual(self.columns.query(sort="-price"), [6, 1, 3, 5, 2, 4])
+        self.assertEqual(self.columns.query(sort="-stock", limit=1), [5])
+        self.assertEqual(self.columns.query(sort="id", limit=10), [1, 2, 3, 4, 5, 6])
+
+    def test_unknown_sort(self):
+        with self.assertRaises(ValueError):
+            self.columns.query(sort="name")
+
+    def test_incremental_updates(self):
+        self.columns.query()
+
+        for product_id in range(7, 30):
+            CatalogSubject.notify(
+                CatalogSubject.ADDED, product_id,
+                product(product_id, CategoryID=4, FurnitureType="Stool", Price=product_id)
+            )
+        CatalogSubject.notify(CatalogSubject.UPDATED, 1, {"Price": 99})
+        CatalogSubject.notify(CatalogSubject.DELETED, 3)
+        CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, 5, {"Quantity": 12})
+
+        self.assertEqual(self.columns.query(furniture_type="Sofa", sort="price"), [1, 2, 5])
+        self.assertEqual(self.columns.query(furniture_type="Sofa", in_stock=True), [1])
+        self.assertEqual(self.columns.query(category_id=4, sort="-price", limit=2), [29, 28])
+        self.assertEqual(self.columns.stats()["products"], 28)
+        self.loader.assert_called_once()
+
+    def test_discounts(self):
+        # 10% off; convertible sofas get 7% more, and product 5 is one
+        columns = self.columns.discounts(10, {"Sofa": (0.07, False), "Chair": (0.05, True)}, {5: True, 4: False})
+
+        discounts = dict(zip(columns["ids"].tolist(), columns["discounts"].round(2).tolist()))
+        self.assertEqual(discounts, {1: 89.9, 2: 45.0, 3: 65.0, 4: 12.0, 5: 110.5, 6: 150.0})
+
+        # Chairs default to flagged when nothing is stored
+        columns = self.columns.discounts(10, {"Chair": (0.05, True)}, {}, category_id=2, furniture_type="Chair")
+        self.assertEqual(columns["discounts"].round(2).tolist(), [18.0])
+
+    def test_rebuilds_when_cache_reloads(self):
+        self.columns.query()
+        self.loader.return_value = [product(9, CategoryID=1, FurnitureType="Desk", Price=10)]
+
+        self.cache.invalidate()
+
+        self.assertEqual(self.columns.query(), [9])
+
+    def test_not_cached(self):
+        columns = ColumnarCatalog(CatalogCache(self.loader, max_rows=1))
+
+        self.assertIsNone(columns.query(sort="price"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+from app.db.pool import ConnectionPool, PoolTimeout
+
+
+class TestConnectionPool(unittest.TestCase):
+
+    def setUp(self):
+        # Every call to connect() returns a fresh fake connection
+        self.connect = MagicMock(side_effect=lambda: MagicMock())
+
+    def test_reuses_released_connection(self):
+        pool = ConnectionPool(self.connect, min_size=0, max_size=2)
+
+        first = pool.acquire()
+        raw = first._connection
+        first.close()
+        second = pool.acquire()
+
+        # Only one physical connection should have been opened
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertIs(second._connection, raw)
+
+    def test_context_manager_commits_and_releases(self):
+        pool = ConnectionPool(self.connect, max_size=1)
+
+        with pool.acquire() as connection:
+            raw = connection._connection
+
+        raw.commit.assert_called_once()
+        self.assertEqual(pool.stats()["idle"], 1)
+        self.assertEqual(pool.stats()["in_use"], 0)
+
+    def test_context_manager_rolls_back_on_error(self):
+        pool = ConnectionPool(self.connect, max_size=1)
+
+        with self.assertRaises(RuntimeError):
+            with pool.acquire() as connection:
+                raw = connection._connection
+                raise RuntimeError("boom")
+
+        raw.rollback.assert_called_once()
+        raw.commit.assert_not_called()
+        self.assertEqual(pool.stats()["idle"], 1)
+
+    def test_max_size_times_out(self):
+        pool = ConnectionPool(self.connect, max_size=1, wait_timeout=0.05)
+        pool.acquire()
+
+        # The only connection is checked out, so the second caller times out
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+        stats = pool.stats()
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(self.connect.call_count, 1)
+
+    def test_waiter_gets_released_connection(self):
+        pool = ConnectionPool(self.connect, max_size=1, wait_timeout=5)
+        held = pool.acquire()
+        acquired = []
+
+        waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()))
+        waiter.start()
+        held.close()
+        waiter.join(timeout=5)
+
+        self.assertEqual(len(acquired), 1)
+        self.assertEqual(self.connect.call_count, 1)
+        self.assertGreater(pool.stats()["total_wait_time"], 0)
+
+    def test_unhealthy_connection_is_replaced(self):
+        pool = ConnectionPool(self.connect, max_size=1, ping_interval=0)
+
+        first = pool.acquire()
+        broken = first._connection
+        first.close()
+
+        # The ping query fails on the idle connection
+        broken.cursor.return_value.execute.side_effect = Exception("link failure")
+        second = pool.acquire()
+
+        self.assertIsNot(second._connection, broken)
+        broken.close.assert_called_once()
+        self.assertEqual(self.connect.call_count, 2)
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+    @patch('app.db.pool.time.monotonic')
+    def test_prune_closes_idle_connections_above_min_size(self, mock_monotonic):
+        mock_monotonic.return_value = 100.0
+        pool = ConnectionPool(self.connect, min_size=1, max_size=3, idle_timeout=10)
+
+        connections = [pool.acquire(), pool.acquire(), pool.acquire()]
+        for connection in connections:
+            connection.close()
+
+        # Past the idle timeout, everything except min_size is closed
+        mock_monotonic.return_value = 200.0
+        self.assertEqual(pool.prune(), 2)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_connect_failure_frees_slot(self):
+        connect = MagicMock(side_effect=[Exception("server down"), MagicMock()])
+        pool = ConnectionPool(connect, max_size=1, wait_timeout=0.05)
+
+        with self.assertRaises(Exception):
+            pool.acquire()
+
+        # The reserved slot was given back, so a retry can connect
+        pool.acquire()
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_invalid_sizes(self):
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.connect, min_size=5, max_size=2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+import unittest
+from app.db import connection, configure, execute_query, get_connection
+from app.db.dialects import SqlServerDialect, SqliteDialect, dialect_from_url
+from app.models.cart import Cart
+from app.models.category import Category
+from app.models.furniture import Chair, Furniture, FurnitureFactory, Sofa, Table
+from app.models.order import Order
+from app.models.user import User
+
+
+class TestDialectFromUrl(unittest.TestCase):
+
+    def test_defaults_to_sql_server(self):
+        dialect = dialect_from_url(None, "Driver=x;")
+        self.assertIsInstance(dialect, SqlServerDialect)
+        self.assertEqual(dialect.conn_str, "Driver=x;")
+
+    def test_sqlite_urls(self):
+        self.assertEqual(dialect_from_url("sqlite://", "").path, ":memory:")
+        self.assertEqual(dialect_from_url("sqlite:///:memory:", "").path, ":memory:")
+        self.assertEqual(dialect_from_url("sqlite:///store.db", "").path, "store.db")
+        self.assertEqual(dialect_from_url("sqlite:////tmp/store.db", "").path, "/tmp/store.db")
+
+    def test_unsupported_url(self):
+        with self.assertRaises(ValueError):
+            dialect_from_url("postgresql://localhost/store", "")
+
+    def test_sql_server_fragments(self):
+        dialect = SqlServerDialect("")
+        self.assertEqual(dialect.output_inserted("OrderID"), "OUTPUT INSERTED.OrderID")
+        self.assertEqual(dialect.returning("OrderID"), "")
+        self.assertEqual(dialect.add_hours(24), "DATEADD(hour, 24, GETDATE())")
+
+    def test_sql_server_insert_many_numbers_the_source_rows(self):
+        query = SqlServerDialect("").insert_many("Products", ("Name", "Price"), 2, ("ProductID",), {"CreatedAt": "GETDATE()"})
+        self.assertIn("USING (VALUES (0, ?, ?), (1, ?, ?)) AS source (InsertOrder, Name, Price)", query)
+        self.assertIn("INSERT (Name, Price, CreatedAt) VALUES (source.Name, source.Price, GETDATE())", query)
+        self.assertIn("OUTPUT source.InsertOrder, INSERTED.ProductID", query)
+
+    def test_sql_server_upsert_increment_holds_the_key_range(self):
+        query = SqlServerDialect("").upsert_increment("Cart", ("UserID", "ProductID"), "Quantity", ("Quantity",))
+        self.assertIn("MERGE INTO Cart WITH (HOLDLOCK) AS target", query)
+        self.assertIn("ON target.UserID = source.UserID AND target.ProductID = source.ProductID", query)
+        self.assertIn("OUTPUT INSERTED.Quantity;", query)
+
+
+class TestSqliteBackend(unittest.TestCase):
+    """Run the real model queries against an in-memory SQLite database."""
+
+    def setUp(self):
+        self.dialect = configure("sqlite://")
+        with get_connection() as conn:
+            self.dialect.bootstrap_schema(conn)
+
+        User("Jane", "jane@example.com", "secret").add_user()
+        self.user_id = User.get_user_by_email("jane@example.com")['UserID']
+        Chair("Desk Chair", "Mesh", 100.0, "60x60x100", 10, None, "/c.jpg", True, True, 120).add_furniture()
+        self.product_id = execute_query("SELECT ProductID FROM Products", fetch=True)[0]['ProductID']
+
+    def tearDown(self):
+        configure(connection.DATABASE_URL)
+
+    def test_memory_database_is_shared_by_pooled_connections(self):
+        self.assertIsInstance(self.dialect, SqliteDialect)
+        first = self.dialect.connect()
+        second = self.dialect.connect()
+        self.assertEqual(first.execute("SELECT COUNT(*) FROM Products").fetchone()[0], 1)
+        self.assertEqual(second.execute("SELECT COUNT(*) FROM Users").fetchone()[0], 1)
+
+    def test_add_furniture_returns_id(self):
+        table = Table("Desk", "Oak", 300.0, "120x60x75", 2, None, "/t.jpg", "Rectangle", 80, False)
+
+        product_id = table.add_furniture()
+
+        self.assertEqual(product_id, self.product_id + 1)
+        self.assertEqual(Furniture.get_furniture_by_id(product_id).name, "Desk")
+
+    def test_attributes_round_trip(self):
+        Sofa("Corner Sofa", "Grey", 900.0, "250x180x85", 1, None, "/s.jpg", 5, True, False).add_furniture()
+        sofa_id = Sofa("Loveseat", "Blue", 400.0, "150x90x85", 1, None, "/l.jpg", 2, True, True).add_furniture()
+        Table("Desk", "Oak", 300.0, "120x60x75", 2, None, "/t.jpg", "Round", 80, False).update_furniture(self.product_id)
+
+        self.assertEqual(Furniture.get_furniture_by_id(sofa_id).seats, 2)
+        self.assertEqual(Furniture.get_furniture_by_id(self.product_id).shape, "Round")
+        self.assertEqual(Furniture.find_ids_by_attributes([("seats", ">=", 3), ("is_convertible", "=", True)]), [sofa_id - 1])
+        self.assertEqual(Furniture.find_ids_by_attributes([("shape", "=", "Round")]), [self.product_id])
+
+        Furniture.delete_furniture(sofa_id)
+        self.assertEqual(execute_query(
+            "SELECT COUNT(*) AS n FROM ProductAttributes WHERE ProductID = ?", (sofa_id,), fetch=True
+        )[0]['n'], 0)
+
+    def test_add_many_assigns_ids_in_order(self):
+        furnitures = [
+            Sofa(f"Sofa {i}", "Grey", 100.0 + i, "200x90x85", 1, None, "/s.jpg", i + 1, False, False)
+            for i in range(300)  # several statements' worth of parameters
+        ]
+
+        self.assertEqual(Furniture.add_many(furnitures), 300)
+
+        for furniture in (furnitures[0], furnitures[150], furnitures[299]):
+            stored = Furniture.get_furniture_by_id(furniture.id)
+            self.assertEqual(stored.name, furniture.name)
+            self.assertEqual(stored.seats, furniture.seats)
+
+    def test_dimensions_are_stored_parsed(self):
+        Table("Bistro Table", "Oak", 150.0, "70 x 70 x 75 cm", 2, None, "/t.jpg", "Round", 50, False).add_furniture()
+        execute_query("UPDATE Products SET Width = NULL WHERE ProductID = ?", (self.product_id,))
+
+        self.assertEqual(Furniture.store_parsed_dimensions(), 1)
+
+        rows = execute_query("SELECT Name, Width, Depth, Height FROM Products ORDER BY Name", fetch=True)
+        self.assertEqual([(row['Width'], row['Depth'], row['Height']) for row in rows], [(70, 70, 75), (60, 60, 100)])
+
+    def test_discount_flags_follow_the_type_rule(self):
+        # A sofa's storage does not earn the bed discount
+        sofa_id = Sofa("Loveseat", "Blue", 400.0, "150x90x85", 1, None, "/l.jpg", 2, False, True).add_furniture()
+
+        rows = Furniture.get_discount_flags(FurnitureFactory.discount_rules())
+
+        flags = {row['ProductID']: bool(row['Flag']) for row in rows}
+        self.assertEqual(flags, {self.product_id: True, sofa_id: False})
+
+    def test_get_furnitures_by_ids(self):
+        sofa_id = Sofa("Loveseat", "Blue", 400.0, "150x90x85", 1, None, "/l.jpg", 2, True, True).add_furniture()
+
+        products = Furniture.get_furnitures_by_ids([sofa_id, 999, self.product_id])
+
+        self.assertEqual(sorted(products), [self.product_id, sofa_id])
+        self.assertEqual(products[sofa_id].seats, 2)
+        self.assertTrue(products[sofa_id].is_convertible)
+        self.assertEqual(products[self.product_id].name, "Desk Chair")
+
+    def test_category_closure_follows_moves(self):
+        furniture_id = Category("Furniture", "All").add_category()
+        seating_id = Category("Seating", "Chairs", furniture_id).add_category()
+        stools_id = Category("Stools", "Bar stools", seating_id).add_category()
+        outdoor_id = Category("Outdoor", "Garden").add_category()
+        closure = "SELECT AncestorID, Depth FROM CategoryClosure WHERE DescendantID = ? ORDER BY Depth"
+
+        self.assertEqual(
+            [(row['AncestorID'], row['Depth']) for row in execute_query(closure, (stools_id,), fetch=True)],
+            [(stools_id, 0), (seating_id, 1), (furniture_id, 2)]
+        )
+
+        self.assertTrue(Category.move_category(seating_id, outdoor_id))
+        self.assertEqual(
+            [row['AncestorID'] for row in execute_query(closure, (stools_id,), fetch=True)],
+            [stools_id, seating_id, outdoor_id]
+        )
+        self.assertEqual(Category.get_category_by_id(seating_id)['ParentID'], outdoor_id)
+
+        with self.assertRaises(ValueError):
+            Category.move_category(outdoor_id, stools_id)
+
+    def test_bulk_categories_get_closure_self_rows(self):
+        self.assertEqual(Category.add_categories([Category("Beds", "All"), Category("Lamps", "All")]), 2)
+        beds_id = Category.get_all_categories()[0]['CategoryID']
+        bunk_id = Category("Bunk Beds", "Kids", beds_id).add_category()
+
+        subtree = "SELECT DescendantID FROM CategoryClosure WHERE AncestorID = ? ORDER BY Depth"
+        self.assertEqual([row['DescendantID'] for row in execute_query(subtree, (beds_id,), fetch=True)],
+                         [beds_id, bunk_id])
+
+    def test_add_order_returns_id(self):
+        order_id = Order(self.user_id, 250, "pending").add_order()
+        self.assertEqual(Order.get_order_by_id(order_id)['TotalAmount'], 250)
+
+    def test_create_from_cart(self):
+        Cart(self.user_id).add_to_cart(self.product_id, 3)
+
+        order = Order.create_from_cart(self.user_id)
+
+        self.assertEqual(order['TotalAmount'], 300)
+        self.assertEqual(execute_query("SELECT COUNT(*) AS n FROM Cart", fetch=True)[0]['n'], 0)
+        stock = execute_query("SELECT StockQuantity FROM Products", fetch=True)[0]['StockQuantity']
+        self.assertEqual(stock, 7)
+
+    def test_cart_writes_return_the_line(self):
+        cart = Cart(self.user_id)
+
+        self.assertEqual(cart.add_to_cart(self.product_id, 2)['Quantity'], 2)
+        line = cart.add_to_cart(self.product_id, 3)
+        self.assertEqual(line['Quantity'], 5)
+        self.assertEqual(len(cart.get_cart_items()), 1)
+
+        self.assertEqual(cart.update_cart(self.product_id, 1)['Quantity'], 1)
+        self.assertEqual(cart.remove_from_cart(self.product_id)['CartID'], line['CartID'])
+        with self.assertRaises(ValueError):
+            cart.update_cart(self.product_id, 4)
+        with self.assertRaises(ValueError):
+            cart.remove_from_cart(self.product_id)
+
+    def test_auth_token_expiry(self):
+        token = User.generate_auth_token(self.user_id)
+        self.assertEqual(User.validate_auth_token(token)['UserID'], self.user_id)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from app.models.catalog_events import CatalogSubject
+from app.models.furniture import parse_dimensions
+from app.services.dimension_index import DimensionIndex
+from catalog_fixtures import CatalogTestCase, product
+
+
+class TestParseDimensions(unittest.TestCase):
+
+    def test_formats(self):
+        self.assertEqual(parse_dimensions("60x60x100"), (60.0, 60.0, 100.0))
+        self.assertEqual(parse_dimensions("120 X 80.5 x 75 cm"), (120.0, 80.5, 75.0))
+        self.assertEqual(parse_dimensions("600×450×1000mm"), (60.0, 45.0, 100.0))
+        self.assertEqual(parse_dimensions("2 * 1,6 * 0,5 m"), (200.0, 160.0, 50.0))
+
+    def test_unparseable(self):
+        for text in ("Large", "60x60", "", None, "60x60x100 ft"):
+            self.assertEqual(parse_dimensions(text), (None, None, None))
+
+
+class TestDimensionIndex(CatalogTestCase):
+
+    def catalog_rows(self):
+        return [
+            product(1, Width=120, Depth=80, Height=75),
+            product(2, Width=90, Depth=90, Height=75),
+            product(3, Width=160, Depth=90, Height=74),
+            product(4, Width=None, Depth=None, Height=None),
+            product(5, Width=60, Depth=60, Height=110),
+        ]
+
+    def make_index(self, cache):
+        return DimensionIndex(cache)
+
+    def test_ranges_combine(self):
+        self.assertEqual(sorted(self.index.query({"width": (None, 120)})), [1, 2, 5])
+        self.assertEqual(sorted(self.index.query({"width": (None, 120), "height": (70, 80)})), [1, 2])
+        self.assertEqual(self.index.query({"depth": (85, 90), "width": (100, None)}), [3])
+        self.assertEqual(self.index.query({"height": (200, None)}), [])
+
+    def test_unmeasured_products_never_match(self):
+        self.assertEqual(sorted(self.index.query({})), [1, 2, 3, 5])
+        self.assertEqual(self.index.stats()["products"], 4)
+
+    def test_follows_product_writes(self):
+        self.index.query({"width": (None, 100)})
+
+        CatalogSubject.notify(CatalogSubject.UPDATED, 3, {"Width": 95.0})
+        CatalogSubject.notify(CatalogSubject.ADDED, 6, product(6, Width=45, Depth=45, Height=90))
+        CatalogSubject.notify(CatalogSubject.DELETED, 2)
+
+        self.assertEqual(sorted(self.index.query({"width": (None, 100)})), [3, 5, 6])
+        self.loader.assert_called_once()
+
+    def test_unknown_dimension(self):
+        with self.assertRaises(ValueError):
+            self.index.query({"length": (1, 2)})
+
+    def test_catalog_not_cached(self):
+        self.loader.return_value = None
+        self.assertIsNone(self.index.query({"width": (None, 100)}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import pyodbc
+from app.db.execute_query import execute_many, stream_query
+
+
+class TestExecuteMany(unittest.TestCase):
+
+    def setUp(self):
+        # Fake pooled connection usable as a context manager
+        self.connection = MagicMock()
+        self.connection.__enter__.return_value = self.connection
+        self.cursor = self.connection.cursor.return_value
+
+    @patch('app.db.execute_query.get_connection')
+    def test_execute_many_sends_chunks(self, mock_get_connection):
+        mock_get_connection.return_value = self.connection
+        rows = ((i, i) for i in range(5))
+
+        count = execute_many("UPDATE Products SET StockQuantity = ? WHERE ProductID = ?", rows, chunk_size=2)
+
+        # 5 rows in chunks of 2 -> 3 executemany calls on one connection
+        self.assertEqual(count, 5)
+        self.assertTrue(self.cursor.fast_executemany)
+        self.assertEqual(self.cursor.executemany.call_count, 3)
+        chunks = [call[0][1] for call in self.cursor.executemany.call_args_list]
+        self.assertEqual(chunks, [[(0, 0), (1, 1)], [(2, 2), (3, 3)], [(4, 4)]])
+        mock_get_connection.assert_called_once()
+        self.cursor.close.assert_called_once()
+
+    @patch('app.db.execute_query.get_connection')
+    def test_execute_many_empty(self, mock_get_connection):
+        mock_get_connection.return_value = self.connection
+
+        count = execute_many("DELETE FROM Cart WHERE CartID = ?", [])
+
+        self.assertEqual(count, 0)
+        self.cursor.executemany.assert_not_called()
+
+    @patch('app.db.execute_query.get_connection')
+    def test_execute_many_error(self, mock_get_connection):
+        mock_get_connection.return_value = self.connection
+        self.cursor.executemany.side_effect = pyodbc.Error("constraint violation")
+
+        count = execute_many("INSERT INTO Categories (Name) VALUES (?)", [("Chairs",)])
+
+        self.assertIsNone(count)
+
+    def test_execute_many_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            execute_many("DELETE FROM Cart WHERE CartID = ?", [(1,)], chunk_size=0)
+
+
+
+class TestStreamQuery(unittest.TestCase):
+
+    @patch('app.db.execute_query.get_connection')
+    def test_stream_query_fetches_in_chunks(self, mock_get_connection):
+        connection = MagicMock()
+        connection.__enter__.return_value = connection
+        cursor = connection.cursor.return_value
+        cursor.description = [("ProductID",), ("Name",)]
+        cursor.fetchmany.side_effect = [[(1, "Chair"), (2, "Table")], [(3, "Sofa")], []]
+        mock_get_connection.return_value = connection
+
+        with stream_query("SELECT ProductID, Name FROM Products", chunk_size=2) as rows:
+            # Nothing is fetched until the rows are iterated
+            cursor.fetchmany.assert_not_called()
+            result = list(rows)
+
+        self.assertEqual(result, [
+            {"ProductID": 1, "Name": "Chair"},
+            {"ProductID": 2, "Name": "Table"},
+            {"ProductID": 3, "Name": "Sofa"}
+        ])
+        cursor.fetchmany.assert_called_with(2)
+        cursor.fetchall.assert_not_called()
+        cursor.close.assert_called_once()
+        connection.__exit__.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+from app.models.catalog_events import CatalogSubject
+from app.services.catalog_cache import CatalogCache
+from app.services.facet_index import FacetIndex, bitmap_of, price_bucket, slots_of
+from catalog_fixtures import CatalogTestCase, product
+
+
+class TestFacetIndex(CatalogTestCase):
+
+    def catalog_rows(self):
+        return [
+            product(1, CategoryID=1, FurnitureType="Chair", Price=80),
+            product(2, CategoryID=1, FurnitureType="Chair", Price=150, StockQuantity=0),
+            product(3, CategoryID=1, FurnitureType="Table", Price=450),
+            product(4, CategoryID=2, FurnitureType="Sofa", Price=1200),
+            product(5, CategoryID=2, FurnitureType="Chair", Price=240),
+            product(6, CategoryID=3, FurnitureType="Bed", Price=3000),
+        ]
+
+    def make_index(self, cache):
+        return FacetIndex(cache)
+
+    def ids(self, **filters):
+        return sorted(self.index.filter(**filters)[0])
+
+    def test_helpers(self):
+        self.assertEqual(price_bucket(99.99), "0-100")
+        self.assertEqual(price_bucket(100), "100-250")
+        self.assertEqual(price_bucket(5000), "2500+")
+        self.assertEqual(list(slots_of(bitmap_of([0, 3, 9], 10))), [0, 3, 9])
+
+    def test_combined_filters(self):
+        self.assertEqual(self.ids(), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(self.ids(category_id=1, furniture_type="Chair"), [1, 2])
+        self.assertEqual(self.ids(furniture_type="Chair", in_stock=True), [1, 5])
+        self.assertEqual(self.ids(furniture_type="Chair", in_stock=False), [2])
+        self.assertEqual(self.ids(category_id=9), [])
+        self.assertEqual(self.ids(ids=[3, 4, 42], category_id=2), [4])
+
+    def test_price_range(self):
+        self.assertEqual(self.ids(min_price=150, max_price=450), [2, 3, 5])
+        self.assertEqual(self.ids(min_price=1000), [4, 6])
+        self.assertEqual(self.ids(max_price=100), [1])
+        self.assertEqual(self.ids(min_price=5000), [])
+
+    def test_facet_counts_ignore_their_own_filter(self):
+        _, facets = self.index.filter(category_id=1, min_price=100)
+
+        # Categories are counted within the price range, not just category 1
+        self.assertEqual(facets["category_id"], {1: 2, 2: 2, 3: 1})
+        self.assertEqual(facets["furniture_type"], {"Chair": 1, "Table": 1})
+        self.assertEqual(facets["price"], {"0-100": 1, "100-250": 1, "250-500": 1})
+        self.assertEqual(facets["in_stock"], {True: 1, False: 1})
+
+    def test_incremental_updates(self):
+        self.ids()
+
+        CatalogSubject.notify(CatalogSubject.ADDED, 7, product(7, CategoryID=3, FurnitureType="Chair", Price=90))
+        CatalogSubject.notify(CatalogSubject.UPDATED, 3, {"FurnitureType": "Chair", "Price": 200})
+        CatalogSubject.notify(CatalogSubject.DELETED, 1)
+        CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, 5, {"Quantity": 5})
+
+        self.assertEqual(self.ids(furniture_type="Chair"), [2, 3, 5, 7])
+        self.assertEqual(self.ids(furniture_type="Chair", in_stock=True), [3, 7])
+        _, facets = self.index.filter()
+        self.assertEqual(facets["furniture_type"], {"Chair": 4, "Sofa": 1, "Bed": 1})
+        self.loader.assert_called_once()
+
+    def test_rebuilds_when_cache_reloads(self):
+        self.ids()
+        self.loader.return_value = [product(9, CategoryID=1, FurnitureType="Desk", Price=10)]
+
+        self.cache.invalidate()
+
+        self.assertEqual(self.ids(), [9])
+
+    def test_not_cached(self):
+        index = FacetIndex(CatalogCache(self.loader, max_rows=1))
+
+        self.assertIsNone(index.filter(category_id=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -45,6 +45,17 @@ class TestFurnitureModel(unittest.TestCase):
         self.assertEqual(params[6], "/images/office-chair.jpg")  
         self.assertEqual(params[7], "Chair") 
 
+    @patch('app.models.furniture.CatalogSubject.notify')
+    @patch('app.models.furniture.execute_query')
+    def test_failed_add_sends_no_event(self, mock_execute_query, mock_notify):
+        # The insert returned no row: nothing was committed
+        mock_execute_query.return_value = None
+
+        chair = Chair("Office Chair", "Mesh", 199.99, "60x60x100", 10, 1, "/images/office-chair.jpg")
+
+        self.assertIsNone(chair.add_furniture())
+        mock_notify.assert_not_called()
+
     def test_chair_get_furniture_type(self):
         
         chair = Chair("Test Chair", "Description", 100, "50x50x100", 5, 1, "/images/chair.jpg")
@@ -91,6 +102,23 @@ class TestFurnitureModel(unittest.TestCase):
         self.assertEqual(chair_dict["max_weight_capacity"], 120)
         self.assertEqual(chair_dict["has_armrests"], True)
         self.assertEqual(chair_dict["is_adjustable"], True)
+        self.assertIsNone(chair_dict["id"])
+
+    def test_to_dicts(self):
+        bed = Bed("Bed", "Oak", 500, "200x160x40", 1, 2, "/images/bed.jpg", "King", True, "Oak")
+        bed.id = 7
+        cabinet = Cabinet("Cabinet", "Pine", "80.5", "80x40x120", 0, 3, "/images/cabinet.jpg", 2, 4, True)
+
+        bed_dict, cabinet_dict = Furniture.to_dicts([bed, cabinet])
+
+        self.assertEqual(bed_dict, {
+            "id": 7, "name": "Bed", "description": "Oak", "price": 500.0, "dimensions": "200x160x40",
+            "stock_quantity": 1, "category_id": 2, "image_url": "/images/bed.jpg", "furniture_type": "Bed",
+            "bed_size": "King", "has_storage": True, "material_type": "Oak"
+        })
+        self.assertEqual(cabinet_dict["price"], 80.5)
+        self.assertEqual((cabinet_dict["num_drawers"], cabinet_dict["num_shelves"], cabinet_dict["has_lock"]), (2, 4, True))
+        self.assertEqual(cabinet.to_dict(), cabinet_dict)
 
     # Tests for Table category
     @patch('app.models.furniture.execute_query')
@@ -274,7 +302,8 @@ class TestFurnitureModel(unittest.TestCase):
             call_args = mock_execute_query.call_args[0]
 
            
-            self.assertIn("SELECT * FROM Products WHERE ProductID = ?", call_args[0])
+            self.assertIn("FROM Products p", call_args[0])
+            self.assertIn("LEFT JOIN ProductAttributes", call_args[0])
             self.assertEqual(call_args[1], (1,))
 
            
@@ -299,6 +328,19 @@ class TestFurnitureModel(unittest.TestCase):
         self.assertIn("UPDATE Products", call_args[0])
         self.assertEqual(call_args[1], (5, 1))
 
+    @patch('app.models.furniture.execute_many')
+    def test_update_stock_bulk(self, mock_execute_many):
+        mock_execute_many.return_value = 2
+
+        count = Furniture.update_stock_bulk([(1, 5), (2, 3)])
+
+        # One batched update with (quantity, product_id) rows
+        mock_execute_many.assert_called_once()
+        call_args = mock_execute_many.call_args[0]
+        self.assertIn("UPDATE Products", call_args[0])
+        self.assertEqual(list(call_args[1]), [(5, 1), (3, 2)])
+        self.assertEqual(count, 2)
+
     # FurnitureFactory Factory Style Tests
     def test_furniture_factory_create_chair(self):
         
@@ -464,11 +506,11 @@ class TestFurnitureModel(unittest.TestCase):
             has_armrests=True,
             is_adjustable=True
         )
-        chair.update_furniture(1)
+        with patch('app.models.furniture.execute_many') as mock_execute_many:
+            chair.update_furniture(1)
 
         # Verify that execute_query is called with the correct parameters.
-        mock_execute_query.assert_called_once()
-        call_args = mock_execute_query.call_args[0]
+        call_args = mock_execute_query.call_args_list[0][0]
 
         # Verify that the SQL query is to update furniture.
         self.assertIn("UPDATE Products", call_args[0])
@@ -481,7 +523,18 @@ class TestFurnitureModel(unittest.TestCase):
         self.assertEqual(params[3], "65x65x105")  
         self.assertEqual(params[4], 8)  
         self.assertEqual(params[7], "Chair")  
-        self.assertEqual(params[8], 1)  
+        self.assertEqual(params[-1], 1)
+
+        # The chair attributes replace the stored ones
+        self.assertEqual(
+            mock_execute_query.call_args_list[1][0],
+            ("DELETE FROM ProductAttributes WHERE ProductID = ?", (1,))
+        )
+        self.assertEqual(mock_execute_many.call_args[0][1], [
+            (1, "max_weight_capacity", 130.0, None),
+            (1, "has_armrests", 1.0, None),
+            (1, "is_adjustable", 1.0, None)
+        ])
 
     @patch('app.models.furniture.execute_query')
     def test_delete_furniture(self, mock_execute_query):
@@ -499,5 +552,89 @@ class TestFurnitureModel(unittest.TestCase):
         self.assertIn("DELETE FROM Products WHERE ProductID = ?", call_args[0])
         self.assertEqual(call_args[1], (1,))
 
+    def test_furniture_is_slotted(self):
+        chair = Chair("Stool", "Pine", 40, "30x30x45", 3, 1, "/images/stool.jpg")
+
+        self.assertFalse(hasattr(chair, "__dict__"))
+        with self.assertRaises(AttributeError):
+            chair.colour = "red"
+
+    def test_factory_accepts_bed_size(self):
+        bed = FurnitureFactory.create_furniture(
+            "Bed", "Bed", "Oak", 500, "200x160x40", 1, 1, "/images/bed.jpg", {"bed_size": "King"}
+        )
+
+        self.assertEqual(bed.size, "King")
+
+    def test_create_many(self):
+        rows = [
+            {"ProductID": product_id, "Name": f"Product {product_id}", "Description": "", "Price": 100,
+             "Dimensions": "1x1x1", "StockQuantity": 1, "CategoryID": 1, "ImageURL": "", "FurnitureType": kind}
+            for product_id, kind in ((1, "Chair"), (2, "Sofa"), (3, "Cabinet"))
+        ]
+
+        chair, sofa, cabinet = FurnitureFactory.create_many(rows, {2: {"seats": 5}, 3: {"has_lock": True}})
+
+        self.assertIsInstance(chair, Chair)
+        self.assertEqual((chair.id, chair.max_weight_capacity, chair.has_armrests), (1, 100, True))
+        self.assertEqual((sofa.id, sofa.seats, sofa.is_convertible), (2, 5, False))
+        self.assertTrue(cabinet.has_lock)
+        self.assertEqual(cabinet.to_dict()["id"], 3)
+
+        with self.assertRaises(ValueError):
+            FurnitureFactory.create_many([dict(rows[0], FurnitureType="Lamp")])
+
+    @patch('app.models.furniture.execute_query')
+    def test_get_furniture_by_id_hydrates_attributes(self, mock_execute_query):
+        product = {
+            "ProductID": 4, "Name": "Storage Bed", "Description": "Oak bed", "Price": 899,
+            "Dimensions": "200x160x40", "StockQuantity": 2, "CategoryID": 3,
+            "ImageURL": "/images/bed.jpg", "FurnitureType": "Bed"
+        }
+        mock_execute_query.return_value = [
+            dict(product, AttributeName="bed_size", AttributeNumber=None, AttributeText="King"),
+            dict(product, AttributeName="has_storage", AttributeNumber=1.0, AttributeText=None),
+            dict(product, AttributeName="material_type", AttributeNumber=None, AttributeText="Oak")
+        ]
+
+        bed = Furniture.get_furniture_by_id(4)
+
+        self.assertEqual(bed.to_dict()["bed_size"], "King")
+        self.assertIs(bed.has_storage, True)
+        self.assertEqual(bed.material_type, "Oak")
+        mock_execute_query.assert_called_once()
+
+    @patch('app.models.furniture.execute_query')
+    def test_get_furniture_by_id_without_attributes(self, mock_execute_query):
+        mock_execute_query.return_value = [{
+            "ProductID": 5, "Name": "Sofa", "Description": "Grey", "Price": 500, "Dimensions": "200x90x80",
+            "StockQuantity": 1, "CategoryID": 2, "ImageURL": "/images/sofa.jpg", "FurnitureType": "Sofa",
+            "AttributeName": None, "AttributeNumber": None, "AttributeText": None
+        }]
+
+        sofa = Furniture.get_furniture_by_id(5)
+
+        self.assertEqual(sofa.seats, 3)
+
+    @patch('app.models.furniture.execute_query')
+    def test_find_ids_by_attributes(self, mock_execute_query):
+        mock_execute_query.return_value = [{"ProductID": 7}]
+
+        ids = Furniture.find_ids_by_attributes([("seats", ">=", "3"), ("is_convertible", "=", "true")])
+
+        self.assertEqual(ids, [7])
+        query, params = mock_execute_query.call_args[0]
+        self.assertEqual(query.count("SELECT ProductID FROM ProductAttributes"), 2)
+        self.assertIn("NumberValue >= ?", query)
+        self.assertIn(" INTERSECT ", query)
+        self.assertEqual(params, ("seats", 3.0, "is_convertible", 1.0))
+
+    def test_invalid_attribute_filters(self):
+        for filters in ([("colour", "=", "red")], [("seats", "=", "many")],
+                        [("has_lock", "=", "maybe")], [("shape", ">=", "Round")], []):
+            with self.assertRaises(ValueError):
+                Furniture.find_ids_by_attributes(filters)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -188,5 +188,20 @@ class TestOrderItemModel(unittest.TestCase):
         
         self.assertEqual(total, 0)
 
+    @patch('app.models.order_item.execute_many')
+    def test_add_order_items(self, mock_execute_many):
+        mock_execute_many.return_value = 2
+
+        items = [OrderItem(1, 101, 2, 199.99), OrderItem(1, 102, 1, 99.99)]
+        count = OrderItem.add_order_items(items, chunk_size=500)
+
+        # All items go through a single batched insert
+        mock_execute_many.assert_called_once()
+        call_args = mock_execute_many.call_args
+        self.assertIn("INSERT INTO OrderItems", call_args[0][0])
+        self.assertEqual(list(call_args[0][1]), [(1, 101, 2, 199.99), (1, 102, 1, 99.99)])
+        self.assertEqual(call_args[1]["chunk_size"], 500)
+        self.assertEqual(count, 2)
+
 if __name__ == '__main__':
     unittest.main()
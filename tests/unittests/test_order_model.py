@@ -1,5 +1,6 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import call, patch, MagicMock
+from app.models.catalog_events import CatalogSubject
 from app.models.order import Order
 
 class TestOrderModel(unittest.TestCase):
@@ -44,6 +45,70 @@ class TestOrderModel(unittest.TestCase):
         
         self.assertIsNone(order_id)
 
+    @patch('app.models.order.execute_query')
+    def test_create_from_cart(self, mock_execute_query):
+        # Insert order, insert items, update stock, clear cart
+        mock_execute_query.side_effect = [
+            [{"OrderID": 7, "TotalAmount": 400}],
+            None,
+            None,
+            None
+        ]
+
+        order = Order.create_from_cart(1)
+
+        # The number of statements does not depend on the cart size
+        self.assertEqual(mock_execute_query.call_count, 4)
+        queries = [call[0][0] for call in mock_execute_query.call_args_list]
+        self.assertIn("INSERT INTO Orders", queries[0])
+        self.assertIn("SELECT ?, SUM(p.Price * c.Quantity)", queries[0])
+        self.assertIn("INSERT INTO OrderItems", queries[1])
+        self.assertIn("FROM Cart c", queries[1])
+        self.assertIn("UPDATE p", queries[2])
+        self.assertIn("DELETE FROM Cart", queries[3])
+        self.assertEqual(mock_execute_query.call_args_list[1][0][1], (7, 1))
+        self.assertEqual(order, {"OrderID": 7, "TotalAmount": 400})
+
+    @patch('app.models.order.CatalogSubject.notify')
+    @patch('app.models.order.execute_query')
+    def test_create_from_cart_reports_stock_adjustments(self, mock_execute_query, mock_notify):
+        mock_execute_query.side_effect = [
+            [{"OrderID": 7, "TotalAmount": 400}],
+            [{"ProductID": 3, "Quantity": 2}, {"ProductID": 5, "Quantity": 1}],
+            None,
+            None
+        ]
+
+        Order.create_from_cart(1)
+
+        # The ordered quantities, not the new stock levels
+        mock_notify.assert_has_calls([
+            call(CatalogSubject.STOCK_ADJUSTED, 3, {"Quantity": 2}),
+            call(CatalogSubject.STOCK_ADJUSTED, 5, {"Quantity": 1})
+        ])
+        self.assertEqual(mock_notify.call_count, 2)
+
+    @patch('app.models.order.execute_query')
+    def test_create_from_cart_without_stock_update(self, mock_execute_query):
+        mock_execute_query.side_effect = [[{"OrderID": 7, "TotalAmount": 400}], None, None]
+
+        Order.create_from_cart(1, update_stock=False)
+
+        queries = [call[0][0] for call in mock_execute_query.call_args_list]
+        self.assertEqual(len(queries), 3)
+        self.assertFalse(any("UPDATE p" in query for query in queries))
+
+    @patch('app.models.order.execute_query')
+    def test_create_from_cart_empty(self, mock_execute_query):
+        # No cart lines, so no order row is inserted
+        mock_execute_query.return_value = []
+
+        with self.assertRaises(ValueError) as context:
+            Order.create_from_cart(1)
+
+        self.assertIn("No items in the cart", str(context.exception))
+        mock_execute_query.assert_called_once()
+
     @patch('app.models.order.execute_query')
     def test_update_order(self, mock_execute_query):
         
@@ -3,6 +3,16 @@ from unittest.mock import patch
 from app import create_app
 from app.services.order_service import OrderService
 
+STAMP = {
+    "Status": "shipped",
+    "TotalAmount": 500,
+    "PaymentMethod": "credit_card",
+    "CreatedAt": "2023-04-01 09:00:00",
+    "UpdatedAt": "2023-04-02 12:30:00",
+    "UserName": "Test User",
+    "UserEmail": "test@example.com"
+}
+
 class TestOrderRoutes(unittest.TestCase):
 
     def setUp(self):
@@ -100,6 +110,17 @@ class TestOrderRoutes(unittest.TestCase):
         self.assertEqual(len(response.json["orders"]), 2)
         mock_get_orders.assert_called_once_with("1")  # user_id as string from query
 
+    @patch('app.services.order_service.OrderService.get_orders_page')
+    def test_view_orders_page(self, mock_get_page):
+        mock_get_page.return_value = ([{"OrderID": 9, "UserID": 1}], None)
+
+        response = self.client.get('/api/orders?user_id=1&limit=10')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.json["next_cursor"])
+        self.assertEqual(response.json["orders"][0]["OrderID"], 9)
+        mock_get_page.assert_called_once_with("1", None, None, 10)
+
     @patch('app.services.order_service.OrderService.get_order_by_user')
     def test_view_orders_none_found(self, mock_get_orders):
         # Mock no orders found
@@ -115,9 +136,11 @@ class TestOrderRoutes(unittest.TestCase):
     # --------------------------
     # Test getting order details
     # --------------------------
+    @patch('app.services.order_service.OrderService.get_order_stamp')
     @patch('app.services.order_service.OrderService.get_order_by_id')
     @patch('app.models.order.Order.get_order_items')
-    def test_get_order_details_success(self, mock_get_items, mock_get_order):
+    def test_get_order_details_success(self, mock_get_items, mock_get_order, mock_get_stamp):
+        mock_get_stamp.return_value = dict(STAMP)
         # Mock order details
         mock_get_order.return_value = {
             "OrderID": 1,
@@ -142,10 +165,12 @@ class TestOrderRoutes(unittest.TestCase):
         self.assertEqual(len(response.json["items"]), 2)
         mock_get_order.assert_called_once_with(1)
 
+    @patch('app.services.order_service.OrderService.get_order_stamp')
     @patch('app.services.order_service.OrderService.get_order_by_id')
-    def test_get_order_details_not_found(self, mock_get_order):
+    def test_get_order_details_not_found(self, mock_get_order, mock_get_stamp):
         # Mock order not found
         mock_get_order.return_value = None
+        mock_get_stamp.return_value = None
 
         # Send GET request
         response = self.client.get('/api/orders/999')
@@ -154,5 +179,53 @@ class TestOrderRoutes(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn("Order not found", response.json["message"])
 
+    # --------------------------
+    # Test conditional requests for order details
+    # --------------------------
+    @patch('app.services.order_service.OrderService.get_order_stamp')
+    @patch('app.services.order_service.OrderService.get_order_by_id')
+    @patch('app.models.order.Order.get_order_items')
+    def test_get_order_details_validators(self, mock_get_items, mock_get_order, mock_get_stamp):
+        mock_get_stamp.return_value = dict(STAMP)
+        mock_get_order.return_value = {"OrderID": 1, "Status": "shipped"}
+        mock_get_items.return_value = []
+
+        response = self.client.get('/api/orders/1')
+
+        self.assertTrue(response.headers["ETag"])
+        self.assertEqual(response.last_modified.year, 2023)
+
+        # Same stamp: 304 without loading the order
+        mock_get_order.reset_mock()
+        response = self.client.get('/api/orders/1', headers={"If-None-Match": response.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        mock_get_order.assert_not_called()
+
+    @patch('app.services.order_service.OrderService.get_order_stamp')
+    @patch('app.services.order_service.OrderService.get_order_by_id')
+    @patch('app.models.order.Order.get_order_items')
+    def test_get_order_details_changed_since(self, mock_get_items, mock_get_order, mock_get_stamp):
+        mock_get_stamp.return_value = dict(STAMP)
+        mock_get_order.return_value = {"OrderID": 1, "Status": "shipped"}
+        mock_get_items.return_value = []
+        etag = self.client.get('/api/orders/1').headers["ETag"]
+
+        # A status change moves the ETag
+        mock_get_stamp.return_value = dict(STAMP, Status="delivered", UpdatedAt="2023-04-03 10:00:00")
+        response = self.client.get('/api/orders/1', headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    @patch('app.services.order_service.OrderService.get_order_stamp')
+    @patch('app.services.order_service.OrderService.get_order_by_id')
+    def test_get_order_details_if_modified_since(self, mock_get_order, mock_get_stamp):
+        mock_get_stamp.return_value = dict(STAMP)
+
+        response = self.client.get('/api/orders/1', headers={"If-Modified-Since": "Sat, 01 Jan 2030 00:00:00 GMT"})
+
+        self.assertEqual(response.status_code, 304)
+        mock_get_order.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
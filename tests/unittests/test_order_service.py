@@ -5,31 +5,11 @@ from unittest.mock import patch, MagicMock
 
 class TestOrderService(unittest.TestCase):
 
-    @patch('app.services.order_service.CartService.get_cart_items')
-    @patch('app.services.order_service.Order.add_order')
-    @patch('app.services.order_service.OrderItem.add_order_item')
-    @patch('app.services.order_service.Furniture.update_stock')
-    @patch('app.services.order_service.CartService.clear_cart')
+    @patch('app.services.order_service.Order.create_from_cart')
     @patch('app.services.order_service.OrderSubject.notify')
-    def test_create_order_success(self, mock_notify, mock_clear_cart, mock_update_stock,
-                                 mock_add_order_item, mock_add_order, mock_get_cart_items):
-        # Mock the cart items
-        mock_get_cart_items.return_value = [
-            {"ProductID": 1, "Quantity": 2, "Price": 100},
-            {"ProductID": 2, "Quantity": 1, "Price": 200}
-        ]
-
-        # Mock the add_order method
-        mock_add_order.return_value = 1
-
-        # Mock the add_order_item method
-        mock_add_order_item.return_value = None
-
-        # Mock the update_stock method
-        mock_update_stock.return_value = None
-
-        # Mock the clear_cart method
-        mock_clear_cart.return_value = None
+    def test_create_order_success(self, mock_notify, mock_create_from_cart):
+        # Mock the order created from the cart in one transaction
+        mock_create_from_cart.return_value = {"OrderID": 1, "TotalAmount": 400}
 
         # Mock notify
         mock_notify.return_value = None
@@ -39,36 +19,28 @@ class TestOrderService(unittest.TestCase):
         self.assertEqual(result, "✅ Order completed successfully. Total amount: 400.")
 
         # Verify all mocks were called with correct parameters
-        mock_get_cart_items.assert_called_once_with(1)
-        mock_add_order.assert_called_once()
-        self.assertEqual(mock_add_order_item.call_count, 2)
-        self.assertEqual(mock_update_stock.call_count, 2)
-        mock_clear_cart.assert_called_once_with(1)
+        mock_create_from_cart.assert_called_once_with(1)
         mock_notify.assert_called_once_with(1, 1, 400, "pending")
 
-    @patch('app.services.order_service.CartService.get_cart_items')
-    def test_create_order_empty_cart(self, mock_get_cart_items):
+    @patch('app.services.order_service.Order.create_from_cart')
+    def test_create_order_empty_cart(self, mock_create_from_cart):
         # Mock empty cart
-        mock_get_cart_items.return_value = []
+        mock_create_from_cart.side_effect = ValueError("⚠️ No items in the cart.")
 
         # Test creating an order with empty cart
         result = OrderService.create_order(user_id=1)
         self.assertEqual(result, "⚠️ No items in the cart.")
 
-    @patch('app.services.order_service.Order.add_order')
-    @patch('app.services.order_service.CartService.get_cart_items')
-    def test_create_order_failed(self, mock_get_cart_items, mock_add_order):
-        # Mock the cart items
-        mock_get_cart_items.return_value = [
-            {"ProductID": 1, "Quantity": 2, "Price": 100}
-        ]
-
-        # Mock order creation failure
-        mock_add_order.return_value = None
+    @patch('app.services.order_service.Order.create_from_cart')
+    @patch('app.services.order_service.OrderSubject.notify')
+    def test_create_order_failed(self, mock_notify, mock_create_from_cart):
+        # Mock order creation failure (the transaction was rolled back)
+        mock_create_from_cart.return_value = None
 
         # Test creating an order that fails
         result = OrderService.create_order(user_id=1)
         self.assertEqual(result, "⚠️ Failed to create order.")
+        mock_notify.assert_not_called()
 
     @patch('app.services.order_service.Order.get_order_by_id')
     @patch('app.services.order_service.Order.update_order_status')
@@ -0,0 +1,118 @@
+import unittest
+from datetime import datetime
+from app.db import configure, connection, execute_many, get_connection
+from app.db.pagination import decode_cursor, encode_cursor, keyset_condition, parse_page_size
+from app.models.order import Order
+from app.services.product_service import ProductService, catalog_cache
+from app.services.user_service import UserService
+
+
+class TestCursors(unittest.TestCase):
+
+    def test_round_trip(self):
+        values = ["Oak Table", 42, datetime(2024, 5, 1, 12, 30)]
+        cursor = encode_cursor(values)
+
+        self.assertNotIn("Oak", cursor)  # opaque to clients
+        self.assertEqual(decode_cursor(cursor, 3), values)
+
+    def test_invalid_cursor(self):
+        for cursor in ("not-a-cursor", encode_cursor([1]), encode_cursor({"a": 1})):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor, 2)
+
+    def test_page_size(self):
+        self.assertEqual(parse_page_size(None), 50)
+        self.assertEqual(parse_page_size("10"), 10)
+        for value in ("0", "501", "ten"):
+            with self.assertRaises(ValueError):
+                parse_page_size(value)
+
+    def test_keyset_condition(self):
+        condition, params = keyset_condition(("Name", "ProductID"), ["Sofa", 7])
+
+        self.assertEqual(condition, "((Name > ?) OR (Name = ? AND ProductID > ?))")
+        self.assertEqual(params, ["Sofa", "Sofa", 7])
+
+        condition, _ = keyset_condition(("CreatedAt", "OrderID"), ["2024", 7], descending=True)
+        self.assertIn("OrderID < ?", condition)
+
+
+class TestKeysetPagesOnSqlite(unittest.TestCase):
+    """Walk every page of real listings on an in-memory SQLite database."""
+
+    def setUp(self):
+        dialect = configure("sqlite://")
+        with get_connection() as conn:
+            dialect.bootstrap_schema(conn)
+        catalog_cache.clear()
+
+        execute_many("INSERT INTO Categories (Name) VALUES (?)", [("Chairs",), ("Stools",)])
+        # Duplicate names check the ProductID tie-breaker
+        execute_many(
+            "INSERT INTO Products (Name, Price, StockQuantity, CategoryID, FurnitureType) VALUES (?, ?, ?, ?, ?)",
+            [(f"Product {i % 7}", 10 + i, 5, i % 2 + 1, "Chair") for i in range(23)]
+        )
+        execute_many(
+            "INSERT INTO Users (Name, Email, Password, Salt, CreatedAt) VALUES (?, ?, ?, ?, ?)",
+            [(f"User {i}", f"user{i}@example.com", "x", "y", "2024-01-01 00:00:00") for i in range(11)]
+        )
+        execute_many(
+            "INSERT INTO Orders (UserID, TotalAmount, Status, CreatedAt) VALUES (?, ?, ?, ?)",
+            [(i % 3 + 1, 100, "pending", f"2024-01-{i % 5 + 1:02d} 00:00:00") for i in range(17)]
+        )
+
+    def tearDown(self):
+        catalog_cache.clear()
+        configure(connection.DATABASE_URL)
+
+    def walk(self, fetch):
+        rows, cursor, pages = [], None, 0
+        while True:
+            page, cursor = fetch(cursor)
+            rows.extend(page)
+            pages += 1
+            if cursor is None:
+                return rows, pages
+
+    def test_products_from_database(self):
+        catalog_cache.max_rows = 0  # too large to cache, so pages come from SQL
+        try:
+            rows, pages = self.walk(lambda cursor: ProductService.get_products_page(cursor=cursor, limit=5))
+        finally:
+            catalog_cache.max_rows = 50000
+
+        keys = [(row["Name"], row["ProductID"]) for row in rows]
+        self.assertEqual(len(keys), 23)
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(pages, 5)
+
+    def test_products_from_cache_match_database(self):
+        cached, _ = self.walk(lambda cursor: ProductService.get_products_page(
+            category_id="2", cursor=cursor, limit=4))
+
+        self.assertEqual(catalog_cache.stats()["loads"], 1)
+        self.assertEqual(len(cached), 11)
+        keys = [(row["Name"], row["ProductID"]) for row in cached]
+        self.assertEqual(keys, sorted(keys))
+
+    def test_users(self):
+        rows, pages = self.walk(lambda cursor: UserService.get_users_page(cursor=cursor, limit=4))
+
+        self.assertEqual([row["UserID"] for row in rows], list(range(1, 12)))
+        self.assertEqual(pages, 3)
+
+    def test_orders_newest_first(self):
+        rows, _ = self.walk(lambda cursor: Order.get_orders_page(status="pending", cursor=cursor, limit=6))
+
+        keys = [(row["CreatedAt"], row["OrderID"]) for row in rows]
+        self.assertEqual(len(keys), 17)
+        self.assertEqual(keys, sorted(keys, reverse=True))
+        self.assertEqual(rows[0]["ItemCount"], 0)
+
+        mine, _ = self.walk(lambda cursor: Order.get_orders_page(user_id=1, cursor=cursor, limit=2))
+        self.assertEqual({row["UserID"] for row in mine}, {1})
+
+
+if __name__ == '__main__':
+    unittest.main()
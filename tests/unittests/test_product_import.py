@@ -0,0 +1,154 @@
+import io
+import unittest
+from unittest.mock import patch
+from app import create_app
+from app.services.product_import import read_records
+from app.services.product_service import ProductService
+
+CSV_FEED = (
+    "name,description,price,dimensions,stock_quantity,category_id,image_url,furniture_type,seats,has_lock\n"
+    "Corner Sofa,Grey,899.99,250x180x85,3,1,/s.jpg,Sofa,5,\n"
+    "Filing Cabinet,Steel,199,40x60x100,0,2,/c.jpg,Cabinet,,true\n"
+)
+
+
+def record(**fields):
+    data = {
+        "name": "Desk Chair", "description": "Mesh", "price": 100, "dimensions": "60x60x100",
+        "stock_quantity": 10, "category_id": 1, "image_url": "/c.jpg", "furniture_type": "Chair",
+    }
+    data.update(fields)
+    return data
+
+
+class TestReadRecords(unittest.TestCase):
+
+    def test_csv_rows_skip_empty_fields(self):
+        rows = list(read_records(io.StringIO(CSV_FEED), "csv"))
+
+        self.assertEqual([number for number, _ in rows], [1, 2])
+        self.assertEqual(rows[0][1]["seats"], "5")
+        self.assertNotIn("has_lock", rows[0][1])
+        self.assertEqual(rows[1][1]["has_lock"], "true")
+
+    def test_csv_row_with_extra_fields(self):
+        feed = "name,price\nStool,10,extra\n"
+        self.assertIn("more fields", list(read_records(io.StringIO(feed), "csv"))[0][1])
+
+    def test_jsonl_reports_unreadable_lines(self):
+        feed = '{"name": "Stool"}\n\nnot json\n[1, 2]\n'
+
+        rows = list(read_records(io.StringIO(feed), "jsonl"))
+
+        self.assertEqual(rows[0], (1, {"name": "Stool"}))
+        self.assertEqual(rows[1], (3, "⚠️ Invalid JSON."))
+        self.assertIn("JSON object", rows[2][1])
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            read_records(io.StringIO(""), "xml")
+
+
+class TestImportProducts(unittest.TestCase):
+
+    def test_csv_values_are_converted(self):
+        _, data = next(read_records(io.StringIO(CSV_FEED), "csv"))
+
+        sofa = ProductService.furniture_from_record(data)
+
+        self.assertEqual(sofa.get_furniture_type(), "Sofa")
+        self.assertEqual(sofa.price, 899.99)
+        self.assertEqual(sofa.stock_quantity, 3)
+        self.assertEqual(sofa.seats, 5)
+        self.assertIsInstance(sofa.seats, int)
+
+    def test_product_rules_apply(self):
+        for data, message in (
+            (record(price=0), "Price must be greater than 0"),
+            (record(stock_quantity=-1), "Stock quantity"),
+            (record(price="cheap"), "price must be a number"),
+            (record(furniture_type="Lamp"), "Unknown furniture type"),
+            (record(has_armrests="maybe"), "has_armrests must be true or false"),
+        ):
+            with self.assertRaises(ValueError) as context:
+                ProductService.furniture_from_record(data)
+            self.assertIn(message, str(context.exception))
+
+        data = record()
+        del data["image_url"]
+        with self.assertRaisesRegex(ValueError, "Missing required field: image_url"):
+            ProductService.furniture_from_record(data)
+
+    @patch('app.services.product_service.Furniture.add_many')
+    def test_invalid_rows_are_reported_not_fatal(self, mock_add_many):
+        mock_add_many.side_effect = lambda furnitures: len(furnitures)
+        records = [(1, record()), (2, record(price=-5)), (3, "⚠️ Invalid JSON."), (4, record(name="Stool"))]
+
+        report = ProductService.import_products(records, chunk_size=10)
+
+        self.assertEqual(report["imported"], 2)
+        self.assertEqual(report["failed"], 2)
+        self.assertEqual([error["row"] for error in report["errors"]], [2, 3])
+        self.assertTrue(all(error["message"].startswith("⚠️") for error in report["errors"]))
+        mock_add_many.assert_called_once()
+
+    @patch('app.services.product_service.Furniture.add_many')
+    def test_inserts_in_chunks(self, mock_add_many):
+        mock_add_many.side_effect = lambda furnitures: len(furnitures)
+
+        report = ProductService.import_products(((i, record()) for i in range(1, 8)), chunk_size=3)
+
+        self.assertEqual(report["imported"], 7)
+        self.assertEqual([len(call.args[0]) for call in mock_add_many.call_args_list], [3, 3, 1])
+
+    @patch('app.services.product_service.Furniture.add_many')
+    def test_rejected_chunk_is_split_to_find_bad_rows(self, mock_add_many):
+        # The database refuses any batch holding the product named "Bad"
+        mock_add_many.side_effect = lambda furnitures: (
+            None if any(furniture.name == "Bad" for furniture in furnitures) else len(furnitures)
+        )
+        records = [(i, record(name="Bad" if i == 5 else f"Chair {i}")) for i in range(1, 9)]
+
+        report = ProductService.import_products(records, chunk_size=8)
+
+        self.assertEqual(report["imported"], 7)
+        self.assertEqual(report["errors"], [{"row": 5, "message": "⚠️ The database rejected this row."}])
+        self.assertLess(mock_add_many.call_count, 8)
+
+
+class TestBulkImportRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    @patch('app.services.product_service.ProductService.import_products')
+    def test_csv_body(self, mock_import):
+        mock_import.side_effect = lambda records: {"imported": len(list(records)), "failed": 0, "errors": []}
+
+        response = self.client.post('/api/products/bulk', data=CSV_FEED, content_type='text/csv')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["imported"], 2)
+
+    @patch('app.services.product_service.Furniture.add_many')
+    def test_jsonl_body_reports_bad_lines(self, mock_add_many):
+        mock_add_many.side_effect = lambda furnitures: len(furnitures)
+        body = '{"name": "Stool", "description": "Oak", "price": 40, "dimensions": "30x30x45", ' \
+               '"stock_quantity": 4, "category_id": 1, "image_url": "/s.jpg", "furniture_type": "Chair"}\n' \
+               '{"name": "Lamp"\n'
+
+        response = self.client.post('/api/products/bulk', data=body, content_type='application/x-ndjson')
+
+        self.assertEqual(response.json["imported"], 1)
+        self.assertEqual(response.json["errors"], [{"row": 2, "message": "⚠️ Invalid JSON."}])
+
+    def test_unknown_body_type(self):
+        response = self.client.post('/api/products/bulk', json=[{"name": "Stool"}])
+
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,11 @@
+import json
 import unittest
+from contextlib import nullcontext
 from unittest.mock import patch
 from app import create_app
-from app.services.product_service import ProductService
+from app.db import connection, configure, get_connection
+from app.services.product_service import ProductService, catalog_cache
+from app.models.furniture import Chair
 
 class TestProductRoutes(unittest.TestCase):
 
@@ -128,6 +132,60 @@ class TestProductRoutes(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.json["products"]), 2)
 
+    # --------------------------
+    # Test streaming all products
+    # --------------------------
+    @patch('app.services.product_service.ProductService.stream_all_products')
+    def test_stream_all_products_json(self, mock_stream_all):
+        # Mock a streamed product list
+        rows = [{"ProductID": 1, "Name": "Chair"}, {"ProductID": 2, "Name": "Table"}]
+        mock_stream_all.return_value = nullcontext(iter(rows))
+
+        # Send GET request asking for a streamed response
+        response = self.client.get('/api/products?stream=true')
+
+        # Verify results keep the buffered response shape
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["products"], rows)
+
+    @patch('app.services.product_service.ProductService.stream_all_products')
+    def test_stream_all_products_json_lines(self, mock_stream_all):
+        # Mock a streamed product list
+        rows = [{"ProductID": 1, "Name": "Chair"}, {"ProductID": 2, "Name": "Table"}]
+        mock_stream_all.return_value = nullcontext(iter(rows))
+
+        # Send GET request asking for JSON Lines
+        response = self.client.get('/api/products', headers={"Accept": "application/x-ndjson"})
+
+        # Verify one JSON object per line
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual([json.loads(line) for line in lines], rows)
+
+    # --------------------------
+    # Test paginating products
+    # --------------------------
+    @patch('app.services.product_service.ProductService.get_products_page')
+    def test_get_products_page(self, mock_get_page):
+        mock_get_page.return_value = ([{"ProductID": 1, "Name": "Chair"}], "next-page")
+
+        response = self.client.get('/api/products?category_id=2&limit=1&cursor=abc')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["next_cursor"], "next-page")
+        self.assertEqual(len(response.json["products"]), 1)
+        mock_get_page.assert_called_once_with("2", None, "abc", 1)
+
+    @patch('app.services.product_service.ProductService.get_products_page')
+    def test_get_products_page_invalid(self, mock_get_page):
+        mock_get_page.side_effect = ValueError("⚠️ Invalid cursor.")
+
+        self.assertEqual(self.client.get('/api/products?limit=0').status_code, 400)
+        response = self.client.get('/api/products?cursor=bad')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json["message"], "⚠️ Invalid cursor.")
+
     # --------------------------
     # Test getting products by category
     # --------------------------
@@ -185,6 +243,100 @@ class TestProductRoutes(unittest.TestCase):
         self.assertEqual(len(response.json["products"]), 2)
         self.assertIn("Chair", response.json["products"][0]["Name"])
 
+    @patch('app.services.product_service.ProductService.filter_products')
+    def test_filter_products(self, mock_filter):
+        mock_filter.return_value = (
+            [{"ProductID": 1, "Name": "Office Chair"}],
+            {"category_id": {1: 1}, "furniture_type": {"Chair": 1}, "price": {"100-250": 1}, "in_stock": {True: 1}},
+            None
+        )
+
+        response = self.client.get('/api/products?category_id=1&furniture_type=Chair&min_price=100&in_stock=true')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["products"][0]["ProductID"], 1)
+        self.assertEqual(response.json["facets"]["in_stock"], {"true": 1})
+        self.assertNotIn("next_cursor", response.json)
+        mock_filter.assert_called_once_with("1", "Chair", 100.0, None, True, None, False, None, None, None, [], {})
+
+    @patch('app.services.product_service.ProductService.filter_products')
+    def test_top_products_by_price(self, mock_filter):
+        mock_filter.return_value = ([{"ProductID": 3, "Price": 650}], None, None)
+
+        response = self.client.get('/api/products?furniture_type=Sofa&in_stock=true&sort=price&limit=20')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["products"], [{"ProductID": 3, "Price": 650}])
+        mock_filter.assert_called_once_with(None, "Sofa", None, None, True, None, False, None, 20, "price", [], {})
+
+    def test_invalid_sort(self):
+        response = self.client.get('/api/products?sort=colour')
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch('app.services.product_service.ProductService.filter_products')
+    def test_filter_products_by_attributes(self, mock_filter):
+        mock_filter.return_value = ([{"ProductID": 7, "Name": "Sofa Bed"}], None, None)
+
+        response = self.client.get('/api/products?seats>=3&is_convertible=true')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["products"][0]["ProductID"], 7)
+        self.assertEqual(mock_filter.call_args[0][10], [("seats", ">=", "3"), ("is_convertible", "=", "true")])
+
+    @patch('app.services.product_service.ProductService.filter_products')
+    def test_filter_products_invalid_attribute(self, mock_filter):
+        mock_filter.side_effect = ValueError("⚠️ seats must be a number.")
+
+        response = self.client.get('/api/products?seats>=many')
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch('app.services.product_service.ProductService.filter_products')
+    def test_filter_products_by_size(self, mock_filter):
+        mock_filter.return_value = ([{"ProductID": 4, "Name": "Bistro Table"}], None, None)
+
+        response = self.client.get('/api/products?furniture_type=Table&max_width=120&min_height=70')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_filter.call_args[0][-1], {"width": (None, 120.0), "height": (70.0, None)})
+
+    def test_filter_products_invalid_size(self):
+        response = self.client.get('/api/products?max_width=wide')
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch('app.services.product_service.ProductService.preview_discount')
+    def test_discount_preview(self, mock_preview):
+        mock_preview.return_value = {"percentage": 15.0, "summary": {"products": 0}, "categories": []}
+
+        response = self.client.get('/api/products/discount-preview?percentage=15&products=false')
+
+        self.assertEqual(response.status_code, 200)
+        mock_preview.assert_called_once_with("15", None, None, include_products=False)
+
+    @patch('app.services.product_service.ProductService.preview_discount')
+    def test_discount_preview_needs_a_cached_catalog(self, mock_preview):
+        mock_preview.return_value = None
+
+        self.assertEqual(self.client.get('/api/products/discount-preview?percentage=15').status_code, 503)
+        self.assertEqual(self.client.get('/api/products/discount-preview').status_code, 400)
+
+    def test_filter_products_invalid_price(self):
+        response = self.client.get('/api/products?min_price=cheap')
+
+        self.assertEqual(response.status_code, 400)
+
+    @patch('app.services.product_service.ProductService.search_products')
+    def test_fuzzy_search_products(self, mock_search):
+        mock_search.return_value = [{"ProductID": 7, "Name": "Oak Cabinet"}]
+
+        response = self.client.get('/api/products?search=cabinett&fuzzy=true')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["products"][0]["ProductID"], 7)
+        mock_search.assert_called_once_with("cabinett", fuzzy=True)
+
     # --------------------------
     # Test getting a specific product
     # --------------------------
@@ -221,5 +373,65 @@ class TestProductRoutes(unittest.TestCase):
         self.assertEqual(response.status_code, 404)
         self.assertIn("Product not found", response.json["message"])
 
+    # --------------------------
+    # Test fetching several products by ID
+    # --------------------------
+    @patch('app.services.product_service.ProductService.get_products_by_ids')
+    def test_get_products_by_ids(self, mock_get_by_ids):
+        chair = Chair("Office Chair", "Comfortable", 199.99, "60x60x100", 10, 1, "/images/chair.jpg")
+        chair.id = 3
+        mock_get_by_ids.return_value = ([chair], [7])
+
+        response = self.client.get('/api/products?ids=3,7')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["products"][0]["id"], 3)
+        self.assertEqual(response.json["missing"], [7])
+        mock_get_by_ids.assert_called_once_with([3, 7])
+
+    @patch('app.services.product_service.ProductService.get_products_by_ids')
+    def test_get_products_batch(self, mock_get_by_ids):
+        mock_get_by_ids.return_value = ([], [4, 5])
+
+        response = self.client.post('/api/products/batch', json={"ids": [4, 5]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, {"products": [], "missing": [4, 5]})
+
+    def test_get_products_by_ids_invalid(self):
+        self.assertEqual(self.client.get('/api/products?ids=1,x').status_code, 400)
+        self.assertEqual(self.client.get('/api/products?ids=').status_code, 400)
+        self.assertEqual(self.client.post('/api/products/batch', json={"ids": "1,2"}).status_code, 400)
+
+
+class TestProductRoutesOnSqlite(unittest.TestCase):
+    """Product reads against an in-memory SQLite database."""
+
+    def setUp(self):
+        self.dialect = configure("sqlite://")
+        with get_connection() as conn:
+            self.dialect.bootstrap_schema(conn)
+        catalog_cache.clear()
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+        self.stool_id = Chair("Stool", "Oak", 50.0, "40x40x60", 5, None, "/s.jpg", False, False, 60).add_furniture()
+        self.chair_id = Chair("Chair", "Mesh", 90.0, "60x60x100", 5, None, "/c.jpg", True, True, 120).add_furniture()
+
+    def tearDown(self):
+        configure(connection.DATABASE_URL)
+        catalog_cache.clear()
+
+    def test_detail_and_batch_carry_the_product_ids(self):
+        # The detail read leaves a hydrated copy in the catalog cache
+        detail = self.client.get(f'/api/products/{self.stool_id}')
+        self.assertEqual(detail.json["product"]["id"], self.stool_id)
+
+        response = self.client.post('/api/products/batch', json={"ids": [self.chair_id, self.stool_id]})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([product["id"] for product in response.json["products"]], [self.chair_id, self.stool_id])
+
 if __name__ == '__main__':
     unittest.main()
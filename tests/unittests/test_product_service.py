@@ -1,10 +1,18 @@
 import unittest
 from unittest.mock import patch, MagicMock
-from app.services.product_service import ProductService
-from app.models.furniture import Chair
+from app.services.product_service import ProductService, catalog_cache, search_index, suggest_index, facet_index, columnar_catalog
+from app.models.furniture import Chair, FurnitureFactory
 
 class TestProductService(unittest.TestCase):
 
+    def setUp(self):
+        # Every test starts without a cached catalog
+        catalog_cache.clear()
+        search_index.clear()
+        suggest_index.clear()
+        facet_index.clear()
+        columnar_catalog.clear()
+
     @patch('app.services.product_service.FurnitureFactory.create_furniture')
     @patch('app.models.furniture.Furniture.add_furniture')
     def test_add_product_success(self, mock_add_furniture, mock_create_furniture):
@@ -315,6 +323,22 @@ class TestProductService(unittest.TestCase):
         self.assertEqual(result, [])
         mock_execute_query.assert_called_once()
 
+    @patch('app.services.product_service.execute_query')
+    def test_get_all_products_cached(self, mock_execute_query):
+        mock_execute_query.return_value = [
+            {"ProductID": 1, "Name": "Chair", "Price": 199.99, "CategoryID": 1, "FurnitureType": "Chair"},
+            {"ProductID": 2, "Name": "Table", "Price": 299.99, "CategoryID": 2, "FurnitureType": "Table"}
+        ]
+
+        ProductService.get_all_products()
+        by_category = ProductService.get_products_by_category("2")
+        by_type = ProductService.get_products_by_furniture_type("Chair")
+
+        # Browsing after the first read is served from the catalog cache
+        mock_execute_query.assert_called_once()
+        self.assertEqual([row["ProductID"] for row in by_category], [2])
+        self.assertEqual([row["ProductID"] for row in by_type], [1])
+
     @patch('app.services.product_service.execute_query')
     def test_search_products(self, mock_execute_query):
         # Mock database query
@@ -331,6 +355,182 @@ class TestProductService(unittest.TestCase):
         self.assertEqual(result, mock_products)
         mock_execute_query.assert_called_once()
 
+    @patch('app.services.product_service.execute_query')
+    def test_filter_products(self, mock_execute_query):
+        mock_execute_query.return_value = [
+            {"ProductID": 1, "Name": "Office Chair", "Description": "Mesh", "Price": 199, "StockQuantity": 3,
+             "CategoryID": 1, "FurnitureType": "Chair"},
+            {"ProductID": 2, "Name": "Armchair", "Description": "Leather", "Price": 649, "StockQuantity": 0,
+             "CategoryID": 1, "FurnitureType": "Chair"},
+            {"ProductID": 3, "Name": "Desk", "Description": "Oak", "Price": 420, "StockQuantity": 2,
+             "CategoryID": 2, "FurnitureType": "Table"}
+        ]
+
+        products, facets, next_cursor = ProductService.filter_products(
+            category_id="1", furniture_type="Chair", max_price=700, limit=1
+        )
+        self.assertEqual([row["ProductID"] for row in products], [2])
+        self.assertEqual(facets["category_id"], {1: 2})
+        self.assertEqual(facets["price"], {"100-250": 1, "500-1000": 1})
+
+        products, _, _ = ProductService.filter_products(furniture_type="Chair", max_price=700, cursor=next_cursor, limit=1)
+        self.assertEqual([row["ProductID"] for row in products], [1])
+
+        products, facets, _ = ProductService.filter_products(in_stock=True, search_term="oak")
+        self.assertEqual([row["ProductID"] for row in products], [3])
+        self.assertEqual(facets["in_stock"], {True: 1})
+        mock_execute_query.assert_called_once()
+
+    @patch('app.services.product_service.execute_query')
+    def test_filter_products_by_size(self, mock_execute_query):
+        mock_execute_query.return_value = [
+            {"ProductID": 1, "Name": "Bistro Table", "Price": 150, "StockQuantity": 3, "CategoryID": 1,
+             "FurnitureType": "Table", "Width": 70, "Depth": 70, "Height": 75},
+            {"ProductID": 2, "Name": "Dining Table", "Price": 450, "StockQuantity": 2, "CategoryID": 1,
+             "FurnitureType": "Table", "Width": 180, "Depth": 90, "Height": 75},
+            {"ProductID": 3, "Name": "Side Table", "Price": 90, "StockQuantity": 0, "CategoryID": 1,
+             "FurnitureType": "Table", "Width": None, "Depth": None, "Height": None}
+        ]
+
+        products, facets, _ = ProductService.filter_products(furniture_type="Table", dimensions={"width": (None, 120)})
+
+        self.assertEqual([row["ProductID"] for row in products], [1])
+        self.assertEqual(facets["in_stock"], {True: 1})
+
+    @patch('app.services.product_service.catalog_cache.ensure_loaded', return_value=False)
+    @patch('app.services.product_service.execute_query')
+    def test_filter_products_by_size_in_sql(self, mock_execute_query, mock_ensure_loaded):
+        mock_execute_query.return_value = []
+
+        ProductService.filter_products(dimensions={"width": (None, 120), "height": (70, None)})
+
+        query, params = mock_execute_query.call_args[0]
+        self.assertIn("Width <= ?", query)
+        self.assertIn("Height >= ?", query)
+        self.assertEqual(params, (120, 70))
+
+    @patch('app.services.product_service.Furniture.get_discount_flags')
+    @patch('app.services.product_service.execute_query')
+    def test_preview_discount_matches_calculate_discount(self, mock_execute_query, mock_get_flags):
+        rows, flags = [], []
+        for number, (furniture_type, (attribute, _, _)) in enumerate(FurnitureFactory.discount_rules().items()):
+            for flagged in (True, False):
+                product_id = 2 * number + int(flagged) + 1
+                rows.append({"ProductID": product_id, "Name": f"{furniture_type} {product_id}", "Price": 100 + product_id,
+                             "StockQuantity": 2, "CategoryID": number % 2 + 1, "FurnitureType": furniture_type})
+                flags.append({"ProductID": product_id, "Flag": 1.0 if flagged else 0.0})
+        mock_execute_query.return_value = rows
+        mock_get_flags.return_value = flags
+
+        report = ProductService.preview_discount(15)
+
+        expected = {}
+        for row, flag in zip(rows, flags):
+            attribute = FurnitureFactory.discount_rules()[row["FurnitureType"]][0]
+            furniture = FurnitureFactory.create_furniture(
+                row["FurnitureType"], row["Name"], "", row["Price"], "", 2, row["CategoryID"], "",
+                {attribute: bool(flag["Flag"])}
+            )
+            expected[row["ProductID"]] = round(furniture.calculate_discount(15), 2)
+        self.assertEqual({product["id"]: product["discount"] for product in report["products"]}, expected)
+        self.assertAlmostEqual(report["summary"]["discount"], sum(expected.values()), places=2)
+        self.assertAlmostEqual(report["summary"]["stock_discount"], 2 * sum(expected.values()), places=2)
+        self.assertEqual([category["products"] for category in report["categories"]], [6, 4])
+
+    @patch('app.services.product_service.Furniture.get_discount_flags')
+    @patch('app.services.product_service.execute_query')
+    def test_preview_discount_by_category(self, mock_execute_query, mock_get_flags):
+        mock_execute_query.return_value = [
+            {"ProductID": 1, "Name": "Stool", "Price": 50, "StockQuantity": 4, "CategoryID": 1, "FurnitureType": "Chair"},
+            {"ProductID": 2, "Name": "Desk", "Price": 300, "StockQuantity": 1, "CategoryID": 2, "FurnitureType": "Table"}
+        ]
+        mock_get_flags.return_value = []
+
+        report = ProductService.preview_discount("20", category_id="2", include_products=False)
+
+        self.assertEqual(report["summary"], {"products": 1, "list_value": 300.0, "discount": 60.0, "stock_discount": 60.0})
+        self.assertEqual(report["categories"][0]["category_id"], 2)
+        self.assertNotIn("products", report)
+        with self.assertRaises(ValueError):
+            ProductService.preview_discount(150)
+
+    @patch('app.services.product_service.execute_query')
+    def test_filter_products_sorted(self, mock_execute_query):
+        mock_execute_query.return_value = [
+            {"ProductID": 1, "Name": "Corner Sofa", "Price": 899, "StockQuantity": 3, "CategoryID": 1, "FurnitureType": "Sofa"},
+            {"ProductID": 2, "Name": "Loveseat", "Price": 450, "StockQuantity": 0, "CategoryID": 1, "FurnitureType": "Sofa"},
+            {"ProductID": 3, "Name": "Sofa Bed", "Price": 650, "StockQuantity": 2, "CategoryID": 1, "FurnitureType": "Sofa"}
+        ]
+
+        products, facets, next_cursor = ProductService.filter_products(
+            furniture_type="Sofa", in_stock=True, sort="price", limit=1
+        )
+
+        self.assertEqual([row["ProductID"] for row in products], [3])
+        self.assertEqual(facets["in_stock"], {True: 2, False: 1})
+        self.assertIsNone(next_cursor)
+        with self.assertRaises(ValueError):
+            ProductService.filter_products(sort="colour")
+        with self.assertRaises(ValueError):
+            ProductService.filter_products(sort="price", cursor="abc")
+
+    @patch('app.services.product_service.execute_query')
+    def test_filter_products_sorted_uncached(self, mock_execute_query):
+        mock_execute_query.return_value = [{"ProductID": 2, "Name": "Armchair"}]
+
+        with patch.object(catalog_cache, 'max_rows', 0):
+            ProductService.filter_products(max_price=500, sort="-stock", limit=20)
+
+        query, params = mock_execute_query.call_args_list[-1][0]
+        self.assertIn("ORDER BY StockQuantity DESC, ProductID", query)
+        self.assertEqual(params, (500,))
+
+    @patch('app.models.furniture.execute_query')
+    @patch('app.services.product_service.execute_query')
+    def test_filter_products_by_attributes(self, mock_execute_query, mock_attribute_query):
+        mock_execute_query.return_value = [
+            {"ProductID": 1, "Name": "Corner Sofa", "Price": 899, "StockQuantity": 3, "CategoryID": 1, "FurnitureType": "Sofa"},
+            {"ProductID": 2, "Name": "Loveseat", "Price": 450, "StockQuantity": 0, "CategoryID": 1, "FurnitureType": "Sofa"},
+            {"ProductID": 3, "Name": "Sofa Bed", "Price": 650, "StockQuantity": 2, "CategoryID": 1, "FurnitureType": "Sofa"}
+        ]
+        mock_attribute_query.return_value = [{"ProductID": 2}, {"ProductID": 3}]
+        filters = ProductService.parse_attribute_filters([("seats>", "3"), ("is_convertible", "true"), ("page", "2")])
+
+        products, facets, _ = ProductService.filter_products(in_stock=True, attributes=filters)
+
+        self.assertEqual(filters, [("seats", ">=", "3"), ("is_convertible", "=", "true")])
+        self.assertEqual([row["ProductID"] for row in products], [3])
+        self.assertEqual(facets["in_stock"], {True: 1, False: 1})
+        self.assertIn("INTERSECT", mock_attribute_query.call_args[0][0])
+
+    @patch('app.services.product_service.execute_query')
+    def test_filter_products_uncached(self, mock_execute_query):
+        mock_execute_query.return_value = [{"ProductID": 2, "Name": "Armchair"}]
+
+        with patch.object(catalog_cache, 'max_rows', 0):
+            products, facets, _ = ProductService.filter_products(
+                category_id="1", min_price=100, in_stock=False, search_term="arm"
+            )
+
+        self.assertEqual(products, [{"ProductID": 2, "Name": "Armchair"}])
+        self.assertIsNone(facets)
+        query, params = mock_execute_query.call_args_list[-1][0]
+        self.assertIn("Price >= ?", query)
+        self.assertIn("StockQuantity <= 0", query)
+        self.assertEqual(params, (1, 100, "%arm%", "%arm%"))
+
+    @patch('app.services.product_service.execute_query')
+    def test_suggest_products(self, mock_execute_query):
+        mock_execute_query.return_value = [
+            {"ProductID": 1, "Name": "Office Chair", "Popularity": 3},
+            {"ProductID": 5, "Name": "Gaming Chair", "Popularity": 8}
+        ]
+
+        result = ProductService.suggest_products("cha", limit=500)
+
+        self.assertEqual(result, [{"id": 5, "name": "Gaming Chair"}, {"id": 1, "name": "Office Chair"}])
+        self.assertEqual(ProductService.suggest_products(" "), [])
+
     @patch('app.services.product_service.execute_query')
     def test_get_products_by_category(self, mock_execute_query):
         # Mock database query
@@ -363,5 +563,28 @@ class TestProductService(unittest.TestCase):
         self.assertEqual(result, mock_products)
         mock_execute_query.assert_called_once()
 
+    # --------------------------
+    # Test multi-get
+    # --------------------------
+    @patch('app.models.furniture.Furniture.get_furnitures_by_ids')
+    def test_get_products_by_ids(self, mock_get_by_ids):
+        cached = Chair("Cached Chair", "Test", 100, "50x50x100", 10, 1, "/images/test.jpg")
+        catalog_cache.put_product(2, cached)
+        fetched = Chair("Fetched Chair", "Test", 100, "50x50x100", 10, 1, "/images/test.jpg")
+        fetched.id = 3
+        mock_get_by_ids.return_value = {3: fetched}
+
+        products, missing = ProductService.get_products_by_ids([3, 2, 9, 3])
+
+        # Order kept, duplicates dropped, only the uncached ids queried
+        self.assertEqual(products, [fetched, cached])
+        self.assertEqual(missing, [9])
+        mock_get_by_ids.assert_called_once_with([3, 9])
+        self.assertIs(catalog_cache.get_product(3), fetched)
+
+    def test_get_products_by_ids_limit(self):
+        with self.assertRaises(ValueError):
+            ProductService.get_products_by_ids(range(1, 502))
+
 if __name__ == '__main__':
     unittest.main()
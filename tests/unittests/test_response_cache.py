@@ -0,0 +1,244 @@
+import gzip
+import json
+import sqlite3
+import unittest
+from contextlib import nullcontext
+from unittest.mock import patch
+from app import create_app
+from app.db import connection, configure, get_connection
+from app.models.furniture import Chair
+from app.routes import response_cache as response_cache_module
+from app.routes.response_cache import ResponseCache
+from app.models.catalog_events import CatalogSubject
+from app.services.product_service import catalog_cache
+
+PRODUCTS = [{"ProductID": i, "Name": f"Chair {i}", "Description": "A comfortable chair " * 5}
+            for i in range(1, 30)]
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def test_entry_matches_version_only(self):
+        cache = ResponseCache()
+        cache.put("key", 1, b'{"a": 1}')
+        self.assertIsNotNone(cache.get("key", 1))
+        self.assertIsNone(cache.get("key", 2))
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_expired_entry_is_a_miss(self):
+        cache = ResponseCache(ttl=0.0)
+        cache.put("key", 1, b'{}')
+        with patch('app.routes.response_cache.time.monotonic', return_value=10 ** 9):
+            self.assertIsNone(cache.get("key", 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", 1, b'1')
+        cache.put("b", 1, b'2')
+        cache.get("a", 1)
+        cache.put("c", 1, b'3')
+        self.assertIsNone(cache.get("b", 1))
+        self.assertIsNotNone(cache.get("a", 1))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_byte_limit_counts_compressed_bodies(self):
+        body = json.dumps(PRODUCTS).encode()
+        cache = ResponseCache(max_bytes=2 * len(body))
+        entry = cache.put("a", 1, body)
+        cache.compressed(entry, "gzip")
+        self.assertEqual(cache.stats()["bytes"], len(body) + len(entry.bodies["gzip"]))
+        cache.put("b", 1, body)
+        self.assertIsNone(cache.get("a", 1))
+        self.assertEqual(cache.stats()["entries"], 1)
+
+
+class TestCachedRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_repeated_listing_skips_the_view(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+
+        first = self.client.get('/api/products')
+        second = self.client.get('/api/products')
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers["ETag"], first.headers["ETag"])
+        mock_get_all.assert_called_once()
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_catalog_change_rebuilds_the_response(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+        self.client.get('/api/products')
+
+        mock_get_all.return_value = PRODUCTS[:1]
+        with patch.object(catalog_cache, 'version', catalog_cache.version + 1):
+            response = self.client.get('/api/products')
+
+        self.assertEqual(len(response.json["products"]), 1)
+        self.assertEqual(mock_get_all.call_count, 2)
+
+    @patch('app.services.product_service.ProductService.get_products_by_category')
+    def test_query_string_is_part_of_the_key(self, mock_by_category):
+        mock_by_category.side_effect = lambda category_id: [{"ProductID": int(category_id)}]
+
+        one = self.client.get('/api/products?category_id=1')
+        two = self.client.get('/api/products?category_id=2')
+
+        self.assertEqual(one.json["products"][0]["ProductID"], 1)
+        self.assertEqual(two.json["products"][0]["ProductID"], 2)
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_gzip_when_accepted(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+
+        plain = self.client.get('/api/products')
+        zipped = self.client.get('/api/products', headers={"Accept-Encoding": "gzip"})
+
+        self.assertEqual(zipped.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", zipped.headers["Vary"])
+        self.assertEqual(gzip.decompress(zipped.get_data()), plain.get_data())
+        self.assertNotEqual(zipped.headers["ETag"], plain.headers["ETag"])
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_brotli_only_when_installed(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+
+        with patch.object(response_cache_module, 'brotli', None):
+            response = self.client.get('/api/products', headers={"Accept-Encoding": "br, gzip"})
+
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_small_bodies_are_not_compressed(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS[:1]
+
+        response = self.client.get('/api/products', headers={"Accept-Encoding": "gzip"})
+
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.json["products"], PRODUCTS[:1])
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_if_none_match_returns_304(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+        etag = self.client.get('/api/products').headers["ETag"]
+
+        response = self.client.get('/api/products', headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        mock_get_all.assert_called_once()
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_if_none_match_skips_an_evicted_entry(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+        first = self.client.get('/api/products', headers={"Accept-Encoding": "gzip"})
+        self.app.extensions["response_cache"].clear()
+
+        response = self.client.get('/api/products', headers={
+            "Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]
+        })
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["ETag"], first.headers["ETag"])
+        mock_get_all.assert_called_once()
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_category_change_moves_the_etag(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+        etag = self.client.get('/api/products').headers["ETag"]
+
+        catalog_cache.update(CatalogSubject.CATEGORY_CHANGED)
+        response = self.client.get('/api/products', headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_if_modified_since(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+        last_modified = self.client.get('/api/products').headers["Last-Modified"]
+
+        response = self.client.get('/api/products', headers={"If-Modified-Since": last_modified})
+
+        self.assertEqual(response.status_code, 304)
+
+    @patch('app.services.product_service.ProductService.get_product_by_id')
+    def test_errors_are_not_cached(self, mock_get_by_id):
+        mock_get_by_id.return_value = None
+
+        self.client.get('/api/products/7')
+        response = self.client.get('/api/products/7')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(mock_get_by_id.call_count, 2)
+
+    @patch('app.services.product_service.ProductService.stream_all_products')
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_streamed_formats_bypass_the_cache(self, mock_get_all, mock_stream):
+        mock_get_all.return_value = PRODUCTS
+        mock_stream.side_effect = lambda: nullcontext(iter(PRODUCTS[:2]))
+        self.client.get('/api/products')
+
+        response = self.client.get('/api/products?format=jsonl')
+
+        self.assertEqual(len(response.get_data(as_text=True).splitlines()), 2)
+        mock_stream.assert_called_once()
+
+
+class TestDatabaseErrors(unittest.TestCase):
+    """Listings read from an in-memory SQLite database that fails once."""
+
+    def setUp(self):
+        self.dialect = configure("sqlite://")
+        with get_connection() as conn:
+            self.dialect.bootstrap_schema(conn)
+        catalog_cache.clear()
+        Chair("Stool", "Oak", 50.0, "40x40x60", 5, None, "/s.jpg", False, False, 60).add_furniture()
+
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        configure(connection.DATABASE_URL)
+        catalog_cache.clear()
+
+    def test_failed_listing_is_not_replayed(self):
+        with patch('app.db.execute_query._run_query', side_effect=sqlite3.OperationalError("database is locked")):
+            failed = self.client.get('/api/products')
+        self.assertEqual(failed.json["products"], [])
+
+        # The database is back; the empty listing was not kept
+        recovered = self.client.get('/api/products')
+
+        self.assertEqual(recovered.status_code, 200)
+        self.assertEqual([product["Name"] for product in recovered.json["products"]], ["Stool"])
+        self.assertEqual(self.app.extensions["response_cache"].stats()["entries"], 1)
+
+
+class TestMainApp(unittest.TestCase):
+    """The app ``python main.py`` serves."""
+
+    def setUp(self):
+        from main import app
+        self.client = app.test_client()
+
+    @patch('app.services.product_service.ProductService.get_all_products')
+    def test_cached_listing(self, mock_get_all):
+        mock_get_all.return_value = PRODUCTS
+
+        response = self.client.get('/api/products')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from flask import jsonify
+from app import create_app
+from app.db.rows import Row, schema_for
+from app.db.execute_query import execute_query
+
+
+class TestRows(unittest.TestCase):
+
+    def setUp(self):
+        self.description = [("ProductID",), ("Name",), ("Price",)]
+        self.row = Row(schema_for(self.description), (1, "Chair", 199.99))
+
+    def test_key_access(self):
+        self.assertEqual(self.row["Name"], "Chair")
+        self.assertEqual(self.row.get("Price"), 199.99)
+        self.assertIsNone(self.row.get("Missing"))
+        self.assertIn("ProductID", self.row)
+        self.assertNotIn("Missing", self.row)
+        with self.assertRaises(KeyError):
+            self.row["Missing"]
+
+    def test_positional_access(self):
+        # Kept for callers that index rows like tuples
+        self.assertEqual(self.row[0], 1)
+
+    def test_dict_conversion_and_equality(self):
+        expected = {"ProductID": 1, "Name": "Chair", "Price": 199.99}
+        self.assertEqual(self.row.to_dict(), expected)
+        self.assertEqual(dict(self.row), expected)
+        self.assertEqual(self.row, expected)
+        self.assertEqual(list(self.row.keys()), ["ProductID", "Name", "Price"])
+
+    def test_schema_is_shared(self):
+        # The column index is built once per result shape
+        self.assertIs(schema_for(self.description), schema_for(list(self.description)))
+
+    def test_rows_have_no_instance_dict(self):
+        self.assertFalse(hasattr(self.row, "__dict__"))
+
+    def test_jsonify_serializes_rows(self):
+        app = create_app()
+        with app.app_context():
+            response = jsonify({"products": [self.row]})
+        self.assertEqual(response.json["products"][0]["Name"], "Chair")
+
+    @patch('app.db.execute_query.get_connection')
+    def test_execute_query_compact(self, mock_get_connection):
+        connection = MagicMock()
+        connection.__enter__.return_value = connection
+        cursor = connection.cursor.return_value
+        cursor.description = self.description
+        cursor.fetchall.return_value = [(1, "Chair", 199.99), (2, "Table", 299.99)]
+        mock_get_connection.return_value = connection
+
+        rows = execute_query("SELECT ProductID, Name, Price FROM Products", fetch=True, compact=True)
+
+        self.assertTrue(all(isinstance(row, Row) for row in rows))
+        self.assertEqual(rows[1]["Name"], "Table")
+
+
+if __name__ == '__main__':
+    unittest.main()
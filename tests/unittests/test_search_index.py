@@ -0,0 +1,137 @@
+import io
+import unittest
+from unittest.mock import patch
+from app import create_app
+from app.models.catalog_events import CatalogSubject
+from app.services.catalog_cache import CatalogCache
+from app.services.search_index import SearchIndex, tokenize, trigrams, edit_distance
+from catalog_fixtures import CatalogTestCase, product
+
+
+class TestSearchIndex(CatalogTestCase):
+
+    def catalog_rows(self):
+        return [
+            product(1, "Office Chair", Description="Mesh back, adjustable height"),
+            product(2, "Oak Dining Table", Description="Seats six; pairs with any chair"),
+            product(3, "Gaming Chair", Description="Racing style chair with lumbar pillow"),
+            product(4, "Chaise Longue", Description="Velvet"),
+        ]
+
+    def make_index(self, cache):
+        return SearchIndex(cache)
+
+    def ids(self, text):
+        return [row["ProductID"] for row in self.index.search(text)]
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Oak-Wood TABLE, 2m"), ["oak", "wood", "table", "2m"])
+        self.assertEqual(tokenize(None), [])
+
+    def test_ranks_name_matches_first(self):
+        # The table only mentions chairs in its description
+        self.assertEqual(self.ids("chair")[-1], 2)
+        self.assertEqual(set(self.ids("chair")), {1, 2, 3})
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.ids("chair lumbar"), [3])
+        self.assertEqual(self.ids("chair velvet"), [])
+        self.assertEqual(self.ids("!!!"), [])
+
+    def test_last_term_matches_as_prefix(self):
+        self.assertEqual(set(self.ids("cha")), {1, 2, 3, 4})
+        self.assertEqual(self.ids("oak din"), [2])
+
+    def test_trigrams(self):
+        self.assertEqual(trigrams("bed"), {"$$b", "$be", "bed", "ed$"})
+
+    def test_edit_distance(self):
+        self.assertEqual(edit_distance("cabinett", "cabinet", 2), 1)
+        self.assertEqual(edit_distance("chiar", "chair", 2), 1)
+        self.assertEqual(edit_distance("sofaa", "sofa", 2), 1)
+        self.assertEqual(edit_distance("chair", "table", 2), 3)
+
+    def test_fuzzy_search(self):
+        self.assertEqual(self.ids("ofice chiar"), [])
+        self.assertEqual([row["ProductID"] for row in self.index.search("ofice chiar", fuzzy=True)], [1])
+        self.assertEqual([row["ProductID"] for row in self.index.search("lumbr", fuzzy=True)], [3])
+        self.assertEqual(self.index.search("xyzzy", fuzzy=True), [])
+
+    def test_fuzzy_ranks_exact_matches_first(self):
+        self.ids("oak")
+        CatalogSubject.notify(CatalogSubject.ADDED, 5, product(5, "Oak Cabinett"))
+        CatalogSubject.notify(CatalogSubject.ADDED, 6, product(6, "Oak Cabinet"))
+        CatalogSubject.notify(CatalogSubject.ADDED, 7, product(7, "Walnut Cabinet"))
+
+        self.assertEqual([row["ProductID"] for row in self.index.search("cabinet", fuzzy=True)][:1], [6])
+        self.assertEqual({row["ProductID"] for row in self.index.search("cabinett", fuzzy=True)}, {5, 6, 7})
+
+    def test_incremental_updates(self):
+        self.ids("chair")
+
+        CatalogSubject.notify(CatalogSubject.ADDED, 5, product(5, "Rocking Chair"))
+        CatalogSubject.notify(CatalogSubject.UPDATED, 1, {"Name": "Office Stool", "Description": "Mesh"})
+        CatalogSubject.notify(CatalogSubject.DELETED, 3)
+        CatalogSubject.notify(CatalogSubject.UPDATED, 2, {"StockQuantity": 0})
+
+        self.assertEqual(set(self.ids("chair")), {2, 5})
+        self.assertEqual(self.ids("stool"), [1])
+        self.loader.assert_called_once()
+        self.assertEqual(self.index.stats()["documents"], 4)
+
+    def test_rebuilds_when_cache_reloads(self):
+        self.ids("chair")
+        self.loader.return_value = [product(9, "Bunk Bed")]
+
+        self.cache.invalidate()
+
+        self.assertEqual(self.ids("bunk"), [9])
+        self.assertEqual(self.ids("chair"), [])
+
+    def test_not_cached(self):
+        index = SearchIndex(CatalogCache(self.loader, max_rows=1))
+
+        self.assertIsNone(index.search("chair"))
+        self.assertIsNone(index.rebuild())
+
+
+class TestSearchRebuildCommands(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+
+    @patch('app.services.product_service.ProductService.rebuild_search_index')
+    def test_rebuild_route(self, mock_rebuild):
+        mock_rebuild.return_value = "Search index rebuilt with 4 products."
+
+        response = self.app.test_client().post('/api/products/search/rebuild')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["message"], "Search index rebuilt with 4 products.")
+
+    @patch('urllib.request.urlopen')
+    def test_rebuild_command_calls_the_server(self, mock_urlopen):
+        mock_urlopen.return_value.__enter__.return_value = io.BytesIO(
+            b'{"message": "Search index rebuilt with 4 products."}'
+        )
+
+        result = self.app.test_cli_runner().invoke(args=["search", "rebuild", "--url", "http://shop:8000/"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("rebuilt with 4 products", result.output)
+        request = mock_urlopen.call_args[0][0]
+        self.assertEqual(request.full_url, "http://shop:8000/api/products/search/rebuild")
+        self.assertEqual(request.get_method(), "POST")
+
+    @patch('app.services.product_service.ProductService.rebuild_search_index')
+    def test_time_build_command(self, mock_rebuild):
+        mock_rebuild.return_value = "Search index rebuilt with 4 products."
+
+        result = self.app.test_cli_runner().invoke(args=["search", "time-build"])
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertIn("rebuilt with 4 products", result.output)
+
+if __name__ == '__main__':
+    unittest.main()
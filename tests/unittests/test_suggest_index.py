@@ -0,0 +1,113 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from app import create_app
+from app.models.catalog_events import CatalogSubject
+from app.services.suggest_index import SuggestIndex, word_offsets
+
+
+def suggestion(product_id, name, popularity=0):
+    return {"ProductID": product_id, "Name": name, "Popularity": popularity}
+
+
+class TestSuggestIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.loader = MagicMock(return_value=[
+            suggestion(1, "Office Chair", 40),
+            suggestion(2, "Oak Dining Table", 15),
+            suggestion(3, "Gaming Chair", 90),
+            suggestion(4, "Chaise Longue", 5),
+            suggestion(5, "Chair Cushion", 0),
+        ])
+        self.index = SuggestIndex(self.loader)
+        CatalogSubject.attach(self.index)
+
+    def tearDown(self):
+        CatalogSubject.detach(self.index)
+
+    def ids(self, prefix, limit=10):
+        return [product_id for product_id, _ in self.index.suggest(prefix, limit)]
+
+    def test_word_offsets(self):
+        self.assertEqual(word_offsets("oak dining-table"), [0, 4, 11])
+
+    def test_matches_any_word_by_popularity(self):
+        self.assertEqual(self.ids("chai"), [3, 1, 4, 5])
+        self.assertEqual(self.ids("CHAIR"), [3, 1, 5])
+        self.assertEqual(self.ids("dining t"), [2])
+        self.assertEqual(self.ids("sofa"), [])
+        self.assertEqual(self.index.suggest("   "), [])
+
+    def test_limit(self):
+        self.assertEqual(self.ids("chai", limit=2), [3, 1])
+        self.assertEqual(self.ids("o", limit=1), [1])
+
+    def test_returns_names(self):
+        self.assertEqual(self.index.suggest("oak"), [(2, "Oak Dining Table")])
+
+    def test_incremental_updates(self):
+        self.ids("chair")
+
+        CatalogSubject.notify(CatalogSubject.ADDED, 6, {"ProductID": 6, "Name": "Rocking Chair"})
+        CatalogSubject.notify(CatalogSubject.UPDATED, 1, {"Name": "Office Stool"})
+        CatalogSubject.notify(CatalogSubject.DELETED, 3)
+        CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, 6, {"Quantity": 7})
+        CatalogSubject.notify(CatalogSubject.UPDATED, 2, {"StockQuantity": 0})
+
+        self.assertEqual(self.ids("chair"), [6, 5])
+        self.assertEqual(self.ids("stool"), [1])
+        self.assertEqual(self.ids("office"), [1])
+        self.loader.assert_called_once()
+
+    def test_sales_raise_popularity(self):
+        self.ids("chai")
+
+        CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, 4, {"Quantity": 100})
+        # Restocking does not count as a sale
+        CatalogSubject.notify(CatalogSubject.STOCK_ADJUSTED, 5, {"Quantity": -100})
+
+        self.assertEqual(self.ids("chai"), [4, 3, 1, 5])
+
+    def test_pending_changes_are_merged(self):
+        index = SuggestIndex(self.loader, max_pending=2)
+        index.suggest("chair")
+
+        index.update(CatalogSubject.ADDED, 6, {"Name": "Rocking Chair"})
+        self.assertEqual(index.stats()["pending"], 1)
+        index.update(CatalogSubject.UPDATED, 3, {"Name": "Gaming Desk"})
+
+        self.assertEqual(index.stats(), {"products": 6, "entries": 13, "pending": 0})
+        self.assertEqual([product_id for product_id, _ in index.suggest("chair")], [1, 5, 6])
+        self.assertEqual([product_id for product_id, _ in index.suggest("desk")], [3])
+
+    def test_not_loaded(self):
+        self.loader.return_value = None
+
+        self.assertIsNone(self.index.suggest("chair"))
+
+
+class TestSuggestRoute(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app()
+        self.app.testing = True
+        self.client = self.app.test_client()
+
+    @patch('app.services.product_service.ProductService.suggest_products')
+    def test_suggest(self, mock_suggest):
+        mock_suggest.return_value = [{"id": 3, "name": "Gaming Chair"}]
+
+        response = self.client.get('/api/products/suggest?q=cha&limit=5')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["suggestions"], [{"id": 3, "name": "Gaming Chair"}])
+        mock_suggest.assert_called_once_with("cha", 5)
+
+    def test_suggest_requires_query(self):
+        self.assertEqual(self.client.get('/api/products/suggest').status_code, 400)
+        self.assertEqual(self.client.get('/api/products/suggest?q=a&limit=x').status_code, 400)
+        self.assertEqual(self.client.get('/api/products/suggest?q=a&limit=0').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from unittest.mock import patch, MagicMock
+import pyodbc
+from app import create_app
+from app.db import execute_query, transaction
+
+
+class TestUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        # Create Flask app in test mode with a route running several queries
+        self.app = create_app()
+        self.app.testing = True
+
+        @self.app.route('/_unit_of_work')
+        def run_queries():
+            execute_query("SELECT * FROM Orders WHERE OrderID = ?", (1,), fetch=True)
+            execute_query("UPDATE Orders SET Status = ? WHERE OrderID = ?", ("shipped", 1))
+            execute_query("SELECT * FROM Orders WHERE OrderID = ?", (1,), fetch=True)
+            return {"message": "done"}, 200
+
+        self.client = self.app.test_client()
+        self.connection = MagicMock()
+        self.connection.cursor.return_value.description = [("OrderID",)]
+        self.connection.cursor.return_value.fetchall.return_value = [(1,)]
+
+    @patch('app.db.unit_of_work.get_connection')
+    def test_request_shares_one_connection(self, mock_get_connection):
+        mock_get_connection.return_value = self.connection
+
+        response = self.client.get('/_unit_of_work')
+
+        # One borrowed connection and a single commit for the whole request
+        self.assertEqual(response.status_code, 200)
+        mock_get_connection.assert_called_once()
+        self.assertEqual(self.connection.cursor.call_count, 3)
+        self.connection.__exit__.assert_called_once_with(None, None, None)
+        self.connection.close.assert_not_called()
+
+    @patch('app.db.unit_of_work.get_connection')
+    def test_request_rolls_back_failed_write(self, mock_get_connection):
+        mock_get_connection.return_value = self.connection
+        cursor = self.connection.cursor.return_value
+        cursor.execute.side_effect = [None, None, pyodbc.Error("deadlock")]
+
+        response = self.client.get('/_unit_of_work')
+
+        # The failed statement turns the response into an error and nothing is committed
+        self.assertEqual(response.status_code, 500)
+        self.assertIn("rolled back", response.json["message"])
+        self.connection.close.assert_called_once()
+        self.connection.__exit__.assert_not_called()
+
+    @patch('app.db.unit_of_work.get_connection')
+    def test_request_without_queries_borrows_nothing(self, mock_get_connection):
+        @self.app.route('/_no_queries')
+        def no_queries():
+            return {"message": "ok"}, 200
+
+        response = self.client.get('/_no_queries')
+
+        self.assertEqual(response.status_code, 200)
+        mock_get_connection.assert_not_called()
+
+    @patch('app.db.unit_of_work.get_connection')
+    def test_transaction_outside_request(self, mock_get_connection):
+        mock_get_connection.return_value = self.connection
+
+        with transaction():
+            execute_query("UPDATE Products SET StockQuantity = 0 WHERE ProductID = ?", (1,))
+            execute_query("DELETE FROM Cart WHERE ProductID = ?", (1,))
+
+        mock_get_connection.assert_called_once()
+        self.connection.__exit__.assert_called_once_with(None, None, None)
+
+    @patch('app.db.unit_of_work.get_connection')
+    def test_transaction_rolls_back_on_exception(self, mock_get_connection):
+        mock_get_connection.return_value = self.connection
+
+        with self.assertRaises(ValueError):
+            with transaction():
+                execute_query("DELETE FROM Cart WHERE UserID = ?", (1,))
+                raise ValueError("⚠️ Out of stock.")
+
+        self.connection.close.assert_called_once()
+        self.connection.__exit__.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -139,6 +139,16 @@ class TestUserRoutes(unittest.TestCase):
     # --------------------------
     # Test getting a specific user
     # --------------------------
+    @patch('app.services.user_service.UserService.get_users_page')
+    def test_get_users_page(self, mock_get_page):
+        mock_get_page.return_value = ([{"UserID": 3, "Name": "Jane"}], "next-page")
+
+        response = self.client.get('/api/users?limit=1')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["next_cursor"], "next-page")
+        mock_get_page.assert_called_once_with(None, 1)
+
     @patch('app.services.user_service.UserService.get_user_by_id')
     def test_get_user_by_id_success(self, mock_get_user):
         # Mock user data